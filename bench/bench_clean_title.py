@@ -0,0 +1,153 @@
+# --- bench/bench_clean_title.py (clean_title: implementación anterior vs regex fusionadas + memo) ---
+#
+# Uso:  python -m bench.bench_clean_title [--repeat 20] [--fuzz 200000]
+# Corpus: bench/fixtures/titles/*.txt (títulos de YouTube y Spotify, uno por línea).
+# La carga imita un refill de radio: cada título se limpia varias veces (pool, scoring, selección,
+# historial) y los títulos populares se repiten más que el resto.
+# Compara la versión anterior (copiada acá como referencia) con clean_title en frío (memo vacío),
+# en caliente y con clean_titles() por lotes, y verifica que la salida sea idéntica byte a byte en el
+# corpus y en --fuzz cadenas aleatorias armadas con los tokens que tocan las regex.
+
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from bot.utils import spotify_helper
+from bot.utils.spotify_helper import clean_title, clean_titles
+
+CORPUS_DIR = Path(__file__).parent / "fixtures" / "titles"
+
+# Implementación previa, tal cual (cinco pasadas de regex, "\s+" sin precompilar)
+_REF_BRACKET_PATTERN = re.compile(r"\s*[\(\[\{].*")
+_REF_EXTRA_SEP_PATTERN = re.compile(r"\s*(?:\||//|★|☆).*")
+
+
+def clean_title_reference(title: str, remove_artist_pattern: bool = True) -> str:
+    if not title: return ""
+    text = title.strip()
+    if remove_artist_pattern:
+        hyphen_match = spotify_helper._ARTIST_TITLE_SEP.match(text)
+        if hyphen_match:
+            text = hyphen_match.group(2).strip()
+        elif "|" in text:
+            text = text.split("|", 1)[-1].strip()
+    text = spotify_helper._CLEANUP_PATTERN.sub("", text)
+    text = _REF_BRACKET_PATTERN.sub("", text)
+    text = _REF_EXTRA_SEP_PATTERN.sub("", text)
+    text = spotify_helper._EXTRA_WORDS_PATTERN.sub("", text)
+    text = text.replace("_", " ")
+    text = re.sub(r"\s+", " ", text)
+    text = text.strip(" -|/")
+    return text.strip()
+
+
+_FUZZ_TOKENS = [
+    "a", "Bo", "x", " ", "  ", "\n", "\t", "\r", "　", "\xa0", "_", "-", " - ", "(", ")", "[", "]", "{", "}",
+    "|", "||", "/", "//", "★", "☆", "&amp;", "&", "amp;", "#", "#12", "12", " #3", "official", "Video", "remix",
+    "ft.", "feat", "live", "hd", "4K", "é", "ñ", "Ü",
+]
+
+
+def load_corpus() -> List[str]:
+    titles: List[str] = []
+    for path in sorted(CORPUS_DIR.glob("*.txt")):
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if line.strip() and not line.startswith("#"):
+                titles.append(line)
+    return titles
+
+
+def workload(corpus: List[str], refills: int, per_refill: int, seed: int = 3) -> List[str]:
+    # Popularidad tipo Zipf: pocos títulos aparecen en casi todos los refills
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(len(corpus))]
+    calls: List[str] = []
+    for _ in range(refills):
+        batch = rng.choices(corpus, weights=weights, k=per_refill)
+        calls.extend(batch)          # pool / scoring
+        calls.extend(batch[:per_refill // 2])  # selección
+        calls.extend(batch[:5])      # historial
+    return calls
+
+
+def check_identical(titles: List[str]) -> List[str]:
+    problems = []
+    for title in titles:
+        for flag in (True, False):
+            expected = clean_title_reference(title, flag)
+            got = clean_title(title, flag)
+            if got != expected:
+                problems.append(f"{title!r} (artist={flag}): {expected!r} ≠ {got!r}")
+    return problems
+
+
+def fuzz_titles(count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    return ["".join(rng.choice(_FUZZ_TOKENS) for _ in range(rng.randint(0, 14))) for _ in range(count)]
+
+
+def _time(fn: Callable[[], None], repeat: int, before: Callable[[], None] = lambda: None) -> float:
+    samples = []
+    for _ in range(repeat):
+        before()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark de clean_title")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--refills", type=int, default=50)
+    ap.add_argument("--per-refill", type=int, default=120, help="títulos limpiados por refill (tamaño del pool)")
+    ap.add_argument("--fuzz", type=int, default=100000, help="cadenas aleatorias para comparar con la referencia")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    corpus = load_corpus()
+    if not corpus:
+        print(f"Sin corpus en {CORPUS_DIR}")
+        return 1
+
+    problems = check_identical(corpus) + check_identical(fuzz_titles(args.fuzz, args.seed))
+    for problem in problems[:20]:
+        print(f"❌ {problem}")
+    if problems:
+        print(f"❌ {len(problems)} diferencias con la implementación anterior")
+        return 1
+    print(f"✅ Salida idéntica: {len(corpus)} títulos del corpus + {args.fuzz} aleatorios (ambos modos)")
+
+    calls = workload(corpus, args.refills, args.per_refill)
+    clear = spotify_helper._clean_title_cached.cache_clear
+
+    def run(fn: Callable[[str, bool], str]) -> Callable[[], None]:
+        def inner() -> None:
+            for title in calls:
+                fn(title, False)
+        return inner
+
+    rows = [
+        ("referencia", _time(run(clean_title_reference), args.repeat)),
+        ("rápida sin memo", _time(run(spotify_helper._clean_title_cached.__wrapped__), args.repeat)),
+        ("clean_title (memo frío)", _time(run(clean_title), args.repeat, before=clear)),
+        ("clean_title (memo caliente)", _time(run(clean_title), args.repeat)),
+        ("clean_titles (lote, frío)", _time(lambda: clean_titles(calls, False), args.repeat, before=clear)),
+    ]
+    base = rows[0][1]
+    print(f"{len(calls)} llamadas, {len(set(calls))} títulos distintos")
+    print(f"{'variante':30} {'ms':>8} {'µs/título':>10} {'x':>6}")
+    for name, seconds in rows:
+        print(f"{name:30} {seconds * 1000:8.2f} {seconds / len(calls) * 1e6:10.2f} {base / seconds:6.1f}")
+    info = spotify_helper._clean_title_cached.cache_info()
+    print(f"Memo: {info.currsize}/{info.maxsize} entradas, hits={info.hits} misses={info.misses}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
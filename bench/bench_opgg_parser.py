@@ -0,0 +1,72 @@
+# --- bench/bench_opgg_parser.py (Parser OP.GG: lxml/XPath vs BeautifulSoup) ---
+#
+# Uso:  python -m bench.bench_opgg_parser [--repeat 20]
+# Compara tiempo de parseo y pico de memoria sobre las páginas guardadas en bench/fixtures/
+# y verifica que ambos parsers devuelvan exactamente la misma lista de matchups.
+# Nota: tracemalloc solo ve memoria de Python; el árbol de libxml2 (C) no aparece en la columna lxml.
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from bot.utils.matchup_service import parse_opgg_matchups, parse_opgg_matchups_bs4
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+def _time_parser(parser, content: bytes, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser(content)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def _peak_memory(parser, content: bytes) -> int:
+    tracemalloc.start()
+    try:
+        parser(content)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+    logging.disable(logging.CRITICAL)  # Los parsers loguean por página
+
+    fixtures = sorted(FIXTURES_DIR.glob("opgg_*.html"))
+    if not fixtures:
+        print(f"Sin fixtures en {FIXTURES_DIR}")
+        return 1
+
+    ok = True
+    print(f"{'fixture':40} {'items':>5} {'bs4 ms':>9} {'lxml ms':>9} {'x':>6} {'bs4 KiB':>9} {'lxml KiB':>9}")
+    for path in fixtures:
+        content = path.read_bytes()
+        expected = parse_opgg_matchups_bs4(content)
+        got = parse_opgg_matchups(content)
+        if got != expected:
+            ok = False
+            print(f"❌ {path.name}: resultados distintos\n  bs4={expected}\n  lxml={got}")
+            continue
+        t_bs4 = _time_parser(parse_opgg_matchups_bs4, content, args.repeat)
+        t_lxml = _time_parser(parse_opgg_matchups, content, args.repeat)
+        m_bs4 = _peak_memory(parse_opgg_matchups_bs4, content)
+        m_lxml = _peak_memory(parse_opgg_matchups, content)
+        print(
+            f"{path.name:40} {len(got or []):>5} {t_bs4 * 1000:>9.2f} {t_lxml * 1000:>9.2f} "
+            f"{t_bs4 / t_lxml:>5.1f}x {m_bs4 / 1024:>9.0f} {m_lxml / 1024:>9.0f}"
+        )
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+# --- bench/bench_radio.py (Motores de radio offline: coocurrencia y fallback sobre fixtures grabados) ---
+#
+# Uso:
+#   python -m bench.bench_radio                     # corre y muestra la tabla
+#   python -m bench.bench_radio --check             # falla (exit 1) si empeora respecto del baseline
+#   python -m bench.bench_radio --update-baseline   # guarda los números actuales como baseline
+#   python -m bench.bench_radio --record-synthetic  # regraba el fixture desde bench/spotify_catalog.py
+#
+# Las respuestas de Spotify salen de bench/fixtures/spotify/ vía ReplaySpotify (sin red ni credenciales).
+# Para grabar un fixture real: correr el bot con SPOTIFY_RECORD_FILE=ruta.json.gz y pasar --fixture/--seeds.
+# Por semilla y motor se mide: llamadas a la API, tiempo (mediana), CPU, pico de memoria y
+# asignaciones (tracemalloc), más un hash del resultado para detectar cambios de comportamiento.
+# "cooc" es el motor con muestreo adaptativo de playlists y "cooc_full" el mismo escaneando todas: el
+# resumen muestra cuántos de los temas de cooc_full devuelve también cooc (calidad del corte temprano).
+# Las cachés de semillas (SEED_CACHE_PATH) y de colaboradores (COARTIST_CACHE_TTL_HOURS) se desactivan
+# para que las llamadas por semilla no dependan del historial.
+# El orden de iteración de algunos sets depende del hash de str: el script se re-ejecuta con
+# PYTHONHASHSEED=0 para que las llamadas coincidan con las grabadas.
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from bot.utils import spotify_helper
+from bot.utils.spotify_replay import RecordingSpotify, ReplaySpotify
+
+BENCH_DIR = Path(__file__).parent
+FIXTURE = BENCH_DIR / "fixtures" / "spotify" / "radio_synthetic.json.gz"
+SEEDS_FILE = BENCH_DIR / "fixtures" / "spotify" / "radio_synthetic_seeds.json"
+BASELINE = BENCH_DIR / "radio_baseline.json"
+
+ENGINES: Dict[str, Callable[..., Any]] = {
+    "cooc": spotify_helper._fetch_radio_cooc_sync,
+    "cooc_full": spotify_helper._fetch_radio_cooc_sync,  # todas las playlists, sin corte por convergencia
+    "fallback": spotify_helper._fetch_recommendation_playlist_search_sync,
+}
+
+
+def _ensure_hash_seed() -> None:
+    if os.environ.get("PYTHONHASHSEED") != "0":
+        env = dict(os.environ, PYTHONHASHSEED="0")
+        os.execve(sys.executable, [sys.executable, "-m", "bench.bench_radio", *sys.argv[1:]], env)
+
+
+def _run_engine(engine: str, seed: str) -> Any:
+    # El motor de coocurrencia recibe mercado explícito para no depender de SPOTIFY_MARKET
+    if engine == "cooc":
+        return ENGINES[engine](seed, (), "AR", adaptativo=True)
+    if engine == "cooc_full":
+        return ENGINES[engine](seed, (), "AR", adaptativo=False)
+    return ENGINES[engine](seed, ())
+
+
+def _digest(result: Any) -> str:
+    return hashlib.sha1(json.dumps(result, ensure_ascii=False).encode()).hexdigest()[:12]
+
+
+def record_synthetic(seeds_count: int) -> int:
+    from bench.spotify_catalog import SyntheticCatalog
+
+    catalog = SyntheticCatalog()
+    seeds = catalog.seed_titles(seeds_count)
+    FIXTURE.unlink(missing_ok=True)
+    recorder = RecordingSpotify(catalog, FIXTURE, autosave_every=0)
+    spotify_helper._SPOTIFY_CLIENT = recorder
+    for seed in seeds:
+        for engine in ENGINES:
+            _run_engine(engine, seed)
+    recorder.save()
+    SEEDS_FILE.write_text(json.dumps(seeds, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    print(f"Fixture: {len(recorder)} respuestas en {FIXTURE} ({FIXTURE.stat().st_size // 1024} KiB), {len(seeds)} semillas")
+    return 0
+
+
+def measure(client: ReplaySpotify, engine: str, seed: str, repeat: int) -> Dict[str, Any]:
+    spotify_helper._SPOTIFY_CLIENT = client
+    calls_before, misses_before = client.calls, client.misses
+    result = _run_engine(engine, seed)
+    calls = client.calls - calls_before
+    misses = client.misses - misses_before
+
+    walls, cpus = [], []
+    for _ in range(repeat):
+        w0, c0 = time.perf_counter(), time.process_time()
+        _run_engine(engine, seed)
+        walls.append(time.perf_counter() - w0)
+        cpus.append(time.process_time() - c0)
+
+    tracemalloc.start()
+    try:
+        _run_engine(engine, seed)
+        peak = tracemalloc.get_traced_memory()[1]
+        allocs = sum(stat.count for stat in tracemalloc.take_snapshot().statistics("filename"))
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "api_calls": calls,
+        "misses": misses,
+        "results": len(result or []),
+        "digest": _digest(result),
+        "track_ids": [rec[2] for rec in result or []],
+        "wall_ms": statistics.median(walls) * 1000,
+        "cpu_ms": statistics.median(cpus) * 1000,
+        "peak_kib": peak / 1024,
+        "live_blocks": allocs,
+    }
+
+
+def compare(current: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], time_tol: float, mem_tol: float,
+            time_floor_ms: float = 1.0) -> List[str]:
+    problems: List[str] = []
+    for key, cur in current.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if cur["api_calls"] > base["api_calls"]:
+            problems.append(f"{key}: llamadas API {base['api_calls']} → {cur['api_calls']}")
+        if cur["digest"] != base["digest"]:
+            problems.append(f"{key}: el resultado cambió ({base['digest']} → {cur['digest']})")
+        # Diferencias por debajo de `time_floor_ms` son ruido del reloj (el fallback tarda < 1ms)
+        if cur["wall_ms"] > base["wall_ms"] * (1 + time_tol) and cur["wall_ms"] - base["wall_ms"] > time_floor_ms:
+            problems.append(f"{key}: tiempo {base['wall_ms']:.1f}ms → {cur['wall_ms']:.1f}ms")
+        if cur["peak_kib"] > base["peak_kib"] * (1 + mem_tol):
+            problems.append(f"{key}: pico de memoria {base['peak_kib']:.0f}KiB → {cur['peak_kib']:.0f}KiB")
+    return problems
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark offline de los motores de radio")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--fixture", type=Path, default=FIXTURE)
+    ap.add_argument("--seeds", type=Path, default=SEEDS_FILE)
+    ap.add_argument("--baseline", type=Path, default=BASELINE)
+    ap.add_argument("--check", action="store_true", help="exit 1 si hay regresiones respecto del baseline")
+    ap.add_argument("--update-baseline", action="store_true")
+    ap.add_argument("--time-tolerance", type=float, default=0.5, help="margen relativo de tiempo (0.5 = +50%%)")
+    ap.add_argument("--time-floor-ms", type=float, default=1.0, help="ignorar diferencias de tiempo menores a esto")
+    ap.add_argument("--mem-tolerance", type=float, default=0.2, help="margen relativo del pico de memoria")
+    ap.add_argument("--record-synthetic", action="store_true", help="regrabar el fixture desde el catálogo sintético")
+    ap.add_argument("--record-seeds", type=int, default=6)
+    args = ap.parse_args()
+    # Sin cachés: cada corrida mide la resolución de la semilla y la vecindad de colaboradores contra el fixture
+    os.environ["SEED_CACHE_PATH"] = ""
+    os.environ["COARTIST_CACHE_TTL_HOURS"] = "0"
+    _ensure_hash_seed()
+    logging.disable(logging.CRITICAL)  # Los motores loguean cada etapa
+
+    if args.record_synthetic:
+        return record_synthetic(args.record_seeds)
+
+    if not args.fixture.is_file() or not args.seeds.is_file():
+        print(f"Sin fixture en {args.fixture} (usar --record-synthetic)")
+        return 1
+    client = ReplaySpotify.from_file(args.fixture)
+    seeds: List[str] = json.loads(args.seeds.read_text(encoding="utf-8"))
+
+    current: Dict[str, Dict[str, Any]] = {}
+    print(f"{'seed':44} {'engine':9} {'calls':>5} {'res':>3} {'ms':>8} {'cpu ms':>8} {'peak KiB':>9} {'blocks':>7}")
+    for seed in seeds:
+        for engine in ENGINES:
+            row = measure(client, engine, seed, args.repeat)
+            current[f"{engine}:{seed}"] = row
+            miss = f"  ⚠️ {row['misses']} sin grabar" if row["misses"] else ""
+            print(f"{seed[:44]:44} {engine:9} {row['api_calls']:5d} {row['results']:3d} {row['wall_ms']:8.2f} "
+                  f"{row['cpu_ms']:8.2f} {row['peak_kib']:9.0f} {row['live_blocks']:7d}{miss}")
+
+    totals: Dict[str, Tuple[float, int]] = {}
+    for key, row in current.items():
+        engine = key.split(":", 1)[0]
+        ms, calls = totals.get(engine, (0.0, 0))
+        totals[engine] = (ms + row["wall_ms"], calls + row["api_calls"])
+    for engine, (ms, calls) in totals.items():
+        print(f"Total {engine}: {ms:.1f}ms, {calls} llamadas API")
+    if "cooc" in totals and "cooc_full" in totals:
+        shared = expected = 0
+        for seed in seeds:
+            full = set(current[f"cooc_full:{seed}"]["track_ids"])
+            shared += len(full & set(current[f"cooc:{seed}"]["track_ids"]))
+            expected += len(full)
+        saved = 1 - totals["cooc"][1] / max(1, totals["cooc_full"][1])
+        print(f"Muestreo adaptativo: {shared}/{expected} temas en común con cooc_full, {saved:.0%} menos llamadas API")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(current, ensure_ascii=False, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Baseline actualizado: {args.baseline}")
+        return 0
+
+    if args.check:
+        if not args.baseline.is_file():
+            print(f"Sin baseline en {args.baseline} (usar --update-baseline)")
+            return 1
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        problems = compare(current, baseline, args.time_tolerance, args.mem_tolerance, args.time_floor_ms)
+        if any(row["misses"] for row in current.values()):
+            problems.append("hay llamadas que no están en el fixture (¿cambió el patrón de llamadas? regrabar)")
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            return 1
+        print("✅ Sin regresiones respecto del baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
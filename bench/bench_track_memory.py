@@ -0,0 +1,101 @@
+# --- bench/bench_track_memory.py (Memoria por AudioTrack: dataclass con dicts propios vs slots + headers internados) ---
+#
+# Uso:  python -m bench.bench_track_memory [--tracks 5000]
+# Arma N entradas sintéticas como las devuelve yt-dlp (cada una con su copia de http_headers) y mide el
+# tamaño profundo por pista: objeto + campos + headers, contando una sola vez los objetos compartidos.
+# También compara el snapshot JSON de dump_tracks() contra una lista de dicts por pista.
+# Nota: las colas del bot guardan wavelink.Playable, no AudioTrack; esto mide solo las pistas de
+# bot/utils/audio.py (búsquedas yt-dlp, dump_tracks/load_tracks).
+
+import argparse
+import json
+import sys
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, Optional, Set
+
+from bot.utils.audio import AudioTrack, dump_tracks
+
+# Headers típicos de yt-dlp (las mismas 4 claves en todas las entradas)
+_YTDL_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-us,en;q=0.5",
+    "Sec-Fetch-Mode": "navigate",
+}
+
+
+@dataclass
+class LegacyAudioTrack:
+    """AudioTrack anterior: dataclass común, con __dict__ y su propio dict de headers."""
+    title: str
+    stream_url: str
+    source_url: str
+    headers: Dict[str, str]
+    spotify_track_id: Optional[str] = None
+
+
+def _entries(n: int) -> Iterable[dict]:
+    for i in range(n):
+        video_id = f"vid{i:08d}"
+        yield {
+            "title": f"Artista {i % 97} - Tema {i}",
+            "url": f"https://rr{i % 9}---sn-example.googlevideo.com/videoplayback?id={video_id}&itag=251&expire=1760000000",
+            "webpage_url": f"https://www.youtube.com/watch?v={video_id}",
+            # yt-dlp devuelve una copia nueva del dict (y de sus strings) por entrada
+            "http_headers": {"".join(k): "".join(v) for k, v in _YTDL_HEADERS.items()},
+        }
+
+
+def _deep_size(obj, seen: Set[int]) -> int:
+    """sys.getsizeof recursivo sobre campos, dicts y mappings; los objetos ya vistos no se cuentan de nuevo."""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, int, float, type(None))):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    if hasattr(obj, "items") and hasattr(obj, "keys"):  # MappingProxyType
+        return size + sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    if hasattr(obj, "__dict__"):
+        size += _deep_size(obj.__dict__, seen)
+    for slot in getattr(type(obj), "__slots__", ()):
+        size += _deep_size(getattr(obj, slot, None), seen)
+    return size
+
+
+def _per_track(tracks: list) -> float:
+    seen: Set[int] = set()
+    return sum(_deep_size(t, seen) for t in tracks) / len(tracks)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--tracks", type=int, default=5000)
+    args = ap.parse_args()
+
+    legacy = [
+        LegacyAudioTrack(e["title"], e["url"], e["webpage_url"], e["http_headers"]) for e in _entries(args.tracks)
+    ]
+    current = [
+        AudioTrack(title=e["title"], stream_url=e["url"], source_url=e["webpage_url"], headers=e["http_headers"])
+        for e in _entries(args.tracks)
+    ]
+
+    before = _per_track(legacy)
+    after = _per_track(current)
+    naive_json = len(json.dumps([asdict(t) for t in legacy], separators=(",", ":"), ensure_ascii=False))
+    compact_json = len(json.dumps(dump_tracks(current), separators=(",", ":"), ensure_ascii=False))
+
+    print(f"{args.tracks} pistas sintéticas (4 http_headers por entrada)")
+    print(f"{'':28} {'bytes/pista':>12}")
+    print(f"{'dataclass + dict propio':28} {before:>12.0f}")
+    print(f"{'slots + headers internados':28} {after:>12.0f}   ({1 - after / before:.0%} menos)")
+    print(f"{'JSON dicts por pista':28} {naive_json / args.tracks:>12.0f}")
+    print(f"{'JSON dump_tracks()':28} {compact_json / args.tracks:>12.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+# --- bench/spotify_catalog.py (Catálogo sintético y determinista con la forma de la API de Spotify) ---
+#
+# Genera artistas, álbumes, temas (con feats) y playlists temáticas a partir de una semilla, y expone
+# los mismos métodos de spotipy que usa el bot (search, track, album, album_tracks, playlist,
+# playlist_items, artist, artists, artist_top_tracks). Lo usan:
+#  - bench/bench_radio.py --record-synthetic (para generar fixtures sin credenciales)
+#  - loadtest/spotify_stub.py (servidor HTTP que imita la Web API)
+
+import hashlib
+import random
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+_SYLLABLES = (
+    "ka", "lo", "mi", "ra", "ne", "so", "ta", "vi", "du", "le", "ma", "ri", "no", "sa", "te", "ba",
+    "go", "li", "za", "pe", "qu", "ro", "fa", "xi", "ju", "an", "el", "or", "us", "ia",
+)
+_GENRES = (
+    "reggaeton", "trap latino", "urbano latino", "latin pop", "pop", "dance pop", "rock",
+    "indie rock", "alternative rock", "hip hop", "rap", "r&b", "edm", "house", "techno",
+    "cumbia", "salsa", "bachata", "k-pop", "metal",
+)
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall(text.lower())
+
+
+# --- Filtro `fields=` de la Web API ("items(track(id,name,artists(id,name)))", "followers.total,name") ---
+def _parse_fields(spec: str, pos: int = 0) -> Tuple[Dict[str, Any], int]:
+    tree: Dict[str, Any] = {}
+    while pos < len(spec):
+        name, sub, pos = _parse_field(spec, pos)
+        if name:
+            tree[name] = _merge_fields(tree.get(name), sub)
+        if pos < len(spec) and spec[pos] == ",":
+            pos += 1
+            continue
+        break  # ")" o fin
+    return tree, pos
+
+
+def _parse_field(spec: str, pos: int) -> Tuple[str, Any, int]:
+    end = pos
+    while end < len(spec) and spec[end] not in ",().":
+        end += 1
+    name, pos = spec[pos:end], end
+    sub: Any = None
+    if pos < len(spec) and spec[pos] == "(":
+        sub, pos = _parse_fields(spec, pos + 1)
+        pos += 1  # ")"
+    elif pos < len(spec) and spec[pos] == ".":
+        child, child_sub, pos = _parse_field(spec, pos + 1)
+        sub = {child: child_sub}
+    return name, sub, pos
+
+
+def _merge_fields(a: Any, b: Any) -> Any:
+    if a is None or b is None:
+        return a if b is None else b
+    return {**a, **b}
+
+
+def _apply_fields(obj: Any, tree: Optional[Dict[str, Any]]) -> Any:
+    if tree is None:
+        return obj
+    if isinstance(obj, list):
+        return [_apply_fields(o, tree) for o in obj]
+    if not isinstance(obj, dict):
+        return obj
+    return {k: _apply_fields(obj[k], sub) for k, sub in tree.items() if k in obj}
+
+
+def filter_fields(obj: Any, fields: Optional[str]) -> Any:
+    """Aplica el parámetro `fields` de la API de Spotify a una respuesta ya construida."""
+    if not fields:
+        return obj
+    return _apply_fields(obj, _parse_fields(fields.replace(" ", ""))[0])
+
+
+class SyntheticCatalog:
+    def __init__(self, seed: int = 1234, n_artists: int = 300, n_playlists: int = 500):
+        self._rng = random.Random(seed)
+        self.artist_data: Dict[str, Dict[str, Any]] = {}
+        self.album_data: Dict[str, Dict[str, Any]] = {}
+        self.track_data: Dict[str, Dict[str, Any]] = {}
+        self.playlist_data: Dict[str, Dict[str, Any]] = {}
+        self._artist_tracks: Dict[str, List[str]] = {}
+        self._genre_artists: Dict[str, List[str]] = {g: [] for g in _GENRES}
+        self._build(n_artists, n_playlists)
+        self._build_indexes()
+
+    # --- Generación ---
+    def _id(self, kind: str, n: int) -> str:
+        return hashlib.sha1(f"{kind}:{n}".encode()).hexdigest()[:22]
+
+    def _name(self, parts: int) -> str:
+        return " ".join(
+            "".join(self._rng.choice(_SYLLABLES) for _ in range(self._rng.randint(2, 3))).capitalize()
+            for _ in range(parts)
+        )
+
+    def _build(self, n_artists: int, n_playlists: int) -> None:
+        rng = self._rng
+        for i in range(n_artists):
+            aid = self._id("artist", i)
+            genres = rng.sample(_GENRES, rng.randint(1, 3))
+            self.artist_data[aid] = {
+                "id": aid,
+                "name": self._name(rng.randint(1, 2)),
+                "genres": genres,
+                "popularity": rng.randint(5, 95),
+                "followers": {"total": rng.randint(100, 5_000_000)},
+                "type": "artist",
+            }
+            self._artist_tracks[aid] = []
+            for g in genres:
+                self._genre_artists[g].append(aid)
+
+        artist_ids = list(self.artist_data)
+        n_album = n_track = 0
+        for aid in artist_ids:
+            main_genre = self.artist_data[aid]["genres"][0]
+            for _ in range(rng.randint(1, 3)):
+                alb_id = self._id("album", n_album)
+                n_album += 1
+                year = rng.randint(1995, 2025)
+                album = {
+                    "id": alb_id,
+                    "name": self._name(rng.randint(1, 3)),
+                    "release_date": f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                    "images": [
+                        {"url": f"https://i.scdn.co/image/{alb_id}640", "height": 640, "width": 640},
+                        {"url": f"https://i.scdn.co/image/{alb_id}300", "height": 300, "width": 300},
+                    ],
+                    "artists": [{"id": aid, "name": self.artist_data[aid]["name"]}],
+                    "track_ids": [],
+                }
+                self.album_data[alb_id] = album
+                for _ in range(rng.randint(4, 10)):
+                    tid = self._id("track", n_track)
+                    n_track += 1
+                    credits = [aid]
+                    if rng.random() < 0.3:  # feat con alguien del mismo género
+                        peers = self._genre_artists[main_genre]
+                        feat = rng.choice(peers)
+                        if feat != aid:
+                            credits.append(feat)
+                    self.track_data[tid] = {
+                        "id": tid,
+                        "name": self._name(rng.randint(1, 3)),
+                        "popularity": rng.randint(0, 100),
+                        "duration_ms": rng.randint(120_000, 300_000),
+                        "explicit": rng.random() < 0.2,
+                        "is_local": False,
+                        "external_ids": {"isrc": f"QZ{hashlib.sha1(tid.encode()).hexdigest()[:10].upper()}"},
+                        "artist_ids": credits,
+                        "album_id": alb_id,
+                    }
+                    album["track_ids"].append(tid)
+                    for credited in credits:
+                        self._artist_tracks[credited].append(tid)
+
+        for i in range(n_playlists):
+            pid = self._id("playlist", i)
+            genre = rng.choice(_GENRES)
+            pool_artists = self._genre_artists[genre] or artist_ids
+            picked: List[str] = []
+            for _ in range(rng.randint(20, 60)):
+                # 80% del género de la playlist, 20% cualquier cosa
+                source = pool_artists if rng.random() < 0.8 else artist_ids
+                tracks = self._artist_tracks[rng.choice(source)]
+                if tracks:
+                    picked.append(rng.choice(tracks))
+            picked = list(dict.fromkeys(picked))
+            featured = list(dict.fromkeys(self.track_data[t]["artist_ids"][0] for t in picked))[:4]
+            names = ", ".join(self.artist_data[a]["name"] for a in featured)
+            self.playlist_data[pid] = {
+                "id": pid,
+                "name": f"{genre.title()} {self._name(1)}",
+                "description": f"Lo mejor de {names} y más",
+                "followers": {"total": rng.randint(0, 2_000_000)},
+                "owner": {"id": "synthetic", "display_name": "Synthetic"},
+                "track_ids": picked,
+            }
+
+    # --- Serialización con la forma de la API ---
+    def _artist_ref(self, aid: str) -> Dict[str, Any]:
+        return {"id": aid, "name": self.artist_data[aid]["name"], "type": "artist"}
+
+    def _album_ref(self, alb_id: str) -> Dict[str, Any]:
+        a = self.album_data[alb_id]
+        return {"id": a["id"], "name": a["name"], "release_date": a["release_date"], "images": a["images"],
+                "artists": a["artists"]}
+
+    def _track(self, tid: str, *, with_album: bool = True) -> Dict[str, Any]:
+        t = self.track_data[tid]
+        out = {k: v for k, v in t.items() if k not in ("artist_ids", "album_id")}
+        out["artists"] = [self._artist_ref(a) for a in t["artist_ids"]]
+        out["type"] = "track"
+        if with_album:
+            out["album"] = self._album_ref(t["album_id"])
+        return out
+
+    def _playlist_ref(self, pid: str) -> Dict[str, Any]:
+        p = self.playlist_data[pid]
+        return {"id": pid, "name": p["name"], "description": p["description"], "owner": p["owner"],
+                "tracks": {"total": len(p["track_ids"])}}
+
+    @staticmethod
+    def _page(items: List[Any], limit: int, offset: int) -> Dict[str, Any]:
+        return {"items": items[offset:offset + limit], "limit": limit, "offset": offset, "total": len(items)}
+
+    # --- Índice invertido para search (palabra → ids) ---
+    def _build_indexes(self) -> None:
+        self._track_index: Dict[str, Set[str]] = {}
+        for tid, t in self.track_data.items():
+            words = set(_words(t["name"])) | {w for a in t["artist_ids"] for w in _words(self.artist_data[a]["name"])}
+            for w in words:
+                self._track_index.setdefault(w, set()).add(tid)
+        self._playlist_index: Dict[str, Set[str]] = {}
+        for pid, p in self.playlist_data.items():
+            for w in set(_words(p["name"] + " " + p["description"])):
+                self._playlist_index.setdefault(w, set()).add(pid)
+        self._artist_index: Dict[str, Set[str]] = {}
+        for aid, a in self.artist_data.items():
+            for w in set(_words(a["name"])):
+                self._artist_index.setdefault(w, set()).add(aid)
+
+    @staticmethod
+    def _hits(index: Dict[str, Set[str]], terms: Set[str]) -> Dict[str, int]:
+        hits: Dict[str, int] = {}
+        for term in terms:
+            for item_id in index.get(term, ()):
+                hits[item_id] = hits.get(item_id, 0) + 1
+        return hits
+
+    # --- API (mismas firmas que spotipy) ---
+    def search(self, q: str, limit: int = 10, offset: int = 0, type: str = "track", market: Optional[str] = None) -> Dict[str, Any]:
+        terms = set(_words(q.replace('"', " ")))
+        if type == "track":
+            hits = self._hits(self._track_index, terms)
+            ranked = sorted(hits, key=lambda tid: (-hits[tid], -self.track_data[tid]["popularity"], tid))
+            page = self._page(ranked, limit, offset)
+            page["items"] = [self._track(tid) for tid in page["items"]]
+            return {"tracks": page}
+        if type == "playlist":
+            hits = self._hits(self._playlist_index, terms)
+            ranked = sorted(hits, key=lambda pid: (-hits[pid], -self.playlist_data[pid]["followers"]["total"], pid))
+            page = self._page(ranked, limit, offset)
+            page["items"] = [self._playlist_ref(pid) for pid in page["items"]]
+            return {"playlists": page}
+        if type == "artist":
+            hits = self._hits(self._artist_index, terms)
+            matched = [aid for aid in self.artist_data if aid in hits]
+            page = self._page(matched, limit, offset)
+            page["items"] = [dict(self.artist_data[aid]) for aid in page["items"]]
+            return {"artists": page}
+        return {}
+
+    def track(self, track_id: str, market: Optional[str] = None) -> Dict[str, Any]:
+        return self._track(track_id)
+
+    def album(self, album_id: str, market: Optional[str] = None) -> Dict[str, Any]:
+        a = self.album_data[album_id]
+        out = self._album_ref(album_id)
+        out["tracks"] = self._page([self._track(t, with_album=False) for t in a["track_ids"]], 50, 0)
+        return out
+
+    def album_tracks(self, album_id: str, limit: int = 50, offset: int = 0, market: Optional[str] = None) -> Dict[str, Any]:
+        return self._page([self._track(t, with_album=False) for t in self.album_data[album_id]["track_ids"]], limit, offset)
+
+    def playlist(self, playlist_id: str, fields: Optional[str] = None, market: Optional[str] = None, additional_types=("track",)) -> Dict[str, Any]:
+        p = self.playlist_data[playlist_id]
+        out = self._playlist_ref(playlist_id)
+        out["followers"] = p["followers"]
+        # Como la API real: el objeto completo trae la primera página (100) de tracks
+        out["tracks"] = self._page([{"track": self._track(t)} for t in p["track_ids"][:100]], 100, 0)
+        out["tracks"]["total"] = len(p["track_ids"])
+        return filter_fields(out, fields)
+
+    def playlist_items(self, playlist_id: str, fields: Optional[str] = None, limit: int = 100, offset: int = 0,
+                       market: Optional[str] = None, additional_types=("track", "episode")) -> Dict[str, Any]:
+        track_ids = self.playlist_data[playlist_id]["track_ids"][offset:offset + limit]
+        page = self._page([{"track": self._track(t)} for t in track_ids], limit, 0)
+        page["offset"], page["total"] = offset, len(self.playlist_data[playlist_id]["track_ids"])
+        return filter_fields(page, fields)
+
+    def artist(self, artist_id: str) -> Dict[str, Any]:
+        return dict(self.artist_data[artist_id])
+
+    def artists(self, artists: List[str]) -> Dict[str, Any]:
+        return {"artists": [dict(self.artist_data[a]) if a in self.artist_data else None for a in artists[:50]]}
+
+    def artist_top_tracks(self, artist_id: str, country: str = "US") -> Dict[str, Any]:
+        tids = sorted(self._artist_tracks.get(artist_id, []), key=lambda t: -self.track_data[t]["popularity"])[:10]
+        return {"tracks": [self._track(t) for t in tids]}
+
+    # --- Ayudas para benchmarks ---
+    def seed_titles(self, n: int, seed: int = 7) -> List[str]:
+        """Títulos estilo YouTube ("Artista - Tema (Official Video)") de temas populares del catálogo."""
+        rng = random.Random(seed)
+        popular = sorted(self.track_data, key=lambda t: -self.track_data[t]["popularity"])[: n * 10]
+        picks = rng.sample(popular, n)
+        decorations = ("", " (Official Video)", " [Lyrics]", " (Audio)", " | Video Oficial")
+        return [
+            f"{self.artist_data[self.track_data[t]['artist_ids'][0]]['name']} - {self.track_data[t]['name']}{rng.choice(decorations)}"
+            for t in picks
+        ]
@@ -3,6 +3,7 @@
 import asyncio
 import logging
 import re
+import time
 from typing import cast, Optional, Dict, Set, Tuple, List
 
 import discord
@@ -14,6 +15,7 @@ try:
     from bot.utils.spotify_helper import (
         fetch_spotify_recommendation,
         clean_title,
+        radio_stage_report,
         _ensure_spotify_client
     )
 except ImportError:
@@ -31,6 +33,32 @@ except ImportError:
     def _ensure_spotify_client():
         return None
 
+    def radio_stage_report():
+        return []
+
+try:
+    from bot.utils.seed_cache import get_seed_cache
+except ImportError:
+    logging.error("No se pudo importar seed_cache.")
+
+    def get_seed_cache():
+        return None
+
+try:
+    from bot.utils.coartist_cache import get_coartist_cache
+except ImportError:
+    logging.error("No se pudo importar coartist_cache.")
+
+    def get_coartist_cache():
+        return None
+
+from bot.utils.audio import search_many
+from bot.utils.executors import ExecutorSaturated, get_executor
+from bot.utils.metrics import histogram, register_collector, register_gauges
+from bot.utils.prefetch import LookaheadPrefetcher
+from bot.utils.tracing import start_span, trace_span
+from bot.utils.track_match import SpotifyTrackRef, get_track_match_store, match_spotify_track
+
 # Importar MyBot para type hinting (asumiendo que está en __main__)
 try:
     from __main__ import MyBot
@@ -42,6 +70,16 @@ except ImportError:
 # Regex para links de Spotify
 SPOTIFY_URL_REGEX = re.compile(r"https?://open\.spotify\.com/(?P<type>track|album|playlist)/(?P<id>[a-zA-Z0-9]+)")
 
+# Look-ahead de la radio: el próximo lote se arma mientras suena el último tema de la cola (y vale este tiempo)
+RADIO_PREFETCH_MAX_AGE = 1800.0
+
+# Búsquedas en Lavalink para imports (álbum/playlist): concurrencia y deadline por consulta
+SEARCH_CONCURRENCY = 6
+SEARCH_DEADLINE = 15.0
+
+# Métricas: duración total de un refill de radio (Spotify + búsquedas Lavalink + encolado)
+RADIO_REFILL_SECONDS = histogram("bot_radio_refill_seconds", "Duración de un refill de radio", ("result",))
+
 # --- Categorías de Género Expandidas ---
 URBANO_GENRES = {
     'reggaeton', 'trap latino', 'urbano latino', 'latin hip hop', 'trap argentino',
@@ -85,6 +123,16 @@ POP_CHILL_GENRES = {
 }
 
 
+class _RadioBatch:
+    """Temas que encoló un refill de radio; un Cooc+Feats tardío puede reemplazarlos."""
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.tracks: List[wavelink.Playable] = []
+        self.rec_data: Dict[int, Tuple] = {}  # id(track) → recomendación de Spotify
+        self.enqueued = asyncio.Event()
+
+
 class MusicWavelinkCog(commands.Cog, name="Music"):
     """Cog de Música con Wavelink, Radio, Imágenes, Links Spotify y Comentarios."""
 
@@ -93,10 +141,32 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
         self.last_text_channel: Dict[int, discord.TextChannel] = {}
         self.radio_enabled: Dict[int, bool] = {}
         self.radio_session_history: Dict[int, Set[str]] = {}
+        # Refill de radio vigente por guild (un lote tardío de Cooc+Feats solo reemplaza al último)
+        self._radio_refill_gen: Dict[int, int] = {}
         # Retries por tema para TrackStuck
         self._stuck_retries: Dict[Tuple[int, str], int] = {}
         # Tracking de intentos de alternativas para evitar loops
         self._alternative_attempts: Dict[Tuple[int, str], int] = {}
+        # Próximo lote de radio (Spotify + Lavalink) pre-resuelto por guild (se invalida al mutar la cola)
+        self._radio_prefetch: LookaheadPrefetcher[Tuple[int, wavelink.Playable, wavelink.Player], Tuple[List[Tuple], List[Tuple]]] = LookaheadPrefetcher(
+            self._prefetch_radio_batch,
+            depth=1,
+            key=lambda item: item[1].identifier,
+            max_age=RADIO_PREFETCH_MAX_AGE,
+            name="radio-prefetch",
+        )
+        register_gauges("radio-prefetch", self._radio_prefetch.gauges)
+        register_collector("radio", radio_stage_report)
+        # Matches Spotify → Lavalink ya verificados (ISRC/duración)
+        self._track_matches = get_track_match_store()
+        if self._track_matches is not None:
+            register_gauges("track-matches", self._track_matches.gauges)
+        seed_cache = get_seed_cache()
+        if seed_cache is not None:
+            register_gauges("seed-cache", seed_cache.gauges)
+        coartist_cache = get_coartist_cache()
+        if coartist_cache is not None:
+            register_gauges("coartist-cache", coartist_cache.gauges)
 
     def build_embed(self, title: str, description: str, color=discord.Color.blurple()) -> discord.Embed:
         embed = discord.Embed(title=title, description=description, color=color)
@@ -116,11 +186,164 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
             if cleaned:
                 self._get_radio_history(guild_id).add(cleaned)
 
+    # --- Look-ahead de la radio ---
+    def _radio_refill_wanted(self, player: Optional[wavelink.Player], guild_id: int) -> bool:
+        """Sigue teniendo sentido armar un lote de radio: player conectado y radio activa."""
+        return bool(player and player.connected and self._is_radio_enabled(guild_id))
+
+    @staticmethod
+    def _radio_retry_budget(track: wavelink.Playable) -> Optional[float]:
+        """Tope de reintentos con el pool de Spotify lleno: la duración del tema (None = el default)."""
+        return track.length / 1000 if track.length else None
+
+    async def _prefetch_radio_batch(self, item: Tuple[int, wavelink.Playable, wavelink.Player]) -> Optional[Tuple[List[Tuple], List[Tuple]]]:
+        """
+        Recomendaciones + matches de Lavalink para el refill que disparará `track` al terminar, si la cola
+        sigue vacía. Sin cobertura (Cooc+Feats y después Fallback): hay todo el tema para esperar.
+        """
+        guild_id, track, player = item
+        history_tuples = {("", title) for title in self._get_radio_history(guild_id)}
+        recommendations = await fetch_spotify_recommendation(
+            track.title, history_tuples, seed_identifier=track.identifier, seed_isrc=track.isrc, hedge_delay=-1,
+            should_continue=lambda: self._radio_refill_wanted(player, guild_id),
+            retry_budget=self._radio_retry_budget(track),
+        )
+        if not recommendations:
+            return None
+        resolved = await self._resolve_radio_batch(guild_id, recommendations)
+        logging.info(f"Radio: lote pre-resuelto para después de '{track.title}' ({len(resolved)}/{len(recommendations)}) G:{guild_id}")
+        return recommendations, resolved
+
+    def _refresh_radio_prefetch(self, player: Optional[wavelink.Player], track: Optional[wavelink.Playable]) -> None:
+        """Pre-resuelve el lote de radio solo si `track` es el último de la cola; si no, descarta el que hubiera."""
+        if not player or not player.guild:
+            return
+        guild_id = player.guild.id
+        if track is not None and track.identifier and self._is_radio_enabled(guild_id) and player.queue.is_empty:
+            self._radio_prefetch.schedule(guild_id, [(guild_id, track, player)])
+        else:
+            self._radio_prefetch.invalidate(guild_id)
+
     def _clear_radio_history(self, guild_id: int):
         if guild_id in self.radio_session_history:
             self.radio_session_history[guild_id].clear()
             logging.info(f"Historial radio limpiado G:{guild_id}")
 
+    @staticmethod
+    def _radio_titles(rec_track: wavelink.Playable, rec_data: Tuple) -> Set[str]:
+        """Claves de historial de un tema de radio (título de Lavalink y de Spotify, limpios)."""
+        titles = {clean_title(rec_track.title, False).lower(), (rec_data[3] or "").lower()}
+        titles.discard("")
+        return titles
+
+    async def _resolve_radio_batch(
+        self, guild_id: int, recommendations_batch: List[Tuple], ignore_titles: Set[str] = frozenset(),
+    ) -> List[Tuple[wavelink.Playable, Tuple]]:
+        """Busca cada recomendación en Lavalink (sin tocar la cola) y descarta las ya reproducidas o repetidas."""
+        current_history = self._get_radio_history(guild_id) - ignore_titles
+        resolved: List[Tuple[wavelink.Playable, Tuple]] = []
+        batch_added_titles: Set[str] = set()
+        for rec_data in recommendations_batch:
+            spotify_search, _, spotify_track_id, spotify_cleaned_title, _, _, spotify_isrc, spotify_duration = rec_data
+            try:
+                # Búsqueda por texto con ranking por ISRC/duración (timeout para no trabar la radio)
+                ref = SpotifyTrackRef(
+                    track_id=spotify_track_id,
+                    name=spotify_cleaned_title or "",
+                    artist=spotify_search.split(" - ", 1)[0],
+                    isrc=spotify_isrc,
+                    duration_ms=spotify_duration,
+                )
+                with trace_span("lavalink.search", query=spotify_search) as search_span:
+                    rec_track, match_method = await asyncio.wait_for(
+                        match_spotify_track(ref, spotify_search, wavelink.Playable.search, wavelink.Playable, self._track_matches),
+                        timeout=15.0
+                    )
+                    search_span.set(match=match_method)
+                if rec_track is not None:
+                    titles = self._radio_titles(rec_track, rec_data)
+                    if titles & batch_added_titles:
+                        logging.info(f"Radio: ❌ Saltando '{rec_track.title}' - duplicado en lote actual")
+                    elif titles & current_history:
+                        logging.info(f"Radio: ❌ Saltando '{rec_track.title}' - ya reproducida (historial)")
+                    else:
+                        batch_added_titles |= titles
+                        resolved.append((rec_track, rec_data))
+            except asyncio.TimeoutError:
+                logging.warning(f"Radio: Timeout buscando '{spotify_search}'")
+                continue
+            except Exception as e:
+                logging.error(f"Radio: Error buscando/añadiendo '{spotify_search}': {e}")
+        return resolved
+
+    def _remember_radio_tracks(self, guild_id: int, guild_name: str, added: List[Tuple[wavelink.Playable, Tuple]]) -> None:
+        for rec_track, rec_data in added:
+            self._add_to_radio_history(guild_id, rec_data[3])
+            self._add_to_radio_history(guild_id, clean_title(rec_track.title, False))
+            logging.info(f"Radio: ✅ Añadido '{rec_track.title}' G:{guild_name}")
+
+    async def _enqueue_radio_batch(
+        self, player: wavelink.Player, guild_id: int, guild_name: str, recommendations_batch: List[Tuple],
+        resolved: Optional[List[Tuple[wavelink.Playable, Tuple]]] = None,
+    ) -> List[Tuple[wavelink.Playable, Tuple]]:
+        """Resuelve el lote (o usa `resolved`, pre-resuelto) y encola al final los temas no repetidos."""
+        if resolved is None:
+            added = await self._resolve_radio_batch(guild_id, recommendations_batch)
+        else:
+            # Pre-resuelto antes: lo que sonó desde entonces ya está en el historial
+            history = self._get_radio_history(guild_id)
+            added = [(t, rec) for t, rec in resolved if not (self._radio_titles(t, rec) & history)]
+        for rec_track, _ in added:
+            await player.queue.put_wait(rec_track)
+        self._remember_radio_tracks(guild_id, guild_name, added)
+        return added
+
+    async def _replace_radio_batch(
+        self, player: wavelink.Player, guild_id: int, guild_name: str, radio_batch: "_RadioBatch",
+        recommendations_batch: List[Tuple],
+    ) -> None:
+        """Cooc+Feats terminó después del Fallback: sus temas ocupan el lugar de los del Fallback que siguen en cola."""
+        await radio_batch.enqueued.wait()
+
+        def _still_current() -> bool:
+            return (
+                self._radio_refill_gen.get(guild_id) == radio_batch.generation
+                and player.connected
+                and self._is_radio_enabled(guild_id)
+            )
+
+        def _pending_positions() -> List[int]:
+            # Por identidad: una copia igual que haya agregado un usuario no es del lote
+            ids = {id(t) for t in radio_batch.tracks}
+            return [i for i, t in enumerate(player.queue) if id(t) in ids]
+
+        if not _still_current():
+            logging.info(f"Radio: lote tardío de Cooc+Feats descartado (la radio ya siguió) G:{guild_name}")
+            return
+        # Los títulos del Fallback que todavía no sonaron no cuentan como historial: pueden volver en el nuevo lote
+        pending_titles: Set[str] = set()
+        queue_items = list(player.queue)
+        for i in _pending_positions():
+            rec_data = radio_batch.rec_data.get(id(queue_items[i]))
+            if rec_data is not None:
+                pending_titles |= self._radio_titles(queue_items[i], rec_data)
+        resolved = await self._resolve_radio_batch(guild_id, recommendations_batch, ignore_titles=pending_titles)
+
+        # Sin awaits desde acá: la cola no puede cambiar entre el chequeo y el reemplazo
+        positions = _pending_positions()
+        if not _still_current() or not positions or not resolved:
+            logging.info(f"Radio: lote tardío de Cooc+Feats descartado (la radio ya siguió o no se resolvió) G:{guild_name}")
+            return
+        insert_at = positions[0]
+        for i in reversed(positions):
+            player.queue.delete(i)
+        for offset, (rec_track, _) in enumerate(resolved):
+            player.queue.put_at(insert_at + offset, rec_track)
+        radio_batch.tracks = [rec_track for rec_track, _ in resolved]
+        radio_batch.rec_data = {id(rec_track): rec_data for rec_track, rec_data in resolved}
+        self._remember_radio_tracks(guild_id, guild_name, resolved)
+        logging.info(f"Radio: 🔁 {len(positions)} temas de Fallback reemplazados por {len(resolved)} de Cooc+Feats G:{guild_name}")
+
     # --- Eventos Wavelink ---
     @commands.Cog.listener()
     async def on_wavelink_node_ready(self, payload: wavelink.NodeReadyEventPayload) -> None:
@@ -136,6 +359,9 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
         # Añadir al historial (evitar repes en radio)
         self._add_to_radio_history(guild_id, track.title)
 
+        # Último tema de la cola con radio: ir armando el próximo lote
+        self._refresh_radio_prefetch(player, track)
+
         original_channel: Optional[discord.TextChannel] = self.last_text_channel.get(guild_id)
         if not original_channel:
             logging.warning(f"No canal G:{guild_id} track start.")
@@ -215,65 +441,51 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
             current_history = self._get_radio_history(guild_id) if isinstance(guild_id, int) else set()
             history_tuples = {("", title) for title in current_history}
 
-            recommendations_batch = await fetch_spotify_recommendation(track.title, history_tuples)
+            refill_started = time.perf_counter()
+            refill_span = start_span("radio.refill", root=True, activate=True, guild=guild_id, seed=track.title)
+            # Si gana el Fallback y Cooc+Feats llega después, su lote reemplaza al encolado acá
+            generation = self._radio_refill_gen.get(guild_id, 0) + 1
+            self._radio_refill_gen[guild_id] = generation
+            radio_batch = _RadioBatch(generation)
+
+            async def _replace_with_late_primary(late_batch: List[Tuple]) -> None:
+                await self._replace_radio_batch(player, guild_id, guild_name, radio_batch, late_batch)
+
+            # Lote armado mientras sonaba el tema (si sigue en curso se espera: ya lleva ventaja)
+            prefetched = await self._radio_prefetch.take_or_wait(guild_id, (guild_id, track, player)) if isinstance(guild_id, int) else None
+            if prefetched is not None:
+                recommendations_batch, resolved = prefetched
+                logging.info(f"Radio: usando lote pre-resuelto G:{guild_name}")
+            else:
+                resolved = None
+                recommendations_batch = await fetch_spotify_recommendation(
+                    track.title, history_tuples, seed_identifier=track.identifier, seed_isrc=track.isrc,
+                    on_late_primary=_replace_with_late_primary,
+                    should_continue=lambda: self._radio_refill_wanted(player, guild_id),
+                    retry_budget=self._radio_retry_budget(track),
+                )
 
             if recommendations_batch:
                 logging.info(f"Radio: Spotify recomendó {len(recommendations_batch)} canciones G:{guild_name}")
-                added_radio_count = 0
-                first_radio_track: Optional[wavelink.Playable] = None
-                first_rec_data = None
-                batch_added_titles: Set[str] = set()
-
-                for rec_data in recommendations_batch:
-                    spotify_search, _, _, spotify_cleaned_title, _, _ = rec_data
-                    try:
-                        # Agregar timeout a búsquedas de radio
-                        found_tracks: wavelink.Search = await asyncio.wait_for(
-                            wavelink.Playable.search(spotify_search),
-                            timeout=15.0
-                        )
-                        if found_tracks and not isinstance(found_tracks, wavelink.Playlist):
-                            rec_track = found_tracks[0]
-                            rec_cleaned = clean_title(rec_track.title, False).lower()
-                            spotify_cleaned_lower = (spotify_cleaned_title or "").lower()
-
-                            is_duplicate = (
-                                rec_cleaned in current_history or
-                                spotify_cleaned_lower in current_history or
-                                rec_cleaned in batch_added_titles or
-                                spotify_cleaned_lower in batch_added_titles
-                            )
-
-                            if not is_duplicate:
-                                self._add_to_radio_history(guild_id, spotify_cleaned_title)
-                                self._add_to_radio_history(guild_id, rec_cleaned)
-                                batch_added_titles.add(rec_cleaned)
-                                if spotify_cleaned_lower:
-                                    batch_added_titles.add(spotify_cleaned_lower)
-                                await player.queue.put_wait(rec_track)
-                                added_radio_count += 1
-                                if first_radio_track is None:
-                                    first_radio_track = rec_track
-                                    first_rec_data = rec_data
-                                logging.info(f"Radio: ✅ Añadido '{rec_track.title}' G:{guild_name}")
-                            else:
-                                if rec_cleaned in batch_added_titles or spotify_cleaned_lower in batch_added_titles:
-                                    logging.info(f"Radio: ❌ Saltando '{rec_track.title}' - duplicado en lote actual")
-                                else:
-                                    logging.info(f"Radio: ❌ Saltando '{rec_track.title}' - ya reproducida (historial)")
-                    except asyncio.TimeoutError:
-                        logging.warning(f"Radio: Timeout buscando '{spotify_search}'")
-                        continue
-                    except Exception as e:
-                        logging.error(f"Radio: Error buscando/añadiendo '{spotify_search}': {e}")
-
+                added: List[Tuple[wavelink.Playable, Tuple]] = []
+                try:
+                    added = await self._enqueue_radio_batch(player, guild_id, guild_name, recommendations_batch, resolved)
+                finally:
+                    radio_batch.tracks = [rec_track for rec_track, _ in added]
+                    radio_batch.rec_data = {id(rec_track): rec_data for rec_track, rec_data in added}
+                    radio_batch.enqueued.set()
+                added_radio_count = len(added)
+                first_radio_track, first_rec_data = added[0] if added else (None, None)
+
+                RADIO_REFILL_SECONDS.observe(time.perf_counter() - refill_started, result="ok" if added_radio_count else "empty")
+                refill_span.end(recommended=len(recommendations_batch), added=added_radio_count)
                 if added_radio_count > 0 and first_radio_track and first_rec_data:
                     first_from_queue = player.queue.get()
                     logging.info(f"Radio: Añadidas {added_radio_count}. Iniciando con '{first_radio_track.title}' G:{guild_name}")
                     await player.play(first_from_queue, populate=True)
 
                     if original_channel:
-                        _, _, _, _, first_image_url, first_release_year = first_rec_data
+                        _, _, _, _, first_image_url, first_release_year, _, _ = first_rec_data
                         final_img = first_image_url or first_radio_track.artwork
                         embed_desc = f"Iniciando radio con **{first_radio_track.title}**"
                         if first_release_year:
@@ -288,6 +500,8 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
                     return
 
             else:
+                RADIO_REFILL_SECONDS.observe(time.perf_counter() - refill_started, result="no_recommendations")
+                refill_span.end(recommended=0, added=0)
                 logging.warning(f"Radio: Spotify no recomendó lote G:{guild_name}.")
             logging.info(f"Radio: No se añadió lote G:{guild_name}. Posible inactividad.")
         else:
@@ -342,6 +556,10 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
             tr = payload.track.title if payload.track else "?"
             exception_msg = str(payload.exception.get('message', '')) if isinstance(payload.exception, dict) else str(payload.exception)
             logging.error(f"Wavelink: TrackException: {tr} → {payload.exception!r}")
+            # Un match guardado que ya no reproduce no debe volver a elegirse
+            if payload.track and self._track_matches is not None:
+                if self._track_matches.forget_identifier(payload.track.identifier):
+                    logging.info(f"TrackMatch: olvidado '{tr}' ({payload.track.identifier})")
             
             # Detectar error de "requires login" y buscar alternativa
             if "requires login" in exception_msg.lower() or "require login" in exception_msg.lower():
@@ -477,6 +695,7 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
             self.last_text_channel.pop(guild_id, None)
             self.radio_enabled.pop(guild_id, None)
             self._clear_radio_history(guild_id)
+            self._radio_prefetch.invalidate(guild_id)
             logging.info(f"Estado limpiado G:{guild_id} tras WS close.")
         else:
             logging.warning("No Guild ID en WS Closed payload.")
@@ -493,6 +712,21 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
             return False
         return True
 
+    # --- Trazas: un span raíz por comando; los spans internos cuelgan de él ---
+    async def cog_before_invoke(self, ctx: commands.Context) -> None:
+        ctx.trace_span = start_span(
+            f"cmd.{ctx.command.qualified_name}",
+            root=True,
+            activate=True,
+            guild=ctx.guild.id if ctx.guild else None,
+            user=ctx.author.id,
+        )
+
+    async def cog_after_invoke(self, ctx: commands.Context) -> None:
+        span = getattr(ctx, "trace_span", None)
+        if span is not None:
+            span.end(failed=ctx.command_failed)
+
     def _update_last_channel(self, ctx: commands.Context):
         if ctx.guild:
             if isinstance(ctx.channel, discord.TextChannel):
@@ -540,6 +774,7 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
             self._clear_radio_history(guild_id)
             self.radio_enabled.pop(guild_id, None)
             self.last_text_channel.pop(guild_id, None)
+            self._radio_prefetch.invalidate(guild_id)
         await player.disconnect()
         await ctx.send(embed=self.build_embed("Desconectado", "¡Hasta luego!"))
 
@@ -556,8 +791,10 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
                 await ctx.send(embed=self.build_embed("Error", "Conéctame primero."))
                 return
             try:
-                player = await ctx.author.voice.channel.connect(cls=wavelink.Player, self_deaf=True, self_mute=False)
-                await player.set_volume(60)
+                with trace_span("voice.connect"):
+                    player = await ctx.author.voice.channel.connect(cls=wavelink.Player, self_deaf=True, self_mute=False)
+                with trace_span("player.set_volume"):
+                    await player.set_volume(60)
                 logging.info(f"Autoconectado G:{player.channel.name}.")
             except Exception as e:
                 logging.exception(f"Error autoconectar: {e}")
@@ -569,12 +806,15 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
         if radio_is_on:
             logging.info(f"Play manual durante radio G:{guild_id}. Limpiando cola.")
             player.queue.clear()
+            self._radio_prefetch.invalidate(guild_id)
 
         msg = await ctx.send(f"🔍 Procesando `{query}`...")
 
         # Resolver Spotify URL → queries de búsqueda (no stream directo)
         spotify_match = SPOTIFY_URL_REGEX.match(query)
         search_queries: List[str] = []
+        # Consulta de texto → datos de Spotify (ISRC/duración) para elegir bien el resultado de Lavalink
+        spotify_refs: Dict[str, SpotifyTrackRef] = {}
         source_description: str = ""
         is_spotify = False
 
@@ -582,42 +822,51 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
             is_spotify = True
             sp_type = spotify_match.group("type")
             sp_id = spotify_match.group("id")
+            span = start_span("spotify.resolve", type=sp_type)
             logging.info(f"Spotify: {sp_type}/{sp_id}")
             sp_client = _ensure_spotify_client()
             if not sp_client:
                 await msg.edit(content="", embed=self.build_embed("Error", "No Spotify client.", color=discord.Color.red()))
                 return
-            loop = asyncio.get_event_loop()
+            links_pool = get_executor("spotify_links")
             try:
                 await msg.edit(content=f"🔗 Spotify ({sp_type})...")
 
                 if sp_type == "track":
-                    info = await loop.run_in_executor(None, lambda: sp_client.track(sp_id))
+                    info = await links_pool.run(sp_client.track, sp_id)
                     name = (info or {}).get("name")
                     arts = (info or {}).get("artists") or []
                     artist = (arts[0] or {}).get("name") if arts else ""
                     if name:
-                        search_queries.append(f"{artist} {name}".strip())
+                        sq = f"{artist} {name}".strip()
+                        search_queries.append(sq)
+                        spotify_refs[sq] = SpotifyTrackRef(
+                            info.get("id"), name, artist or "",
+                            (info.get("external_ids") or {}).get("isrc"), info.get("duration_ms"),
+                        )
                     source_description = f"Spotify track"
 
                 elif sp_type == "album":
-                    alb = await loop.run_in_executor(None, lambda: sp_client.album(sp_id))
+                    alb = await links_pool.run(sp_client.album, sp_id)
                     alb_name = (alb or {}).get("name", "")
-                    tracks_resp = await loop.run_in_executor(None, lambda: sp_client.album_tracks(sp_id, limit=50))
+                    tracks_resp = await links_pool.run(lambda: sp_client.album_tracks(sp_id, limit=50))
                     for tr in (tracks_resp or {}).get("items", []) or []:
                         tname = (tr or {}).get("name")
                         arts = (tr or {}).get("artists") or []
                         aname = (arts[0] or {}).get("name") if arts else ""
                         if tname:
-                            search_queries.append(f"{aname} {tname}".strip())
+                            sq = f"{aname} {tname}".strip()
+                            search_queries.append(sq)
+                            # Los tracks simplificados de álbum no traen ISRC: solo duración
+                            spotify_refs[sq] = SpotifyTrackRef(tr.get("id"), tname, aname or "", None, tr.get("duration_ms"))
                     source_description = f"Spotify álbum: **{alb_name}**" if alb_name else "Spotify álbum"
 
                 elif sp_type == "playlist":
-                    pl_meta = await loop.run_in_executor(None, lambda: sp_client.playlist(sp_id, fields='name'))
+                    pl_meta = await links_pool.run(lambda: sp_client.playlist(sp_id, fields='name'))
                     pl_name = (pl_meta or {}).get("name", "")
-                    items = await loop.run_in_executor(None, lambda: sp_client.playlist_items(
+                    items = await links_pool.run(lambda: sp_client.playlist_items(
                         sp_id,
-                        fields='items(track(name,artists(name)))',
+                        fields='items(track(id,name,duration_ms,external_ids(isrc),artists(name)))',
                         limit=100
                     ))
                     for it in (items or {}).get("items", []) or []:
@@ -626,16 +875,35 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
                         arts = tr.get("artists") or []
                         aname = (arts[0] or {}).get("name") if arts else ""
                         if tname:
-                            search_queries.append(f"{aname} {tname}".strip())
+                            sq = f"{aname} {tname}".strip()
+                            search_queries.append(sq)
+                            spotify_refs[sq] = SpotifyTrackRef(
+                                tr.get("id"), tname, aname or "",
+                                (tr.get("external_ids") or {}).get("isrc"), tr.get("duration_ms"),
+                            )
                     source_description = f"Spotify playlist: **{pl_name}**" if pl_name else "Spotify playlist"
 
+            except ExecutorSaturated as e:
+                logging.warning(f"Spotify: {e}")
+                await msg.edit(content="", embed=self.build_embed("Ocupado", "⏳ Hay muchos links de Spotify en proceso, intenta en unos segundos.", color=discord.Color.orange()))
+                return
             except Exception as e:
                 logging.exception(f"Error Spotify: {e}")
+                span.set_error(e)
                 await msg.edit(content="", embed=self.build_embed("Error", f"Error Spotify: {e}", color=discord.Color.red()))
                 return
+            finally:
+                span.end(queries=len(search_queries))
         else:
             search_queries.append(query)
             source_description = f"`{query}`"
+        root_span = getattr(ctx, "trace_span", None)
+        if root_span is not None:
+            if spotify_match:
+                query_type = f"spotify_{spotify_match.group('type')}"
+            else:
+                query_type = "url" if query.startswith(("http://", "https://")) else "search"
+            root_span.set(query_type=query_type, queries=len(search_queries))
 
         if not search_queries:
             await msg.edit(content="", embed=self.build_embed("Error", "No hay resultados para la consulta.", color=discord.Color.red()))
@@ -647,22 +915,38 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
         search_desc = f"{len(search_queries)} q" if len(search_queries) > 1 else "q"
         await msg.edit(content=f"🎵 Buscando {search_desc}...")
 
-        for idx, sq in enumerate(search_queries):
-            try:
-                found: wavelink.Search = await wavelink.Playable.search(sq)
-                if isinstance(found, wavelink.Playlist):
-                    tracks_to_add.extend(found.tracks)
-                    logging.info(f"+{len(found.tracks)} de PL: {found.name}")
-                    source_description = f"PL: **{found.name}**"
-                    break
-                elif found:
-                    tracks_to_add.append(found[0])
-                else:
-                    not_found_count += 1
-                    logging.warning(f"No res: '{sq}'")
-            except Exception as e:
+        # Búsquedas concurrentes (deduplicadas); se re-ordenan según el orden original de la consulta
+        async def _searcher(sq: str) -> wavelink.Search:
+            ref = spotify_refs.get(sq)
+            if ref is None:
+                return await wavelink.Playable.search(sq)
+            found, _ = await match_spotify_track(ref, sq, wavelink.Playable.search, wavelink.Playable, self._track_matches)
+            return [found] if found is not None else []
+
+        outcomes = {}
+        async for outcome in search_many(
+            search_queries,
+            concurrency=SEARCH_CONCURRENCY,
+            deadline=SEARCH_DEADLINE,
+            searcher=_searcher,
+        ):
+            outcomes[outcome.query] = outcome
+            if outcome.status in ("timeout", "error"):
+                logging.warning(f"Búsqueda '{outcome.query}' → {outcome.status}: {outcome.error}")
+
+        for sq in search_queries:
+            outcome = outcomes.get(sq)
+            found = outcome.results if outcome and outcome.ok else None
+            if isinstance(found, wavelink.Playlist):
+                tracks_to_add.extend(found.tracks)
+                logging.info(f"+{len(found.tracks)} de PL: {found.name}")
+                source_description = f"PL: **{found.name}**"
+                break
+            elif found:
+                tracks_to_add.append(found[0])
+            else:
                 not_found_count += 1
-                logging.exception(f"Error buscando '{sq}': {e}")
+                logging.warning(f"No res: '{sq}'")
 
         if not tracks_to_add:
             await msg.edit(content="", embed=self.build_embed("Error", f"No encontré para {source_description}.", color=discord.Color.red()))
@@ -672,9 +956,10 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
         try:
             start_playing = not player.playing and not player.current
             added_count = 0
-            for track in tracks_to_add:
-                await player.queue.put_wait(track)
-                added_count += 1
+            with trace_span("queue.put", tracks=len(tracks_to_add)):
+                for track in tracks_to_add:
+                    await player.queue.put_wait(track)
+                    added_count += 1
 
             action = "Añadido"
             msg_title = "Añadido a cola"
@@ -695,7 +980,11 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
             if start_playing:
                 first = player.queue.get()
                 if first:
-                    await player.play(first, populate=True)
+                    with trace_span("player.play"):
+                        await player.play(first, populate=True)
+            else:
+                # La cola ya no está vacía: el lote pre-resuelto no se va a usar
+                self._radio_prefetch.invalidate(player.guild.id)
         except Exception as e:
             logging.exception(f"Error añadiendo/iniciando: {e}")
             await msg.edit(content="", embed=self.build_embed("Error", "Error al añadir.", color=discord.Color.red()))
@@ -733,6 +1022,7 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
                 radio_on = True
                 logging.info(f"Radio off por stop G:{guild_id}.")
             self._clear_radio_history(guild_id)
+            self._radio_prefetch.invalidate(guild_id)
         player.queue.clear()
         await player.stop(force=True)
         msg = "⏹️ Detenida y cola vaciada."
@@ -773,6 +1063,29 @@ class MusicWavelinkCog(commands.Cog, name="Music"):
             status = "activado" if current else "desactivado"
             await ctx.send(embed=self.build_embed("Modo Radio", f"📻 Modo radio ya estaba **{status}**."))
 
+    @commands.command(name="radiostats")
+    @commands.has_permissions(administrator=True)
+    async def radio_stats_command(self, ctx: commands.Context):
+        """Latencias p50/p95/p99 por etapa del motor de radio (solo administradores)."""
+        rows = radio_stage_report()
+        if not rows:
+            await ctx.send(embed=self.build_embed("Radio Stats", "Todavía no hubo refills de radio."))
+            return
+        lines = ["etapa             n    p50     p95     p99   api  pool"]
+        for r in rows:
+            api = f"{r['api_calls']:.1f}" if r["api_calls"] is not None else "-"
+            pool = f"{r['pool']:.0f}" if r["pool"] is not None else "-"
+            lines.append(
+                f"{r['engine'] + '/' + r['stage']:<16} {r['count']:>3} {r['p50']:>6.2f}s {r['p95']:>6.2f}s {r['p99']:>6.2f}s {api:>5} {pool:>5}"
+            )
+        refill = RADIO_REFILL_SECONDS.series()
+        for labels, count, total in refill:
+            q = RADIO_REFILL_SECONDS.quantiles(**labels)
+            lines.append(
+                f"{'refill/' + labels['result']:<16} {count:>3} {q.get(0.5, 0):>6.2f}s {q.get(0.95, 0):>6.2f}s {q.get(0.99, 0):>6.2f}s"
+            )
+        await ctx.send(embed=self.build_embed("📊 Radio Stats", "```\n" + "\n".join(lines) + "\n```"))
+
 
 # --- Función Setup ---
 async def setup(bot: commands.Bot):
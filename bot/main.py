@@ -1,4 +1,4 @@
-# --- bot/main.py (final corregido con audioop-lts y servidor Flask) ---
+# --- bot/main.py (final corregido con audioop-lts y servidor de salud aiohttp) ---
 
 import asyncio
 import logging
@@ -19,24 +19,6 @@ except ImportError:
         logging.warning("⚠️ audioop no disponible. Algunas funciones de audio pueden no funcionar.")
         audioop = None
 
-# --- Mantener Flask al inicio (para levantar servidor web en Render) ---
-from flask import Flask
-import threading
-
-# --- Configurar servidor Flask para mantener activo el servicio ---
-app = Flask(__name__)
-
-@app.route('/')
-def home():
-    return "✅ Bot activo y ejecutándose correctamente", 200
-
-def run_web():
-    port = int(os.environ.get("PORT", 8080))
-    app.run(host="0.0.0.0", port=port)
-
-# Lanzar Flask en un hilo paralelo
-threading.Thread(target=run_web, daemon=True).start()
-
 # --- Cargar dotenv antes de cualquier otro import que use variables ---
 from dotenv import load_dotenv
 load_dotenv()
@@ -45,6 +27,10 @@ import discord
 from discord.ext import commands
 import wavelink
 from config.settings import get_settings
+from bot.utils.executors import executor_gauges, executor_stats, shutdown_executors
+from bot.utils.health_server import start_health_server
+from bot.utils.loop_monitor import get_loop_monitor
+from bot.utils.metrics import counter, register_collector, register_gauges
 
 # --- Logging básico ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s:%(levelname)s:%(name)s: %(message)s')
@@ -66,6 +52,13 @@ if not settings.discord_token:
 if not LAVALINK_PASSWORD or LAVALINK_PASSWORD == "youshallnotpass":
     logging.warning("⚠️ LAVALINK_PASSWORD no definida o usa default.")
 
+# --- Servidor de salud/métricas (keep-alive del hosting en / ) ---
+HTTP_HOST = os.getenv("HTTP_HOST", "0.0.0.0")
+HTTP_PORT = int(os.getenv("PORT", "8080"))
+
+COMMANDS_TOTAL = counter("bot_commands", "Comandos invocados", ("command",))
+COMMAND_ERRORS_TOTAL = counter("bot_command_errors", "Comandos que terminaron en error", ("command", "error"))
+
 # --- Intents ---
 intents = discord.Intents.default()
 intents.message_content = True
@@ -82,9 +75,17 @@ class MyBot(commands.Bot):
         )
         self.wavelink_connected = False
         self.wavelink_ready = asyncio.Event()
+        self.health_runner = None
 
     async def setup_hook(self) -> None:
         logging.info("Ejecutando setup_hook...")
+        monitor = get_loop_monitor()
+        monitor.start()
+        register_collector("loop", monitor.snapshot)
+        register_collector("executors", executor_stats)
+        register_gauges("loop", monitor.gauges)
+        register_gauges("executors", executor_gauges)
+        self.health_runner = await start_health_server(self, HTTP_HOST, HTTP_PORT)
         await load_extensions(self)
 
     async def on_ready(self) -> None:
@@ -116,14 +117,29 @@ class MyBot(commands.Bot):
         logging.info(f"🎵 Nodo Lavalink '{payload.node.identifier}' listo (Session {payload.session_id}).")
         self.wavelink_ready.set()
 
+    async def close(self) -> None:
+        get_loop_monitor().stop()
+        await super().close()
+        if self.health_runner is not None:
+            await self.health_runner.cleanup()
+        shutdown_executors()
+
 
 # --- Instancia del bot ---
 bot = MyBot()
 
 
+# --- Contadores de comandos (métricas) ---
+@bot.event
+async def on_command(ctx: commands.Context):
+    COMMANDS_TOTAL.inc(command=ctx.command.qualified_name if ctx.command else "?")
+
+
 # --- Manejo de errores global ---
 @bot.event
 async def on_command_error(ctx: commands.Context, error):
+    if ctx.command is not None:
+        COMMAND_ERRORS_TOTAL.inc(command=ctx.command.qualified_name, error=type(error).__name__)
     is_music_cog_command = ctx.cog is not None and ctx.cog.qualified_name == "Music"
 
     if is_music_cog_command and not bot.wavelink_ready.is_set():
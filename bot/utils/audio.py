@@ -2,13 +2,18 @@
 
 import asyncio
 import logging
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
+from types import MappingProxyType
 from pathlib import Path
-from typing import Deque, Dict, List, Optional, Set, Tuple # Import Dict
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple # Import Dict
 import time # Para medir tiempos
 
 import yt_dlp
 
+from bot.utils.executors import ExecutorSaturated, get_executor
+from bot.utils.tracing import start_span, trace_span, use_span
+
 # Configuración de logging (solo para este módulo, opcional)
 log = logging.getLogger(__name__)
 
@@ -42,43 +47,114 @@ FFMPEG_OPTIONS = "-vn -loglevel error"
 #         logging.warning(f"Archivo de cookies especificado pero no encontrado: {cookie_path}")
 # --- FIN CONFIGURACIÓN DE COOKIES ---
 
-# Crear instancia global de YoutubeDL
-try:
-    log.info("Inicializando YoutubeDL...")
-    ytdl = yt_dlp.YoutubeDL(YTDL_OPTIONS)
-    log.info("YoutubeDL inicializado.")
-except Exception as e:
-    log.exception(f"Error fatal inicializando YoutubeDL: {e}")
-    ytdl = None
+# Instancia global de YoutubeDL, creada en el primer uso (importar el módulo no carga los extractores)
+_YTDL: Optional[yt_dlp.YoutubeDL] = None
+_YTDL_FAILED = False
 
 
-@dataclass
+def get_ytdl() -> Optional[yt_dlp.YoutubeDL]:
+    """Instancia compartida de YoutubeDL (None si no se pudo inicializar)."""
+    global _YTDL, _YTDL_FAILED
+    if _YTDL is not None or _YTDL_FAILED:
+        return _YTDL
+    try:
+        log.info("Inicializando YoutubeDL...")
+        _YTDL = yt_dlp.YoutubeDL(YTDL_OPTIONS)
+        log.info("YoutubeDL inicializado.")
+    except Exception as e:
+        log.exception(f"Error fatal inicializando YoutubeDL: {e}")
+        _YTDL_FAILED = True
+        _YTDL = None
+    return _YTDL
+
+
+# --- Headers internados ---
+# yt-dlp copia el mismo dict de http_headers en cada entrada; guardamos una sola copia inmutable
+# por combinación distinta y todas las pistas la comparten por referencia.
+_HEADER_SETS: Dict[Tuple[Tuple[str, str], ...], Mapping[str, str]] = {}
+_INTERNED_HEADER_IDS: Set[int] = set()
+_MAX_HEADER_SETS = 256  # En la práctica hay 1-3 combinaciones; el tope evita crecer sin límite
+_EMPTY_HEADERS: Mapping[str, str] = MappingProxyType({})
+
+def intern_headers(headers: Optional[Mapping[str, str]]) -> Mapping[str, str]:
+    if not headers:
+        return _EMPTY_HEADERS
+    if id(headers) in _INTERNED_HEADER_IDS:
+        return headers
+    key = tuple(sorted((sys.intern(str(k)), sys.intern(str(v))) for k, v in headers.items()))
+    shared = _HEADER_SETS.get(key)
+    if shared is None:
+        shared = MappingProxyType(dict(key))
+        if len(_HEADER_SETS) < _MAX_HEADER_SETS:
+            _HEADER_SETS[key] = shared
+            _INTERNED_HEADER_IDS.add(id(shared))
+    return shared
+
+
+@dataclass(frozen=True, slots=True)
 class AudioTrack:
-    """Representa una pista de audio obtenida."""
+    """Representa una pista de audio obtenida (inmutable; headers compartidos vía `intern_headers`)."""
     title: str
     stream_url: str  # URL directa para FFmpeg
     source_url: str  # URL de la página (YouTube, etc.)
-    headers: Dict[str, str] # ¡Esto es esencial!
+    headers: Mapping[str, str] # ¡Esto es esencial!
     # Campo opcional para guardar ID si viene de Last.fm/Spotify/etc.
     spotify_track_id: Optional[str] = None
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "headers", intern_headers(self.headers))
+
+
+# --- Serialización compacta (cachés / snapshots de cola) ---
+# Formato: {"v": 1, "headers": [ {..}, ... ], "tracks": [[title, stream, source, idx_headers, spotify_id], ...]}
+_SNAPSHOT_VERSION = 1
+
+def dump_tracks(tracks: Iterable[AudioTrack]) -> Dict[str, Any]:
+    header_table: List[Mapping[str, str]] = []
+    header_index: Dict[int, int] = {}
+    rows: List[List[Any]] = []
+    for t in tracks:
+        idx = header_index.get(id(t.headers))
+        if idx is None:
+            idx = header_index[id(t.headers)] = len(header_table)
+            header_table.append(t.headers)
+        row = [t.title, t.stream_url, t.source_url, idx, t.spotify_track_id]
+        while row[-1] is None:  # Recortar opcionales vacíos al final
+            row.pop()
+        rows.append(row)
+    return {"v": _SNAPSHOT_VERSION, "headers": [dict(h) for h in header_table], "tracks": rows}
+
+def load_tracks(blob: Mapping[str, Any]) -> List[AudioTrack]:
+    if blob.get("v") != _SNAPSHOT_VERSION:
+        raise ValueError(f"Versión de snapshot no soportada: {blob.get('v')!r}")
+    header_table = [intern_headers(h) for h in blob.get("headers", [])]
+    tracks: List[AudioTrack] = []
+    for row in blob.get("tracks", []):
+        title, stream_url, source_url, idx, *rest = row
+        tracks.append(AudioTrack(title, stream_url, source_url, header_table[idx], *rest))
+    return tracks
+
 async def search_tracks(query: str, *, limit: int = 5) -> List[AudioTrack]:
     """Busca pistas usando yt-dlp. Lanza ValueError si no encuentra nada."""
+    ytdl = get_ytdl()
     if ytdl is None:
         log.error("search_tracks: YoutubeDL no está inicializado.")
         raise RuntimeError("YoutubeDL no está inicializado.")
 
-    loop = asyncio.get_event_loop()
     data = None
     start_time = time.monotonic()
     log.info(f"Iniciando búsqueda yt-dlp para: '{query}' (límite: {limit})")
 
     try:
-        # Ejecutar yt-dlp en un executor para no bloquear el loop de asyncio
-        data = await loop.run_in_executor(None, lambda: ytdl.extract_info(query, download=False))
+        # Ejecutar yt-dlp en su propio pool para no bloquear el loop ni a otros subsistemas
+        with trace_span("ytdl.extract", query=query):
+            data = await get_executor("ytdl").run(lambda: ytdl.extract_info(query, download=False))
         duration = time.monotonic() - start_time
         log.info(f"Búsqueda yt-dlp para '{query}' completada en {duration:.2f} segundos.")
 
+    except ExecutorSaturated as e:
+        log.warning(f"Búsqueda yt-dlp rechazada para '{query}': {e}")
+        raise ValueError(f"Demasiadas búsquedas en curso, intenta de nuevo en unos segundos: {query}") from e
     except yt_dlp.utils.DownloadError as e:
         duration = time.monotonic() - start_time
         log.error(f"Error yt-dlp DownloadError tras {duration:.2f}s buscando '{query}': {e}")
@@ -133,6 +209,81 @@ async def search_tracks(query: str, *, limit: int = 5) -> List[AudioTrack]:
     return entries
 
 
+@dataclass
+class SearchOutcome:
+    """Resultado de una consulta dentro de `search_many`."""
+    query: str
+    status: str  # "ok" | "not_found" | "timeout" | "error"
+    results: Sequence[Any] = field(default_factory=list)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+async def search_many(
+    queries: Iterable[str],
+    *,
+    concurrency: int = 4,
+    deadline: float = 20.0,
+    limit: int = 1,
+    searcher: Optional[Callable[[str], Awaitable[Sequence[Any]]]] = None,
+) -> AsyncIterator[SearchOutcome]:
+    """
+    Ejecuta varias búsquedas en paralelo (máx. `concurrency` a la vez, `deadline` segundos por consulta)
+    y va entregando `SearchOutcome` en orden de finalización. Las consultas repetidas se buscan una sola vez.
+    `searcher` permite reutilizarlo con otro backend (ej. Lavalink); por defecto usa `search_tracks`.
+    """
+    unique_queries = list(dict.fromkeys(q for q in queries if q))
+    if not unique_queries:
+        return
+    if searcher is None:
+        searcher = lambda q: search_tracks(q, limit=limit)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _run_one(q: str) -> SearchOutcome:
+        async with semaphore:
+            with trace_span("search", query=q) as span:
+                outcome = await _search_one(q)
+                span.set(status=outcome.status)
+                return outcome
+
+    async def _search_one(q: str) -> SearchOutcome:
+        start = time.monotonic()
+        try:
+            found = await asyncio.wait_for(searcher(q), timeout=deadline)
+        except asyncio.TimeoutError:
+            return SearchOutcome(q, "timeout", error=f"Deadline de {deadline:.1f}s superado", elapsed=time.monotonic() - start)
+        except ValueError as e:
+            return SearchOutcome(q, "not_found", error=str(e), elapsed=time.monotonic() - start)
+        except Exception as e:
+            log.exception(f"search_many: error buscando '{q}'")
+            return SearchOutcome(q, "error", error=str(e), elapsed=time.monotonic() - start)
+        elapsed = time.monotonic() - start
+        if not found:
+            return SearchOutcome(q, "not_found", elapsed=elapsed)
+        return SearchOutcome(q, "ok", results=found, elapsed=elapsed)
+
+    log.info(f"search_many: {len(unique_queries)} consultas únicas (concurrencia={concurrency}, deadline={deadline:.1f}s)")
+    batch = start_span("search.batch", queries=len(unique_queries), concurrency=concurrency)
+    with use_span(batch):  # Las tareas heredan el contexto: sus spans cuelgan de `batch`
+        tasks = [asyncio.create_task(_run_one(q)) for q in unique_queries]
+    found = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            outcome = await next_done
+            found += outcome.ok
+            yield outcome
+    finally:
+        # Si el consumidor corta antes, no dejar búsquedas huérfanas
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        batch.end(found=found)
+
+
 async def fetch_track(query: str) -> AudioTrack:
     """Obtiene la *primera* pista válida encontrada para una consulta."""
     log.info(f"fetch_track: Buscando la primera pista para '{query}'")
@@ -145,4 +296,5 @@ async def fetch_track(query: str) -> AudioTrack:
          raise
     except Exception as e:
          log.exception(f"Error inesperado en fetch_track para '{query}'")
-         raise ValueError(f"Error al obtener la pista: {e}") from e
\ No newline at end of file
+         raise ValueError(f"Error al obtener la pista: {e}") from e
+
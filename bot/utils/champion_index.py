@@ -0,0 +1,210 @@
+# --- bot/utils/champion_index.py (Índice local de campeones: nombres, slugs OP.GG, alias y búsqueda difusa) ---
+
+import logging
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+log = logging.getLogger(__name__)
+
+# (nombre visible, id de Data Dragon). El slug de OP.GG es el id en minúsculas (MonkeyKing → monkeyking).
+# La lista se completa en caliente con Data Dragon (ver `ChampionIndex.update`), así los campeones nuevos entran solos.
+_BASE_CHAMPIONS: Tuple[Tuple[str, str], ...] = (
+    ("Aatrox", "Aatrox"), ("Ahri", "Ahri"), ("Akali", "Akali"), ("Akshan", "Akshan"), ("Alistar", "Alistar"),
+    ("Ambessa", "Ambessa"), ("Amumu", "Amumu"), ("Anivia", "Anivia"), ("Annie", "Annie"), ("Aphelios", "Aphelios"),
+    ("Ashe", "Ashe"), ("Aurelion Sol", "AurelionSol"), ("Aurora", "Aurora"), ("Azir", "Azir"), ("Bard", "Bard"),
+    ("Bel'Veth", "Belveth"), ("Blitzcrank", "Blitzcrank"), ("Brand", "Brand"), ("Braum", "Braum"), ("Briar", "Briar"),
+    ("Caitlyn", "Caitlyn"), ("Camille", "Camille"), ("Cassiopeia", "Cassiopeia"), ("Cho'Gath", "Chogath"),
+    ("Corki", "Corki"), ("Darius", "Darius"), ("Diana", "Diana"), ("Dr. Mundo", "DrMundo"), ("Draven", "Draven"),
+    ("Ekko", "Ekko"), ("Elise", "Elise"), ("Evelynn", "Evelynn"), ("Ezreal", "Ezreal"), ("Fiddlesticks", "Fiddlesticks"),
+    ("Fiora", "Fiora"), ("Fizz", "Fizz"), ("Galio", "Galio"), ("Gangplank", "Gangplank"), ("Garen", "Garen"),
+    ("Gnar", "Gnar"), ("Gragas", "Gragas"), ("Graves", "Graves"), ("Gwen", "Gwen"), ("Hecarim", "Hecarim"),
+    ("Heimerdinger", "Heimerdinger"), ("Hwei", "Hwei"), ("Illaoi", "Illaoi"), ("Irelia", "Irelia"), ("Ivern", "Ivern"),
+    ("Janna", "Janna"), ("Jarvan IV", "JarvanIV"), ("Jax", "Jax"), ("Jayce", "Jayce"), ("Jhin", "Jhin"), ("Jinx", "Jinx"),
+    ("Kai'Sa", "Kaisa"), ("Kalista", "Kalista"), ("Karma", "Karma"), ("Karthus", "Karthus"), ("Kassadin", "Kassadin"),
+    ("Katarina", "Katarina"), ("Kayle", "Kayle"), ("Kayn", "Kayn"), ("Kennen", "Kennen"), ("Kha'Zix", "Khazix"),
+    ("Kindred", "Kindred"), ("Kled", "Kled"), ("Kog'Maw", "KogMaw"), ("K'Sante", "KSante"), ("LeBlanc", "Leblanc"),
+    ("Lee Sin", "LeeSin"), ("Leona", "Leona"), ("Lillia", "Lillia"), ("Lissandra", "Lissandra"), ("Lucian", "Lucian"),
+    ("Lulu", "Lulu"), ("Lux", "Lux"), ("Malphite", "Malphite"), ("Malzahar", "Malzahar"), ("Maokai", "Maokai"),
+    ("Master Yi", "MasterYi"), ("Mel", "Mel"), ("Milio", "Milio"), ("Miss Fortune", "MissFortune"),
+    ("Wukong", "MonkeyKing"), ("Mordekaiser", "Mordekaiser"), ("Morgana", "Morgana"), ("Naafiri", "Naafiri"),
+    ("Nami", "Nami"), ("Nasus", "Nasus"), ("Nautilus", "Nautilus"), ("Neeko", "Neeko"), ("Nidalee", "Nidalee"),
+    ("Nilah", "Nilah"), ("Nocturne", "Nocturne"), ("Nunu & Willump", "Nunu"), ("Olaf", "Olaf"), ("Orianna", "Orianna"),
+    ("Ornn", "Ornn"), ("Pantheon", "Pantheon"), ("Poppy", "Poppy"), ("Pyke", "Pyke"), ("Qiyana", "Qiyana"),
+    ("Quinn", "Quinn"), ("Rakan", "Rakan"), ("Rammus", "Rammus"), ("Rek'Sai", "RekSai"), ("Rell", "Rell"),
+    ("Renata Glasc", "Renata"), ("Renekton", "Renekton"), ("Rengar", "Rengar"), ("Riven", "Riven"), ("Rumble", "Rumble"),
+    ("Ryze", "Ryze"), ("Samira", "Samira"), ("Sejuani", "Sejuani"), ("Senna", "Senna"), ("Seraphine", "Seraphine"),
+    ("Sett", "Sett"), ("Shaco", "Shaco"), ("Shen", "Shen"), ("Shyvana", "Shyvana"), ("Singed", "Singed"), ("Sion", "Sion"),
+    ("Sivir", "Sivir"), ("Skarner", "Skarner"), ("Smolder", "Smolder"), ("Sona", "Sona"), ("Soraka", "Soraka"),
+    ("Swain", "Swain"), ("Sylas", "Sylas"), ("Syndra", "Syndra"), ("Tahm Kench", "TahmKench"), ("Taliyah", "Taliyah"),
+    ("Talon", "Talon"), ("Taric", "Taric"), ("Teemo", "Teemo"), ("Thresh", "Thresh"), ("Tristana", "Tristana"),
+    ("Trundle", "Trundle"), ("Tryndamere", "Tryndamere"), ("Twisted Fate", "TwistedFate"), ("Twitch", "Twitch"),
+    ("Udyr", "Udyr"), ("Urgot", "Urgot"), ("Varus", "Varus"), ("Vayne", "Vayne"), ("Veigar", "Veigar"),
+    ("Vel'Koz", "Velkoz"), ("Vex", "Vex"), ("Vi", "Vi"), ("Viego", "Viego"), ("Viktor", "Viktor"),
+    ("Vladimir", "Vladimir"), ("Volibear", "Volibear"), ("Warwick", "Warwick"), ("Xayah", "Xayah"), ("Xerath", "Xerath"),
+    ("Xin Zhao", "XinZhao"), ("Yasuo", "Yasuo"), ("Yone", "Yone"), ("Yorick", "Yorick"), ("Yunara", "Yunara"),
+    ("Yuumi", "Yuumi"), ("Zac", "Zac"), ("Zed", "Zed"), ("Zeri", "Zeri"), ("Ziggs", "Ziggs"), ("Zilean", "Zilean"),
+    ("Zoe", "Zoe"), ("Zyra", "Zyra"),
+)
+
+# Apodos comunes → slug OP.GG
+_ALIASES: Dict[str, str] = {
+    "mf": "missfortune", "tf": "twistedfate", "j4": "jarvaniv", "jarvan": "jarvaniv", "ww": "warwick",
+    "lb": "leblanc", "kog": "kogmaw", "cass": "cassiopeia", "cassio": "cassiopeia", "heimer": "heimerdinger",
+    "donger": "heimerdinger", "asol": "aurelionsol", "aurelion": "aurelionsol", "mundo": "drmundo",
+    "willump": "nunu", "tk": "tahmkench", "tahm": "tahmkench", "xin": "xinzhao", "yi": "masteryi",
+    "lee": "leesin", "gp": "gangplank", "kha": "khazix", "k6": "khazix", "rek": "reksai", "vel": "velkoz",
+    "cait": "caitlyn", "ez": "ezreal", "fiddle": "fiddlesticks", "voli": "volibear", "morde": "mordekaiser",
+    "naut": "nautilus", "noc": "nocturne", "ori": "orianna", "panth": "pantheon", "rene": "renekton",
+    "sej": "sejuani", "trynd": "tryndamere", "vlad": "vladimir", "zil": "zilean", "malph": "malphite",
+    "malz": "malzahar", "kass": "kassadin", "kat": "katarina", "blitz": "blitzcrank", "bel": "belveth",
+    "cho": "chogath", "liss": "lissandra", "hec": "hecarim", "sera": "seraphine", "shyv": "shyvana",
+    "ali": "alistar", "aph": "aphelios", "smol": "smolder", "mord": "mordekaiser", "mao": "maokai",
+    "gang": "gangplank", "eve": "evelynn", "renata": "renata", "ksan": "ksante", "tri": "tristana",
+}
+
+# Umbrales de la búsqueda difusa
+_ACCEPT_SCORE = 0.8      # Similitud mínima para resolver sin preguntar
+_ACCEPT_MARGIN = 0.08    # Ventaja mínima sobre el segundo candidato
+_SUGGEST_SCORE = 0.45    # Similitud mínima para sugerir
+_MIN_PREFIX = 3
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+
+
+def normalize_champion_key(text: str) -> str:
+    """'Kha'Zix' / 'kha zix' / 'Khá-Zix' → 'khazix'"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    ascii_text = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub("", ascii_text.lower())
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class ChampionResolution:
+    """Resultado de resolver un nombre: `slug`/`name` si se aceptó, `suggestions` si no."""
+    query: str
+    slug: Optional[str] = None
+    name: Optional[str] = None
+    suggestions: Tuple[str, ...] = field(default_factory=tuple)
+
+    @property
+    def ok(self) -> bool:
+        return self.slug is not None
+
+
+class ChampionIndex:
+    def __init__(self, champions: Iterable[Tuple[str, str]] = _BASE_CHAMPIONS, aliases: Mapping[str, str] = _ALIASES):
+        self._names: Dict[str, str] = {}       # slug → nombre visible
+        self._keys: Dict[str, str] = {}        # clave normalizada (nombre/slug/alias) → slug
+        self._trigram_index: Dict[str, Set[str]] = defaultdict(set)  # trigrama → claves
+        self._sorted_keys: List[str] = []
+        for name, ddragon_id in champions:
+            self._add_champion(ddragon_id.lower(), name)
+        for alias, slug in aliases.items():
+            self._add_key(normalize_champion_key(alias), slug)
+        self._sorted_keys = sorted(self._keys)
+
+    def _add_champion(self, slug: str, name: str) -> None:
+        if not slug:
+            return
+        self._names[slug] = name or slug
+        self._add_key(slug, slug)
+        self._add_key(normalize_champion_key(name), slug)
+
+    def _add_key(self, key: str, slug: str) -> None:
+        if not key or slug not in self._names:
+            return
+        self._keys.setdefault(key, slug)
+        for gram in _trigrams(key):
+            self._trigram_index[gram].add(key)
+
+    def update(self, slug_to_name: Mapping[str, str]) -> int:
+        """Agrega campeones (ej. desde Data Dragon). Devuelve cuántos eran nuevos."""
+        added = 0
+        for slug, name in slug_to_name.items():
+            slug = normalize_champion_key(slug)
+            if slug and slug not in self._names:
+                added += 1
+            self._add_champion(slug, name)
+        if added:
+            self._sorted_keys = sorted(self._keys)
+            log.info(f"ChampionIndex: {added} campeones nuevos (total {len(self._names)})")
+        return added
+
+    def name_for(self, slug: str) -> Optional[str]:
+        return self._names.get(slug)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def resolve(self, query: str, max_suggestions: int = 3) -> ChampionResolution:
+        key = normalize_champion_key(query)
+        if not key:
+            return ChampionResolution(query)
+
+        # 1) Coincidencia exacta (nombre, slug o alias)
+        slug = self._keys.get(key)
+        if slug:
+            return ChampionResolution(query, slug, self._names[slug])
+
+        # 2) Prefijo único (ej. 'yas' → yasuo)
+        if len(key) >= _MIN_PREFIX:
+            prefixed = {self._keys[k] for k in self._keys_with_prefix(key)}
+            if len(prefixed) == 1:
+                slug = prefixed.pop()
+                return ChampionResolution(query, slug, self._names[slug])
+            if len(prefixed) > 1:
+                # Prefijo ambiguo (ej. 'mal' → Malphite/Malzahar): sugerir, nunca elegir uno por similitud
+                names = sorted(self._names[s] for s in prefixed)
+                return ChampionResolution(query, suggestions=tuple(names[:max_suggestions]))
+
+        # 3) Difusa: candidatos por trigramas, ordenados por similitud de secuencia
+        ranked = self._fuzzy_rank(key)
+        if ranked:
+            best_score, best_slug = ranked[0]
+            second_score = ranked[1][0] if len(ranked) > 1 else 0.0
+            if len(key) >= _MIN_PREFIX and best_score >= _ACCEPT_SCORE and best_score - second_score >= _ACCEPT_MARGIN:
+                return ChampionResolution(query, best_slug, self._names[best_slug])
+        suggestions = tuple(self._names[s] for score, s in ranked if score >= _SUGGEST_SCORE)[:max_suggestions]
+        return ChampionResolution(query, suggestions=suggestions)
+
+    def _keys_with_prefix(self, prefix: str) -> List[str]:
+        start = bisect_left(self._sorted_keys, prefix)
+        out = []
+        for k in self._sorted_keys[start:]:
+            if not k.startswith(prefix):
+                break
+            out.append(k)
+        return out
+
+    def _fuzzy_rank(self, key: str, max_candidates: int = 12) -> List[Tuple[float, str]]:
+        counts: Dict[str, int] = defaultdict(int)
+        for gram in _trigrams(key):
+            for candidate in self._trigram_index.get(gram, ()):
+                counts[candidate] += 1
+        top_keys = sorted(counts, key=counts.get, reverse=True)[:max_candidates]
+        best_by_slug: Dict[str, float] = {}
+        for candidate in top_keys:
+            score = SequenceMatcher(None, key, candidate).ratio()
+            slug = self._keys[candidate]
+            if score > best_by_slug.get(slug, 0.0):
+                best_by_slug[slug] = score
+        return sorted(((score, slug) for slug, score in best_by_slug.items()), reverse=True)
+
+
+_CHAMPION_INDEX: Optional[ChampionIndex] = None
+
+
+def get_champion_index() -> ChampionIndex:
+    global _CHAMPION_INDEX
+    if _CHAMPION_INDEX is None:
+        _CHAMPION_INDEX = ChampionIndex()
+    return _CHAMPION_INDEX
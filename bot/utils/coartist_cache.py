@@ -0,0 +1,229 @@
+# --- bot/utils/coartist_cache.py (Caché en memoria: artista → colaboradores y sus top tracks, TTL diario) ---
+#
+# La etapa "feats" del motor cooc pedía artist_top_tracks de la semilla y después de cada colaborador,
+# uno detrás de otro, en cada refill. Los top tracks cambian poco y los artistas populares se repiten
+# entre servidores: la vecindad se guarda por (artista, mercado), se arma en paralelo cuando no está y
+# los artistas "calientes" se refrescan en segundo plano antes de vencer.
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from bot.utils.executors import ExecutorSaturated, get_executor
+
+log = logging.getLogger(__name__)
+
+# artist_id → top tracks (payload de Spotify); None si la API falló
+TopTracksFn = Callable[[str], Optional[List[Dict]]]
+
+# Pool propio: el motor corre en el de "spotify" y no debe esperar trabajos encolados en su mismo pool
+EXECUTOR_NAME = "spotify_feats"
+# Una entrada con al menos HOT_HITS usos es "caliente": se refresca en segundo plano desde
+# REFRESH_AHEAD * TTL y, vencida, se sirve vieja (hasta 2 * TTL) mientras se refresca
+HOT_HITS = 3
+REFRESH_AHEAD = 0.8
+
+_COARTIST_CACHE: Optional["CoartistCache"] = None
+_COARTIST_CACHE_FAILED = False
+
+
+@dataclass(frozen=True)
+class CoartistNeighbourhood:
+    artist_id: str
+    coartists: Tuple[str, ...]            # colaboradores, en el orden en que aparecen en los top tracks
+    top_tracks: Dict[str, List[Dict]]     # colaborador → sus top tracks
+    fetched_at: float
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.fetched_at)
+
+
+def fetch_neighbourhood(artist_id: str, top_tracks: TopTracksFn, max_coartists: int,
+                        parallel: bool = True) -> Tuple[Optional[CoartistNeighbourhood], bool]:
+    """
+    Arma la vecindad desde la API. Devuelve (vecindad, completa); vecindad None si fallaron los top
+    tracks del artista, completa False si falló algún colaborador (no conviene guardarla un día entero).
+    """
+    seed_tops = top_tracks(artist_id)
+    if seed_tops is None:
+        return None, False
+    coartists: List[str] = []
+    for t in seed_tops:
+        for a in (t or {}).get("artists") or []:
+            aid = (a or {}).get("id")
+            if aid and aid != artist_id and aid not in coartists:
+                coartists.append(aid)
+    coartists = coartists[:max_coartists]
+
+    futures: Dict[str, "Future[Optional[List[Dict]]]"] = {}
+    if parallel:
+        executor = get_executor(EXECUTOR_NAME)
+        for aid in coartists:
+            try:
+                futures[aid] = executor.submit(top_tracks, aid)
+            except ExecutorSaturated:
+                break  # el resto se pide en este hilo
+    tracks: Dict[str, List[Dict]] = {}
+    for aid in coartists:
+        future = futures.get(aid)
+        try:
+            result = future.result() if future is not None else top_tracks(aid)
+        except Exception as e:
+            log.debug(f"CoartistCache: fallo top tracks de {aid}: {e}")
+            result = None
+        if result is not None:
+            tracks[aid] = result
+    neighbourhood = CoartistNeighbourhood(artist_id, tuple(coartists), tracks, time.time())
+    return neighbourhood, len(tracks) == len(coartists)
+
+
+class CoartistCache:
+    """Vecindades por (artista, mercado, máx. colaboradores); LRU acotada, segura entre hilos."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 2048):
+        self.ttl_seconds = max(1.0, float(ttl_seconds))
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        # clave → [vecindad, usos]
+        self._entries: "OrderedDict[Tuple[str, str, int], list]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str, int], "Future[Optional[CoartistNeighbourhood]]"] = {}
+        self._refreshing: set = set()
+        # Estadísticas simples
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+
+    def get(self, artist_id: str, market: str, max_coartists: int, top_tracks: TopTracksFn,
+            refresh_top_tracks: Optional[TopTracksFn] = None) -> Tuple[Optional[CoartistNeighbourhood], str]:
+        """
+        Devuelve (vecindad, origen): 'hit', 'stale' (vieja, refrescándose), 'coalesced' (otro hilo la
+        estaba armando) o 'miss'. `top_tracks` se usa para armarla ahora; `refresh_top_tracks` (p. ej.
+        el cliente sin el contador del refill) para los refrescos en segundo plano.
+        """
+        key = (artist_id, market, max_coartists)
+        refresh = refresh_top_tracks or top_tracks
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                neighbourhood, uses = entry
+                age = neighbourhood.age
+                hot = uses >= HOT_HITS
+                if age < self.ttl_seconds or (hot and age < 2 * self.ttl_seconds):
+                    entry[1] += 1
+                    self._entries.move_to_end(key)
+                    if hot and age >= REFRESH_AHEAD * self.ttl_seconds:
+                        self._schedule_refresh(key, refresh)
+                    if age < self.ttl_seconds:
+                        self.hits += 1
+                        return neighbourhood, "hit"
+                    self.stale_hits += 1
+                    return neighbourhood, "stale"
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            try:
+                return future.result(), "coalesced"
+            except Exception:
+                return None, "coalesced"
+
+        neighbourhood: Optional[CoartistNeighbourhood] = None
+        try:
+            neighbourhood, complete = fetch_neighbourhood(artist_id, top_tracks, max_coartists)
+            if neighbourhood is not None and complete:
+                self._store(key, neighbourhood)
+        except Exception:
+            log.exception(f"CoartistCache: error armando la vecindad de {artist_id}")
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_result(neighbourhood)
+        return neighbourhood, "miss"
+
+    def _store(self, key: Tuple[str, str, int], neighbourhood: CoartistNeighbourhood) -> None:
+        with self._lock:
+            previous = self._entries.get(key)
+            # Un refresco conserva los usos: el artista sigue siendo caliente
+            self._entries[key] = [neighbourhood, previous[1] if previous else 0]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _schedule_refresh(self, key: Tuple[str, str, int], top_tracks: TopTracksFn) -> None:
+        # Se llama con el lock tomado
+        if key in self._refreshing or key in self._inflight:
+            return
+        try:
+            get_executor(EXECUTOR_NAME).submit(self._refresh, key, top_tracks)
+        except ExecutorSaturated:
+            return  # se reintenta en el próximo uso
+        self._refreshing.add(key)
+
+    def _refresh(self, key: Tuple[str, str, int], top_tracks: TopTracksFn) -> None:
+        artist_id, _, max_coartists = key
+        try:
+            # Secuencial: corre en el pool de EXECUTOR_NAME y no debe esperar trabajos de ese mismo pool
+            neighbourhood, complete = fetch_neighbourhood(artist_id, top_tracks, max_coartists, parallel=False)
+            if neighbourhood is not None and complete:
+                self._store(key, neighbourhood)
+                self.refreshes += 1
+                log.info(f"CoartistCache: vecindad de {artist_id} refrescada en segundo plano ({len(neighbourhood.coartists)} colaboradores)")
+        except Exception:
+            log.exception(f"CoartistCache: error refrescando la vecindad de {artist_id}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def gauges(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Muestras para el registro de métricas (bot/utils/metrics.py)."""
+        labels = {"cache": "CoartistCache"}
+        served = self.hits + self.stale_hits + self.coalesced
+        total = served + self.misses
+        return [
+            ("bot_cache_requests", {**labels, "result": "hit"}, self.hits),
+            ("bot_cache_requests", {**labels, "result": "stale"}, self.stale_hits),
+            ("bot_cache_requests", {**labels, "result": "miss"}, self.misses),
+            ("bot_cache_requests", {**labels, "result": "coalesced"}, self.coalesced),
+            ("bot_cache_hit_ratio", labels, served / total if total else 0.0),
+            ("bot_cache_entries", labels, len(self._entries)),
+            ("bot_cache_refreshes", labels, self.refreshes),
+        ]
+
+
+def get_coartist_cache() -> Optional[CoartistCache]:
+    """Instancia global (None si está deshabilitada con COARTIST_CACHE_TTL_HOURS=0)."""
+    global _COARTIST_CACHE, _COARTIST_CACHE_FAILED
+    if _COARTIST_CACHE is not None or _COARTIST_CACHE_FAILED:
+        return _COARTIST_CACHE
+    try:
+        from config.settings import get_settings
+        settings = get_settings()
+        ttl_hours = float(getattr(settings, "coartist_cache_ttl_hours", 24))
+        if ttl_hours <= 0:
+            _COARTIST_CACHE_FAILED = True
+            return None
+        _COARTIST_CACHE = CoartistCache(
+            ttl_seconds=ttl_hours * 3600,
+            max_entries=int(getattr(settings, "coartist_cache_max_artists", 2048)),
+        )
+    except Exception as e:
+        log.warning(f"CoartistCache: deshabilitada ({e})")
+        _COARTIST_CACHE_FAILED = True
+        _COARTIST_CACHE = None
+    return _COARTIST_CACHE
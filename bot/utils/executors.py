@@ -0,0 +1,217 @@
+# --- bot/utils/executors.py (Pools de hilos acotados por subsistema bloqueante) ---
+#
+# Spotify, yt-dlp, OP.GG y la resolución de links de Spotify usaban el executor por defecto del loop:
+# una ráfaga de la radio podía dejar sin hilos a `!matchups` y viceversa. Cada subsistema tiene ahora
+# su propio pool con tope de hilos y de cola; si está lleno se rechaza al instante (ExecutorSaturated).
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# nombre → (hilos, trabajos en espera). Se pueden sobreescribir con EXECUTOR_LIMITS="spotify=6:24,opgg=2:8"
+_DEFAULT_LIMITS: Dict[str, Tuple[int, int]] = {
+    "spotify": (4, 16),      # Radio: coocurrencia + fallback de playlists
+    "spotify_feats": (4, 32), # Radio: top tracks de colaboradores en paralelo + refrescos de la vecindad
+    "spotify_links": (2, 4), # Resolución de links de track/álbum/playlist en !p
+    "ytdl": (3, 8),          # Búsquedas/extracción yt-dlp
+    "opgg": (2, 16),         # Parseo de páginas OP.GG
+}
+_FALLBACK_LIMITS = (2, 8)
+_WAIT_SAMPLES = 256
+
+
+class ExecutorSaturated(RuntimeError):
+    """El pool del subsistema está lleno (hilos ocupados y cola completa)."""
+
+    def __init__(self, name: str, capacity: int):
+        super().__init__(f"Executor '{name}' saturado ({capacity} trabajos en curso/en cola)")
+        self.name = name
+        self.capacity = capacity
+
+
+class BoundedExecutor:
+    """ThreadPoolExecutor con cola acotada, rechazo inmediato y métricas de espera."""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"exec-{name}")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._waits: deque = deque(maxlen=_WAIT_SAMPLES)
+        # Estadísticas simples
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_wait = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queued
+
+    @property
+    def active_workers(self) -> int:
+        return self._active
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> "Future[T]":
+        """Encola `fn(*args)`; lanza ExecutorSaturated si no hay lugar."""
+        with self._lock:
+            if self._queued + self._active >= self.capacity:
+                self.rejected += 1
+                raise ExecutorSaturated(self.name, self.capacity)
+            self._queued += 1
+            self.submitted += 1
+        # Copiar el contexto: los spans abiertos en el hilo quedan como hijos del span que encoló
+        ctx = contextvars.copy_context()
+        started = [False]  # lo marca _run (con el lock): el lugar en cola se libera una sola vez
+        future = self._pool.submit(ctx.run, self._run, fn, args, time.monotonic(), started)
+        future.add_done_callback(lambda f: self._release_if_never_started(f, started))
+        return future
+
+    def _release_if_never_started(self, future: "Future[Any]", started: List[bool]) -> None:
+        # Cancelado en cola (wait_for/timeout del que esperaba): _run no corre nunca y el lugar quedaba ocupado
+        if not future.cancelled():
+            return
+        with self._lock:
+            if not started[0]:
+                started[0] = True
+                self._queued -= 1
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Versión async de `submit`: espera el resultado sin bloquear el loop."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    def _run(self, fn: Callable[..., T], args: tuple, enqueued_at: float, started: List[bool]) -> T:
+        wait = time.monotonic() - enqueued_at
+        with self._lock:
+            started[0] = True
+            self._queued -= 1
+            self._active += 1
+            self._waits.append(wait)
+            if wait > self.max_wait:
+                self.max_wait = wait
+        ok = False
+        try:
+            result = fn(*args)
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                self._active -= 1
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": self._queued,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "wait_avg": sum(waits) / len(waits) if waits else 0.0,
+                "wait_p95": waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0.0,
+                "wait_max": self.max_wait,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# --- Registro global ---
+_EXECUTORS: Dict[str, BoundedExecutor] = {}
+_REGISTRY_LOCK = threading.Lock()
+_LIMIT_OVERRIDES: Optional[Dict[str, Tuple[int, int]]] = None
+
+
+def _parse_limits(raw: Optional[str]) -> Dict[str, Tuple[int, int]]:
+    """'spotify=6:24,opgg=2' → {'spotify': (6, 24), 'opgg': (2, <cola por defecto>)}"""
+    limits: Dict[str, Tuple[int, int]] = {}
+    for part in (raw or "").split(","):
+        name, _, spec = part.strip().partition("=")
+        if not name or not spec:
+            continue
+        workers, _, queue = spec.partition(":")
+        try:
+            default_queue = _DEFAULT_LIMITS.get(name, _FALLBACK_LIMITS)[1]
+            limits[name] = (int(workers), int(queue) if queue else default_queue)
+        except ValueError:
+            log.warning(f"EXECUTOR_LIMITS: valor inválido para '{name}': '{spec}'")
+    return limits
+
+
+def _limit_overrides() -> Dict[str, Tuple[int, int]]:
+    global _LIMIT_OVERRIDES
+    if _LIMIT_OVERRIDES is None:
+        try:
+            from config.settings import get_settings
+            _LIMIT_OVERRIDES = _parse_limits(get_settings().executor_limits)
+        except Exception:
+            _LIMIT_OVERRIDES = {}
+    return _LIMIT_OVERRIDES
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    executor = _EXECUTORS.get(name)
+    if executor is not None:
+        return executor
+    with _REGISTRY_LOCK:
+        executor = _EXECUTORS.get(name)
+        if executor is None:
+            workers, queue = _limit_overrides().get(name) or _DEFAULT_LIMITS.get(name, _FALLBACK_LIMITS)
+            executor = BoundedExecutor(name, workers, queue)
+            _EXECUTORS[name] = executor
+            log.info(f"Executor '{name}' creado ({workers} hilos, cola {queue}).")
+    return executor
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: ex.stats() for name, ex in sorted(_EXECUTORS.items())}
+
+
+def executor_gauges() -> List[Tuple[str, Dict[str, str], float]]:
+    """Muestras para el registro de métricas (bot/utils/metrics.py)."""
+    samples: List[Tuple[str, Dict[str, str], float]] = []
+    for name, stats in executor_stats().items():
+        labels = {"executor": name}
+        samples += [
+            ("bot_executor_queue_depth", labels, stats["queued"]),
+            ("bot_executor_active_workers", labels, stats["active"]),
+            ("bot_executor_max_workers", labels, stats["workers"]),
+            ("bot_executor_rejected", labels, stats["rejected"]),
+            ("bot_executor_completed", labels, stats["completed"]),
+            ("bot_executor_wait_seconds", {**labels, "stat": "avg"}, stats["wait_avg"]),
+            ("bot_executor_wait_seconds", {**labels, "stat": "p95"}, stats["wait_p95"]),
+            ("bot_executor_wait_seconds", {**labels, "stat": "max"}, stats["wait_max"]),
+        ]
+    return samples
+
+
+def shutdown_executors(wait: bool = False) -> None:
+    with _REGISTRY_LOCK:
+        executors = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+    for ex in executors:
+        ex.shutdown(wait=wait)
@@ -0,0 +1,103 @@
+# --- bot/utils/health_server.py (Servidor HTTP de salud y métricas sobre el loop del bot) ---
+#
+# Reemplaza al Flask en un hilo: corre en el mismo event loop que discord.py, así que /healthz
+# refleja el estado real del bot (gateway, Lavalink, lag del loop) y no solo que el proceso vive.
+
+import json
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import discord
+import wavelink
+from aiohttp import web
+
+from bot.utils.loop_monitor import get_loop_monitor
+from bot.utils.metrics import collect_metrics, register_gauges, render_prometheus
+
+log = logging.getLogger(__name__)
+
+# Con más lag que esto el heartbeat de voz/gateway ya sufre: /healthz responde 503
+HEALTH_MAX_LOOP_LAG = 1.0
+
+
+def _lavalink_status() -> Dict[str, Any]:
+    nodes = list(wavelink.Pool.nodes.values())
+    connected = [n for n in nodes if n.status == wavelink.NodeStatus.CONNECTED]
+    return {"nodes": len(nodes), "connected": len(connected)}
+
+
+def _bot_gauges(bot: discord.Client):
+    def collect():
+        lavalink = _lavalink_status()
+        players = [vc for vc in bot.voice_clients if isinstance(vc, wavelink.Player)]
+        latency = bot.latency
+        samples = [
+            ("bot_gateway_connected", {}, 1.0 if bot.is_ready() and not bot.is_closed() else 0.0),
+            ("bot_guilds", {}, len(bot.guilds)),
+            ("bot_lavalink_nodes", {"status": "connected"}, lavalink["connected"]),
+            ("bot_lavalink_nodes", {"status": "total"}, lavalink["nodes"]),
+            ("bot_voice_players", {"status": "playing"}, sum(1 for p in players if p.playing)),
+            ("bot_voice_players", {"status": "connected"}, len(players)),
+        ]
+        if latency == latency and latency != float("inf"):  # NaN/inf antes del primer heartbeat
+            samples.append(("bot_gateway_latency_seconds", {}, latency))
+        return samples
+    return collect
+
+
+def build_health_app(bot: discord.Client) -> web.Application:
+    started_at = time.time()
+
+    async def home(request: web.Request) -> web.Response:
+        # Keep-alive del hosting: siempre 200 mientras el proceso esté vivo
+        return web.Response(text="✅ Bot activo y ejecutándose correctamente")
+
+    async def healthz(request: web.Request) -> web.Response:
+        monitor = get_loop_monitor()
+        gateway_ok = bot.is_ready() and not bot.is_closed()
+        lavalink = _lavalink_status()
+        lag = monitor.lag_last
+        checks = {
+            "gateway": gateway_ok,
+            "lavalink": lavalink["connected"] > 0,
+            "loop": lag < HEALTH_MAX_LOOP_LAG,
+        }
+        body = {
+            "status": "ok" if all(checks.values()) else "degraded",
+            "checks": checks,
+            "gateway_latency": bot.latency if bot.latency == bot.latency else None,
+            "lavalink": lavalink,
+            "loop_lag": lag,
+            "loop_lag_max": monitor.lag_max,
+            "uptime": time.time() - started_at,
+        }
+        return web.json_response(body, status=200 if all(checks.values()) else 503)
+
+    async def metrics(request: web.Request) -> web.Response:
+        # Formato de texto de Prometheus 0.0.4 (text/plain)
+        return web.Response(text=render_prometheus(), content_type="text/plain", charset="utf-8")
+
+    async def metrics_json(request: web.Request) -> web.Response:
+        return web.json_response(collect_metrics(), dumps=lambda o: json.dumps(o, default=str))
+
+    app = web.Application()
+    app.router.add_get("/", home)
+    app.router.add_get("/healthz", healthz)
+    app.router.add_get("/metrics", metrics)
+    app.router.add_get("/metrics.json", metrics_json)
+    return app
+
+
+async def start_health_server(bot: discord.Client, host: str, port: int) -> Optional[web.AppRunner]:
+    register_gauges("bot", _bot_gauges(bot))
+    runner = web.AppRunner(build_health_app(bot), access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+    except OSError as e:
+        log.error(f"Servidor de salud: no se pudo escuchar en {host}:{port}: {e}")
+        await runner.cleanup()
+        return None
+    log.info(f"Servidor de salud/métricas escuchando en http://{host}:{port} (/healthz, /metrics)")
+    return runner
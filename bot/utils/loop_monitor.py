@@ -0,0 +1,213 @@
+# --- bot/utils/loop_monitor.py (Lag del event loop + detector de llamadas bloqueantes) ---
+#
+# Dos piezas:
+#  - Una tarea en el loop que duerme `interval` y mide cuánto tarde se despierta (lag).
+#  - Un hilo watchdog que, si el loop no late por más de `block_threshold`, captura el stack del
+#    hilo del loop y lo atribuye a la función del bot más interna (o a la tarea en curso).
+# El heartbeat de voz y del gateway de Discord viven en el mismo loop: cada bloqueo los retrasa.
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+_BOT_PACKAGE_DIR = str(Path(__file__).resolve().parent.parent)  # .../bot
+_LAG_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+_MAX_STALL_RECORDS = 20
+_MAX_OFFENDERS = 200
+
+
+def _attribute_stack(frame) -> Optional[str]:
+    """Función más interna del paquete `bot` en el stack (módulo:función)."""
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_BOT_PACKAGE_DIR) and not filename.endswith("loop_monitor.py"):
+            module = Path(filename).relative_to(_BOT_PACKAGE_DIR).with_suffix("").as_posix().replace("/", ".")
+            return f"bot.{module}:{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def _describe_task(task: Optional[asyncio.Task]) -> Optional[str]:
+    if task is None:
+        return None
+    coro = task.get_coro()
+    qualname = getattr(coro, "__qualname__", None) or type(coro).__name__
+    return f"{task.get_name()} ({qualname})"
+
+
+class LoopMonitor:
+    """Muestrea el lag del loop y registra stacks de los callbacks que lo bloquean."""
+
+    def __init__(self, *, interval: float = 0.25, warn_threshold: float = 0.1, block_threshold: float = 0.25):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.block_threshold = block_threshold
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._heartbeat = time.monotonic()
+        # Lag
+        self.samples = 0
+        self.lag_last = 0.0
+        self.lag_max = 0.0
+        self._lag_sum = 0.0
+        self._lag_buckets = [0] * (len(_LAG_BUCKETS) + 1)
+        # Bloqueos
+        self.stalls = 0
+        self.blocked_seconds = 0.0
+        self.offenders: Counter = Counter()
+        self._stall_records: Deque[Dict[str, Any]] = deque(maxlen=_MAX_STALL_RECORDS)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._sample_loop(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        log.info(
+            f"LoopMonitor activo (muestreo {self.interval * 1000:.0f} ms, aviso {self.warn_threshold * 1000:.0f} ms, "
+            f"bloqueo {self.block_threshold * 1000:.0f} ms)."
+        )
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    # --- Muestreo de lag (en el loop) ---
+    async def _sample_loop(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            self._record_lag(max(0.0, now - expected))
+
+    def _record_lag(self, lag: float) -> None:
+        with self._lock:
+            self.samples += 1
+            self.lag_last = lag
+            self._lag_sum += lag
+            if lag > self.lag_max:
+                self.lag_max = lag
+            if lag >= self.block_threshold:
+                self.blocked_seconds += lag  # Duración completa del bloqueo, medida al despertar
+            for i, bound in enumerate(_LAG_BUCKETS):
+                if lag <= bound:
+                    self._lag_buckets[i] += 1
+                    break
+            else:
+                self._lag_buckets[-1] += 1
+        if lag >= self.warn_threshold:
+            log.warning(f"LoopMonitor: el loop respondió con {lag * 1000:.0f} ms de retraso.")
+
+    # --- Watchdog (hilo aparte) ---
+    def _watch(self) -> None:
+        reported_heartbeat = None
+        poll = min(self.interval, self.block_threshold) / 2
+        while not self._stop.wait(poll):
+            heartbeat = self._heartbeat
+            blocked_for = time.monotonic() - heartbeat - self.interval
+            if blocked_for < self.block_threshold or heartbeat == reported_heartbeat:
+                continue
+            # Un registro por bloqueo: el mismo heartbeat viejo no se reporta dos veces
+            reported_heartbeat = heartbeat
+            self._capture_stall(blocked_for)
+
+    def _capture_stall(self, blocked_for: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = "".join(traceback.format_stack(frame))
+        try:
+            task_desc = _describe_task(asyncio.current_task(self._loop))
+        except RuntimeError:
+            task_desc = None
+        culprit = _attribute_stack(frame) or task_desc or "<callback sin tarea>"
+        with self._lock:
+            self.stalls += 1
+            if culprit in self.offenders or len(self.offenders) < _MAX_OFFENDERS:
+                self.offenders[culprit] += 1
+            self._stall_records.append({
+                "at": time.time(),
+                "blocked_ms": round(blocked_for * 1000, 1),
+                "culprit": culprit,
+                "task": task_desc,
+                "stack": stack,
+            })
+        log.warning(
+            f"LoopMonitor: loop bloqueado ≥{blocked_for * 1000:.0f} ms en {culprit} (tarea: {task_desc}).\n{stack}"
+        )
+
+    # --- Snapshot para logs / métricas ---
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets: Dict[str, int] = {}
+            cumulative = 0
+            for bound, count in zip(_LAG_BUCKETS, self._lag_buckets):
+                cumulative += count
+                buckets[f"le_{bound}"] = cumulative
+            buckets["le_inf"] = cumulative + self._lag_buckets[-1]
+            records: List[Dict[str, Any]] = list(self._stall_records)
+            return {
+                "samples": self.samples,
+                "lag_last": self.lag_last,
+                "lag_avg": self._lag_sum / self.samples if self.samples else 0.0,
+                "lag_max": self.lag_max,
+                "lag_buckets": buckets,
+                "stalls": self.stalls,
+                "blocked_seconds": self.blocked_seconds,
+                "offenders": dict(self.offenders.most_common(20)),
+                "recent_stalls": records[-5:],
+            }
+
+
+    def gauges(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Muestras para el registro de métricas (bot/utils/metrics.py)."""
+        with self._lock:
+            avg = self._lag_sum / self.samples if self.samples else 0.0
+            return [
+                ("bot_loop_lag_seconds", {"stat": "last"}, self.lag_last),
+                ("bot_loop_lag_seconds", {"stat": "avg"}, avg),
+                ("bot_loop_lag_seconds", {"stat": "max"}, self.lag_max),
+                ("bot_loop_stalls", {}, self.stalls),
+                ("bot_loop_blocked_seconds", {}, self.blocked_seconds),
+            ]
+
+
+_LOOP_MONITOR: Optional[LoopMonitor] = None
+
+
+def get_loop_monitor() -> LoopMonitor:
+    global _LOOP_MONITOR
+    if _LOOP_MONITOR is None:
+        try:
+            from config.settings import get_settings
+            settings = get_settings()
+            _LOOP_MONITOR = LoopMonitor(
+                warn_threshold=settings.loop_lag_warn_ms / 1000,
+                block_threshold=settings.loop_block_trace_ms / 1000,
+            )
+        except Exception:
+            _LOOP_MONITOR = LoopMonitor()
+    return _LOOP_MONITOR
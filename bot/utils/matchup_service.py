@@ -0,0 +1,515 @@
+# --- bot/utils/matchup_service.py (Servicio único de matchups OP.GG: scrape + parseo + caché + almacén + crawler) ---
+#
+# Lo usan la vista mejores/peores (bot/cogs/league.py) y la vista solo-peores (lol_statics.py):
+# cada (campeón, línea) se descarga y parsea una sola vez y ambas vistas calculan su top-k con heapq.
+
+import asyncio
+import contextlib
+import heapq
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+import lxml.html
+from bs4 import BeautifulSoup
+from lxml import etree
+
+from bot.utils.champion_index import ChampionResolution, get_champion_index
+from bot.utils.executors import ExecutorSaturated, get_executor
+from bot.utils.matchup_store import MatchupStore, StoredMatchups
+from bot.utils.metrics import register_gauges, unregister_collector
+from bot.utils.ttl_cache import AsyncTTLCache
+
+# --- Configuración ---
+DEFAULT_LANE = "mid"
+# Línea vacía = rol por defecto de OP.GG (…/counters/ sin segmento): es otra página, con su propia clave
+DEFAULT_ROLE_LANE = ""
+LANE_MAP = {
+    "top": "top", "superior": "top",
+    "jungle": "jungle", "jg": "jungle", "jungla": "jungle",
+    "mid": "mid", "middle": "mid", "medio": "mid",
+    "adc": "adc", "bottom": "adc", "bot": "adc", "inferior": "adc",
+    "support": "support", "sup": "support", "soporte": "support"
+}
+OPGG_BASE_URL = "https://op.gg/es/lol/champions/{champion}/counters/{lane}"
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
+    'Accept-Encoding': 'gzip, deflate',
+}
+# Sesión HTTP compartida hacia op.gg (keep-alive + límite de concurrencia + timeouts)
+OPGG_MAX_CONNECTIONS = 8
+OPGG_MAX_CONCURRENCY = 4
+OPGG_KEEPALIVE_TIMEOUT = 60
+OPGG_CONNECT_TIMEOUT = 5
+OPGG_READ_TIMEOUT = 10
+# Caché de matchups: los datos solo cambian con cada parche
+MATCHUP_CACHE_FRESH_TTL = 6 * 3600      # Servir directo
+MATCHUP_CACHE_STALE_TTL = 3 * 24 * 3600  # Servir viejo mientras se refresca en segundo plano
+MATCHUP_CACHE_EMPTY_TTL = 10 * 60        # Página sin matchups (layout raro, rol sin datos): reintentar pronto
+MATCHUP_CACHE_MAX_ENTRIES = 1024
+# Crawler de precálculo: todos los campeones × las 5 líneas + el rol por defecto, una vez por parche
+DDRAGON_VERSIONS_URL = "https://ddragon.leagueoflegends.com/api/versions.json"
+DDRAGON_CHAMPIONS_URL = "https://ddragon.leagueoflegends.com/cdn/{version}/data/en_US/champion.json"
+CRAWL_LANES = [DEFAULT_ROLE_LANE] + sorted(set(LANE_MAP.values()))
+# Intentos por (campeón, línea) y parche si OP.GG falla; una página vacía cuenta como definitiva
+CRAWL_MAX_ATTEMPTS = 3
+CRAWL_RECHECK_INTERVAL = 6 * 3600  # Cada cuánto se mira si salió parche nuevo
+CRAWL_START_DELAY = 60             # Dejar que el bot arranque tranquilo
+
+# --- Función get_safe_champion_name_for_url (usa el índice local de campeones) ---
+def get_safe_champion_name_for_url(champion_name: str) -> str:
+    resolution = get_champion_index().resolve(champion_name)
+    if resolution.ok:
+        return resolution.slug
+    # Sin coincidencia en el índice: regla anterior (por si aparece un campeón que todavía no conocemos)
+    name = champion_name.lower()
+    if name == "jarvan iv": return "jarvaniv"
+    if name == "miss fortune": return "missfortune"
+    if name == "dr mundo" or name == "dr. mundo": return "drmundo"
+    if name == "wukong": return "monkeyking"
+    if name == "nunu & willump" or name == "nunu": return "nunu"
+    name = re.sub(r"['.\s]", "", name)
+    return name
+
+# --- Sesión HTTP para op.gg ---
+def create_opgg_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit=OPGG_MAX_CONNECTIONS,
+        ttl_dns_cache=300,
+        keepalive_timeout=OPGG_KEEPALIVE_TIMEOUT,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=OPGG_CONNECT_TIMEOUT + OPGG_READ_TIMEOUT,
+        connect=OPGG_CONNECT_TIMEOUT,
+        sock_read=OPGG_READ_TIMEOUT,
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=REQUEST_HEADERS, auto_decompress=True)
+
+
+async def fetch_opgg_page(session: aiohttp.ClientSession, url: str, limiter: Optional[asyncio.Semaphore] = None) -> Optional[bytes]:
+    """Descarga la página de counters (reutilizando conexiones). Devuelve None ante error."""
+    logging.info(f"[LoL Scraper] Accediendo a: {url}")
+    try:
+        async with (limiter or contextlib.nullcontext()):
+            async with session.get(url) as response:
+                if response.status in (404, 403):
+                    logging.error(f"[LoL Scraper] Error {response.status} para {url}")
+                    return None
+                response.raise_for_status()
+                content = await response.read()
+        logging.info("[LoL Scraper] Página obtenida.")
+        return content
+    except asyncio.TimeoutError:
+        logging.error(f"[LoL Scraper] Timeout accediendo a {url}")
+        return None
+    except aiohttp.ClientError as e:
+        logging.error(f"[LoL Scraper] Error de red: {e}")
+        return None
+    except Exception as e:
+        logging.error(f"[LoL Scraper] Error inesperado: {e}")
+        return None
+
+
+def normalize_lane(lane: str) -> str:
+    """Alias → línea de OP.GG; vacía se mantiene (rol por defecto) y desconocida cae en DEFAULT_LANE."""
+    lane = (lane or "").strip().lower()
+    if not lane:
+        return DEFAULT_ROLE_LANE
+    return LANE_MAP.get(lane, DEFAULT_LANE)
+
+
+def build_opgg_url(champion_name: str, lane: str) -> str:
+    safe_champion_name = get_safe_champion_name_for_url(champion_name)
+    opgg_lane = normalize_lane(lane)
+    return OPGG_BASE_URL.format(champion=safe_champion_name, lane=opgg_lane)
+
+
+# --- Función scrape_opgg_matchups (async: descarga con la sesión compartida y parsea) ---
+async def scrape_opgg_matchups(
+    session: aiohttp.ClientSession,
+    champion_name: str,
+    lane: str,
+    limiter: Optional[asyncio.Semaphore] = None,
+) -> Optional[List[Dict]]:
+    """
+    Obtiene TODOS los matchups (campeón y WR del campeón buscado) desde OP.GG.
+    Devuelve una lista de diccionarios: [{'champion': str, 'win_rate_float': float}]
+    """
+    url = build_opgg_url(champion_name, lane)
+    content = await fetch_opgg_page(session, url, limiter)
+    if content is None:
+        return None
+    # El parseo es CPU puro: fuera del loop, en el pool propio de OP.GG
+    try:
+        return await get_executor("opgg").run(parse_opgg_matchups, content, url)
+    except ExecutorSaturated as e:
+        logging.warning(f"[LoL Scraper] Parseo descartado para {url}: {e}")
+        return None
+
+
+# --- Parser rápido (lxml nativo + XPath compilado) ---
+# Equivale a soup.select('li.cursor-pointer') / item.find('img') / item.find_all('strong')
+_MATCHUP_ITEMS_XPATH = etree.XPath("//li[contains(concat(' ', normalize-space(@class), ' '), ' cursor-pointer ')]")
+_FIRST_IMG_XPATH = etree.XPath("(.//img)[1]")
+_STRONG_XPATH = etree.XPath(".//strong")
+_TEXT_NODES_XPATH = etree.XPath(".//text()")
+_LOADING_SUFFIX_PATTERN = re.compile(r'\s+loading.*$', re.IGNORECASE)
+
+
+def _element_text_stripped(element) -> str:
+    """Igual que BeautifulSoup get_text(strip=True): une los fragmentos de texto ya recortados."""
+    return "".join(part.strip() for part in _TEXT_NODES_XPATH(element))
+
+
+def parse_opgg_matchups(content: bytes, url: str = "") -> Optional[List[Dict]]:
+    """
+    Parsea el HTML de counters de OP.GG: [{'champion': str, 'win_rate_float': float}]
+    Solo visita los <li> de matchup y, dentro de cada uno, el primer <img> y los <strong>.
+    """
+    try:
+        root = lxml.html.fromstring(content)
+    except (etree.ParserError, ValueError) as e:
+        logging.error(f"[LoL Scraper] HTML inválido en {url}: {e}")
+        return None
+
+    all_matchups: List[Dict] = []
+    try:
+        matchup_elements = _MATCHUP_ITEMS_XPATH(root)
+        if not matchup_elements:
+            logging.warning(f"[LoL Scraper] No se encontraron elementos <li.cursor-pointer> en {url}")
+            return []
+
+        logging.info(f"Encontrados {len(matchup_elements)} elementos <li> potenciales.")
+
+        for item in matchup_elements:
+            champ_name: Optional[str] = None
+            win_rate_float: Optional[float] = None
+
+            imgs = _FIRST_IMG_XPATH(item)
+            if imgs:
+                alt_text = imgs[0].get('alt')
+                if alt_text is not None:
+                    champ_name = _LOADING_SUFFIX_PATTERN.sub('', alt_text).strip()
+
+            for strong in _STRONG_XPATH(item):
+                text = _element_text_stripped(strong)
+                if '%' in text:
+                    try:
+                        win_rate_float = float(text.replace('%', '').strip())
+                    except ValueError:
+                        win_rate_float = None
+                        logging.warning(f"[LoL Scraper] Error convirtiendo WR '{text}'")
+                    break
+
+            if champ_name and win_rate_float is not None:
+                all_matchups.append({'champion': champ_name, 'win_rate_float': win_rate_float})
+    except Exception:
+        logging.exception("[LoL Scraper] Error al parsear HTML.")
+        return None
+
+    if not all_matchups:
+        logging.warning("[LoL Scraper] No se extrajeron matchups válidos.")
+        return []
+
+    logging.info(f"[LoL Scraper] Extraídos {len(all_matchups)} matchups válidos.")
+    return all_matchups
+
+
+# --- Parser de referencia con BeautifulSoup (más lento; se mantiene para comparar en bench/) ---
+def parse_opgg_matchups_bs4(content: bytes, url: str = "") -> Optional[List[Dict]]:
+    """Parsea el HTML de counters de OP.GG: [{'champion': str, 'win_rate_float': float}]"""
+    soup = BeautifulSoup(content, 'lxml')
+    # --- CAMBIO: La lista ahora guarda dicts con 'win_rate_float' ---
+    all_matchups = []
+
+    try:
+        container_selector = 'li.cursor-pointer'
+        # --- Selectores Flexibles (iguales) ---
+        # Nombre: Buscar img y usar 'alt'
+        # Win Rate: Buscar strong que contenga '%'
+        # ---
+
+        matchup_elements = soup.select(container_selector)
+        if not matchup_elements:
+            logging.warning(f"[LoL Scraper] No se encontraron elementos con selector: '{container_selector}' en {url}")
+            # Devolver lista vacía si no hay elementos en la página
+            return []
+
+        logging.info(f"Encontrados {len(matchup_elements)} elementos <li> potenciales.")
+
+        for item in matchup_elements:
+            champ_name: Optional[str] = None
+            win_rate_float: Optional[float] = None # Guardamos el float directamente
+
+            # Extraer Nombre desde img alt (igual)
+            img_tag = item.find('img')
+            if img_tag and img_tag.has_attr('alt'):
+                alt_text = img_tag['alt']
+                champ_name = re.sub(r'\s+loading.*$', '', alt_text, flags=re.IGNORECASE).strip()
+
+            # Extraer Win Rate buscando '%' en <strong> y convertir a float (igual)
+            strong_tags = item.find_all('strong')
+            for strong in strong_tags:
+                text = strong.get_text(strip=True)
+                if '%' in text:
+                    try:
+                        win_rate_float = float(text.replace('%', '').strip())
+                    except ValueError:
+                        win_rate_float = None
+                        logging.warning(f"[LoL Scraper] Error convirtiendo WR '{text}'")
+                    break # Salir del bucle de strongs
+
+            # --- CAMBIO: Guardar si tenemos ambos datos, SIN filtro de WR ---
+            if champ_name and win_rate_float is not None:
+                all_matchups.append({'champion': champ_name, 'win_rate_float': win_rate_float})
+            # --- FIN CAMBIO ---
+            # else: # Logueo de datos faltantes (opcional)
+            #     missing = [] # ...
+
+    except Exception:
+        logging.exception("[LoL Scraper] Error al parsear HTML.")
+        return None # Error durante el parseo
+
+    if not all_matchups:
+        logging.warning("[LoL Scraper] No se extrajeron matchups válidos.")
+        # Devolver lista vacía si el parseo funcionó pero no extrajo nada
+        return []
+
+    # --- CAMBIO: La función devuelve la lista COMPLETA sin ordenar/filtrar ---
+    logging.info(f"[LoL Scraper] Extraídos {len(all_matchups)} matchups válidos.")
+    return all_matchups
+# --- Fin función scraping ---
+
+def _load_settings():
+    try:
+        from config.settings import get_settings
+        return get_settings()
+    except Exception:
+        return None
+
+
+def format_age(seconds: float) -> str:
+    if seconds < 3600:
+        return f"{max(1, int(seconds // 60))} min"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} h"
+    return f"{int(seconds // 86400)} d"
+
+
+def parse_champion_and_lane(query: str, default_lane: str = DEFAULT_LANE) -> Tuple[str, str]:
+    """'Jarvan IV jungla' → ('Jarvan IV', 'jungle'). Busca la línea desde el final."""
+    query = query.strip()
+    words = query.split()
+    for i in range(len(words), 0, -1):
+        potential_lane = " ".join(words[i-1:]).lower()
+        if potential_lane in LANE_MAP:
+            return " ".join(words[:i-1]), LANE_MAP[potential_lane]
+    return query, default_lane
+
+
+@dataclass(frozen=True)
+class MatchupSummary:
+    """Top-k de un (campeón, línea) calculado sobre un único resultado en memoria."""
+    record: StoredMatchups
+    best: List[Dict]
+    worst: List[Dict]
+
+    @property
+    def total(self) -> int:
+        return len(self.record.matchups)
+
+
+def _win_rate(m: Dict) -> float:
+    return m.get('win_rate_float', 0.0)
+
+
+class MatchupService:
+    """
+    Dueño de la sesión HTTP, el almacén SQLite, la caché en memoria y el crawler de precálculo.
+    Una sola instancia por proceso (ver `get_matchup_service`).
+    """
+
+    def __init__(self):
+        settings = _load_settings()
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        self._opgg_limiter = asyncio.Semaphore(OPGG_MAX_CONCURRENCY)
+        self._crawler_task: Optional[asyncio.Task] = None
+        self.crawler_enabled = bool(getattr(settings, "matchup_crawler_enabled", True))
+        self.crawl_delay = float(getattr(settings, "matchup_crawl_delay", 4.0))
+        self.store = MatchupStore(Path(getattr(settings, "matchup_db_path", "data/matchups.sqlite3")).expanduser())
+        # Campeones conocidos por pasadas previas del crawler (incluye los nuevos de Data Dragon)
+        self._update_champion_index(self.store.get_meta("champions"))
+        # (campeón normalizado, línea OP.GG) -> matchups almacenados (delante del SQLite)
+        self.cache: AsyncTTLCache[Tuple[str, str], StoredMatchups] = AsyncTTLCache(
+            self._load_matchups,
+            fresh_ttl=MATCHUP_CACHE_FRESH_TTL,
+            stale_ttl=MATCHUP_CACHE_STALE_TTL,
+            negative_ttl=MATCHUP_CACHE_EMPTY_TTL,
+            is_negative=lambda record: not record.matchups,
+            max_entries=MATCHUP_CACHE_MAX_ENTRIES,
+            name="MatchupCache",
+        )
+        self._users = 0
+
+    # --- Ciclo de vida (compartido entre vistas: se cierra cuando se va la última) ---
+    def start(self, wait_until_ready: Optional[Callable[[], Awaitable[None]]] = None) -> None:
+        self._users += 1
+        self._session()
+        register_gauges("matchup-cache", self.cache.gauges)
+        if self.crawler_enabled and self._crawler_task is None:
+            self._crawler_task = asyncio.create_task(self._crawl_loop(wait_until_ready), name="matchup-crawler")
+
+    async def close(self) -> None:
+        self._users = max(0, self._users - 1)
+        if self._users:
+            return
+        global _MATCHUP_SERVICE
+        unregister_collector("matchup-cache")
+        if self._crawler_task:
+            self._crawler_task.cancel()
+            self._crawler_task = None
+        if self.http_session and not self.http_session.closed:
+            await self.http_session.close()
+        self.store.close()
+        if _MATCHUP_SERVICE is self:
+            _MATCHUP_SERVICE = None
+
+    def _session(self) -> aiohttp.ClientSession:
+        if self.http_session is None or self.http_session.closed:
+            self.http_session = create_opgg_session()
+        return self.http_session
+
+    @property
+    def current_patch(self) -> Optional[str]:
+        return self.store.get_meta("patch")
+
+    # --- Consultas ---
+    @staticmethod
+    def resolve_champion(champion_name: str) -> ChampionResolution:
+        return get_champion_index().resolve(champion_name)
+
+    async def get(self, champion_slug: str, lane: str) -> Optional[StoredMatchups]:
+        return await self.cache.get((champion_slug, normalize_lane(lane)))
+
+    async def top_k(self, champion_slug: str, lane: str, k: int) -> Optional[MatchupSummary]:
+        """Mejores y peores k matchups (heapq sobre la lista ya parseada, sin ordenar todo)."""
+        record = await self.get(champion_slug, lane)
+        if record is None:
+            return None
+        best = heapq.nlargest(k, record.matchups, key=_win_rate)
+        worst = heapq.nsmallest(k, record.matchups, key=_win_rate)
+        return MatchupSummary(record, best, worst)
+
+    async def _load_matchups(self, key: Tuple[str, str]) -> Optional[StoredMatchups]:
+        """Sirve desde el almacén local; solo scrapea si falta o es de un parche anterior."""
+        champion_slug, lane = key
+        stored = self.store.get(champion_slug, lane)
+        patch = self.current_patch
+        if stored is not None and stored.matchups and (patch is None or stored.patch == patch):
+            return stored
+        fresh = await self._scrape_and_store(champion_slug, lane, patch)
+        if fresh is not None and fresh.matchups:
+            return fresh
+        return stored if stored is not None and stored.matchups else fresh
+
+    async def _scrape_and_store(self, champion_slug: str, lane: str, patch: Optional[str]) -> Optional[StoredMatchups]:
+        matchups = await scrape_opgg_matchups(self._session(), champion_slug, lane, self._opgg_limiter)
+        if matchups is None:
+            return None
+        if not matchups:
+            # Vacío no se persiste (el crawler lo reintenta); la caché lo guarda solo MATCHUP_CACHE_EMPTY_TTL
+            return StoredMatchups(champion_slug, lane, patch, time.time(), [])
+        record = self.store.put(champion_slug, lane, matchups, patch)
+        self.cache.put((champion_slug, lane), record)
+        return record
+
+    # --- Crawler de precálculo ---
+    async def _refresh_patch_info(self) -> Optional[str]:
+        """Lee el parche actual y la lista de campeones desde Data Dragon y los guarda en el almacén."""
+        session = self._session()
+        try:
+            async with session.get(DDRAGON_VERSIONS_URL) as resp:
+                resp.raise_for_status()
+                version = (await resp.json(content_type=None))[0]
+            async with session.get(DDRAGON_CHAMPIONS_URL.format(version=version)) as resp:
+                resp.raise_for_status()
+                champions = (await resp.json(content_type=None)).get("data", {})
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, IndexError, KeyError) as e:
+            logging.warning(f"[LoL Crawler] No se pudo leer Data Dragon: {e}")
+            return None
+        patch = ".".join(str(version).split(".")[:2])
+        # slug OP.GG (id interno en minúsculas, ej. MonkeyKing → monkeyking) → nombre visible
+        slugs = {str(c.get("id", "")).lower(): c.get("name", "") for c in champions.values() if c.get("id")}
+        if slugs:
+            raw = json.dumps(slugs, ensure_ascii=False)
+            self.store.set_meta("champions", raw)
+            self._update_champion_index(raw)
+        self.store.set_meta("patch", patch)
+        return patch
+
+    @staticmethod
+    def _update_champion_index(raw: Optional[str]) -> None:
+        if not raw:
+            return
+        try:
+            get_champion_index().update(json.loads(raw))
+        except (ValueError, AttributeError) as e:
+            logging.warning(f"[LoL] Lista de campeones guardada ilegible: {e}")
+
+    def _known_champion_slugs(self) -> List[str]:
+        raw = self.store.get_meta("champions")
+        try:
+            return sorted(json.loads(raw)) if raw else []
+        except ValueError:
+            return []
+
+    async def _crawl_once(self) -> None:
+        patch = await self._refresh_patch_info() or self.current_patch
+        champions = self._known_champion_slugs()
+        if not patch or not champions:
+            logging.warning("[LoL Crawler] Sin parche/campeones conocidos; se reintenta más tarde.")
+            return
+        pending = self.store.missing_for_patch(patch, champions, CRAWL_LANES, CRAWL_MAX_ATTEMPTS)
+        if not pending:
+            logging.info(f"[LoL Crawler] Parche {patch}: almacén completo ({self.store.count()} entradas).")
+            return
+        logging.info(f"[LoL Crawler] Parche {patch}: {len(pending)} combinaciones pendientes (1 cada {self.crawl_delay:.1f}s).")
+        done = 0
+        for champion_slug, lane in pending:
+            record = await self._scrape_and_store(champion_slug, lane, patch)
+            if record is not None and record.matchups:
+                done += 1
+            else:
+                # Vacío: no se vuelve a pedir en este parche. Error: hasta CRAWL_MAX_ATTEMPTS pasadas
+                self.store.record_attempt(champion_slug, lane, patch, CRAWL_MAX_ATTEMPTS if record is not None else 1)
+            await asyncio.sleep(self.crawl_delay)
+        logging.info(f"[LoL Crawler] Parche {patch}: {done}/{len(pending)} combinaciones actualizadas.")
+
+    async def _crawl_loop(self, wait_until_ready: Optional[Callable[[], Awaitable[None]]]) -> None:
+        if wait_until_ready is not None:
+            await wait_until_ready()
+        await asyncio.sleep(CRAWL_START_DELAY)
+        while True:
+            try:
+                await self._crawl_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("[LoL Crawler] Error en la pasada de precálculo.")
+            await asyncio.sleep(CRAWL_RECHECK_INTERVAL)
+
+
+_MATCHUP_SERVICE: Optional[MatchupService] = None
+
+
+def get_matchup_service() -> MatchupService:
+    global _MATCHUP_SERVICE
+    if _MATCHUP_SERVICE is None:
+        _MATCHUP_SERVICE = MatchupService()
+    return _MATCHUP_SERVICE
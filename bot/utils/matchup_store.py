@@ -0,0 +1,130 @@
+# --- bot/utils/matchup_store.py (Almacén local SQLite de matchups campeón × línea) ---
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS matchups (
+    champion   TEXT NOT NULL,      -- slug OP.GG (ej. 'monkeyking')
+    lane       TEXT NOT NULL,      -- línea OP.GG (top/jungle/mid/adc/support; '' = rol por defecto)
+    patch      TEXT,               -- parche de Data Dragon al momento del scrape (ej. '15.20')
+    fetched_at REAL NOT NULL,      -- epoch
+    data       TEXT NOT NULL,      -- JSON compacto: [[campeón, wr], ...]
+    PRIMARY KEY (champion, lane)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS crawl_attempts (
+    champion TEXT NOT NULL,
+    lane     TEXT NOT NULL,
+    patch    TEXT NOT NULL,
+    attempts INTEGER NOT NULL,     -- intentos sin datos en este parche (vacío cuenta como definitivo)
+    PRIMARY KEY (champion, lane, patch)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+@dataclass(frozen=True)
+class StoredMatchups:
+    champion: str
+    lane: str
+    patch: Optional[str]
+    fetched_at: float
+    matchups: List[Dict]
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.fetched_at)
+
+
+class MatchupStore:
+    """Tabla SQLite (champion, lane) → lista de matchups, con parche y fecha de actualización."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, champion: str, lane: str) -> Optional[StoredMatchups]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT patch, fetched_at, data FROM matchups WHERE champion = ? AND lane = ?",
+                (champion, lane),
+            ).fetchone()
+        if row is None:
+            return None
+        patch, fetched_at, data = row
+        try:
+            matchups = [{'champion': name, 'win_rate_float': wr} for name, wr in json.loads(data)]
+        except (ValueError, TypeError):
+            log.warning(f"MatchupStore: datos corruptos para {champion}/{lane}")
+            return None
+        return StoredMatchups(champion, lane, patch, fetched_at, matchups)
+
+    def put(self, champion: str, lane: str, matchups: List[Dict], patch: Optional[str]) -> StoredMatchups:
+        fetched_at = time.time()
+        data = json.dumps([[m['champion'], m['win_rate_float']] for m in matchups], separators=(",", ":"), ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO matchups (champion, lane, patch, fetched_at, data) VALUES (?, ?, ?, ?, ?)",
+                (champion, lane, patch, fetched_at, data),
+            )
+        return StoredMatchups(champion, lane, patch, fetched_at, list(matchups))
+
+    def keys_for_patch(self, patch: str) -> Set[Tuple[str, str]]:
+        """Claves (champion, lane) ya actualizadas para `patch`."""
+        with self._lock:
+            rows = self._conn.execute("SELECT champion, lane FROM matchups WHERE patch = ?", (patch,)).fetchall()
+        return {(c, l) for c, l in rows}
+
+    def missing_for_patch(self, patch: str, champions: Iterable[str], lanes: Iterable[str],
+                          max_attempts: int = 1) -> List[Tuple[str, str]]:
+        """Claves sin datos para `patch`, salvo las que ya agotaron `max_attempts` intentos en ese parche."""
+        done = self.keys_for_patch(patch)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT champion, lane FROM crawl_attempts WHERE patch = ? AND attempts >= ?", (patch, max_attempts),
+            ).fetchall()
+        done.update((c, l) for c, l in rows)
+        lanes = list(lanes)
+        return [(c, l) for c in champions for l in lanes if (c, l) not in done]
+
+    def record_attempt(self, champion: str, lane: str, patch: str, attempts: int = 1) -> None:
+        """Suma `attempts` intentos fallidos/vacíos de (champion, lane) en `patch`; los parches viejos se borran."""
+        with self._lock:
+            self._conn.execute("DELETE FROM crawl_attempts WHERE patch != ?", (patch,))
+            self._conn.execute(
+                "INSERT INTO crawl_attempts (champion, lane, patch, attempts) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (champion, lane, patch) DO UPDATE SET attempts = attempts + excluded.attempts",
+                (champion, lane, patch, attempts),
+            )
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM matchups").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
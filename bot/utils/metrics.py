@@ -0,0 +1,223 @@
+# --- bot/utils/metrics.py (Registro de métricas: contadores, histogramas y gauges por colector) ---
+#
+# - Counter / Histogram: se actualizan desde el código (thread-safe, también desde executors).
+# - Colectores de gauges: funciones que devuelven muestras (nombre, labels, valor) al momento de leer.
+# - Colectores JSON: snapshots libres para depuración (/metrics.json).
+# `render_prometheus()` produce el formato de texto de Prometheus para /metrics.
+
+import logging
+import math
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+log = logging.getLogger(__name__)
+
+LabelValues = Tuple[str, ...]
+GaugeSample = Tuple[str, Dict[str, str], float]
+
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0)
+_QUANTILE_WINDOW = 1024  # Últimas N observaciones por serie para p50/p95/p99
+
+_LOCK = threading.Lock()
+_METRICS: Dict[str, "_Metric"] = {}
+_GAUGE_COLLECTORS: Dict[str, Callable[[], Iterable[GaugeSample]]] = {}
+_COLLECTORS: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: labels {sorted(labels)} != {sorted(self.labelnames)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._label_values(labels), 0.0)
+
+    def _render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}_total{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class _HistogramSeries:
+    __slots__ = ("buckets", "count", "sum", "recent")
+
+    def __init__(self, n_buckets: int):
+        self.buckets = [0] * n_buckets
+        self.count = 0
+        self.sum = 0.0
+        self.recent: Deque[float] = deque(maxlen=_QUANTILE_WINDOW)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.bounds = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._label_values(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self.bounds))
+            series.count += 1
+            series.sum += value
+            series.recent.append(value)
+            for i, bound in enumerate(self.bounds):
+                if value <= bound:
+                    series.buckets[i] += 1
+                    break
+
+    def quantiles(self, qs: Sequence[float] = (0.5, 0.95, 0.99), **labels: Any) -> Dict[float, float]:
+        """Cuantiles exactos sobre la ventana de observaciones recientes (vacío si no hay datos)."""
+        with self._lock:
+            series = self._series.get(self._label_values(labels))
+            samples = sorted(series.recent) if series else []
+        if not samples:
+            return {}
+        return {q: samples[min(len(samples) - 1, max(0, math.ceil(q * len(samples)) - 1))] for q in qs}
+
+    def series(self) -> List[Tuple[Dict[str, str], int, float]]:
+        """[(labels, count, sum)] de todas las series observadas."""
+        with self._lock:
+            return [(dict(zip(self.labelnames, k)), s.count, s.sum) for k, s in sorted(self._series.items())]
+
+    def _render(self) -> List[str]:
+        lines: List[str] = []
+        with self._lock:
+            items = [(k, list(s.buckets), s.count, s.sum) for k, s in sorted(self._series.items())]
+        for key, buckets, count, total in items:
+            cumulative = 0
+            for bound, n in zip(self.bounds, buckets):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames + ('le',), key + (_format_value(bound),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames + ('le',), key + ('+Inf',))} {count}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+        return lines
+
+
+def _get_or_create(cls, name: str, help: str, **kwargs):
+    with _LOCK:
+        metric = _METRICS.get(name)
+        if metric is None:
+            metric = _METRICS[name] = cls(name, help, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Métrica '{name}' ya registrada como {metric.kind}")
+    return metric
+
+
+def counter(name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+    return _get_or_create(Counter, name, help, labelnames=labelnames)
+
+
+def histogram(name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+    return _get_or_create(Histogram, name, help, labelnames=labelnames, buckets=buckets)
+
+
+def get_metric(name: str) -> Optional[_Metric]:
+    return _METRICS.get(name)
+
+
+# --- Colectores ---
+def register_gauges(name: str, collector: Callable[[], Iterable[GaugeSample]]) -> None:
+    """`collector()` devuelve muestras (nombre_métrica, labels, valor); se llama en cada lectura."""
+    with _LOCK:
+        _GAUGE_COLLECTORS[name] = collector
+
+
+def register_collector(name: str, collector: Callable[[], Dict[str, Any]]) -> None:
+    """`collector()` devuelve un dict serializable a JSON; se llama en cada lectura de /metrics.json."""
+    with _LOCK:
+        _COLLECTORS[name] = collector
+
+
+def unregister_collector(name: str) -> None:
+    with _LOCK:
+        _COLLECTORS.pop(name, None)
+        _GAUGE_COLLECTORS.pop(name, None)
+
+
+def collect_metrics() -> Dict[str, Any]:
+    with _LOCK:
+        collectors = list(_COLLECTORS.items())
+    snapshot: Dict[str, Any] = {}
+    for name, collector in collectors:
+        try:
+            snapshot[name] = collector()
+        except Exception as e:
+            log.warning(f"Métricas: el colector '{name}' falló: {e}")
+            snapshot[name] = {"error": str(e)}
+    return snapshot
+
+
+# --- Formato Prometheus ---
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_prometheus() -> str:
+    with _LOCK:
+        metrics = sorted(_METRICS.values(), key=lambda m: m.name)
+        gauge_collectors = list(_GAUGE_COLLECTORS.items())
+    lines: List[str] = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric._render())
+
+    gauges: Dict[str, List[Tuple[Dict[str, str], float]]] = {}
+    for name, collector in gauge_collectors:
+        try:
+            for metric_name, labels, value in collector():
+                gauges.setdefault(metric_name, []).append((labels, value))
+        except Exception as e:
+            log.warning(f"Métricas: el colector de gauges '{name}' falló: {e}")
+    for metric_name in sorted(gauges):
+        lines.append(f"# TYPE {metric_name} gauge")
+        for labels, value in gauges[metric_name]:
+            names = sorted(labels)
+            lines.append(f"{metric_name}{_format_labels(names, [labels[n] for n in names])} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
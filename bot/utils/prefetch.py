@@ -0,0 +1,137 @@
+# --- bot/utils/prefetch.py (Look-ahead: mantener resueltas las próximas N entradas de la cola) ---
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, List, Optional, Tuple, TypeVar
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+V = TypeVar("V")
+
+
+class LookaheadPrefetcher(Generic[T, V]):
+    """
+    Resuelve en segundo plano las próximas `depth` entradas de una cola (por guild/scope).
+    - `schedule(scope, items)`: recalcula la ventana; cancela lo que ya no está en ella y lanza lo que falta.
+    - `take(scope, item)`: devuelve el valor ya resuelto (y válido) o None; `take_or_wait` espera si está en curso.
+    - `invalidate(scope)`: descarta todo (cola vaciada, desconexión, etc.).
+    """
+
+    def __init__(
+        self,
+        resolver: Callable[[T], Awaitable[Optional[V]]],
+        *,
+        depth: int = 3,
+        key: Callable[[T], Hashable] = lambda item: item,
+        is_valid: Optional[Callable[[V], bool]] = None,
+        max_age: Optional[float] = None,
+        name: str = "prefetch",
+    ):
+        self._resolver = resolver
+        self.depth = max(0, depth)
+        self._key = key
+        self._is_valid = is_valid
+        self._max_age = max_age
+        self.name = name
+        # scope -> key -> (task, timestamp de inicio)
+        self._entries: Dict[Hashable, Dict[Hashable, Tuple["asyncio.Task[Optional[V]]", float]]] = {}
+        # Estadísticas simples: take() con valor listo vs sin él
+        self.hits = 0
+        self.misses = 0
+
+    def schedule(self, scope: Hashable, items: Iterable[T]) -> None:
+        wanted: Dict[Hashable, T] = {}
+        for item in items:
+            if len(wanted) >= self.depth:
+                break
+            try:
+                k = self._key(item)
+            except Exception:
+                continue
+            if k is not None and k not in wanted:
+                wanted[k] = item
+
+        current = self._entries.setdefault(scope, {})
+        for k in list(current.keys()):
+            task, started = current[k]
+            if k not in wanted or not self._usable(task, started, allow_pending=True):
+                task.cancel()
+                del current[k]
+
+        for k, item in wanted.items():
+            if k not in current:
+                current[k] = (asyncio.create_task(self._run(item), name=f"{self.name}:{scope}"), time.monotonic())
+        if not current:
+            self._entries.pop(scope, None)
+
+    def take(self, scope: Hashable, item: T) -> Optional[V]:
+        """Consume el valor pre-resuelto para `item` si ya terminó y sigue siendo válido."""
+        entries = self._entries.get(scope)
+        if not entries:
+            self.misses += 1
+            return None
+        try:
+            k = self._key(item)
+        except Exception:
+            self.misses += 1
+            return None
+        entry = entries.pop(k, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        task, started = entry
+        if not self._usable(task, started, allow_pending=False):
+            task.cancel()
+            self.misses += 1
+            return None
+        self.hits += 1
+        return task.result()
+
+    async def take_or_wait(self, scope: Hashable, item: T) -> Optional[V]:
+        """Como `take`, pero si la resolución de `item` sigue en curso la espera en vez de descartarla."""
+        entry = (self._entries.get(scope) or {}).get(self._key(item))
+        if entry is not None and not entry[0].done():
+            # wait() no propaga la cancelación de la tarea (p. ej. un invalidate mientras se espera)
+            await asyncio.wait({entry[0]})
+        return self.take(scope, item)
+
+    def invalidate(self, scope: Hashable) -> None:
+        for task, _ in (self._entries.pop(scope, None) or {}).values():
+            task.cancel()
+
+    def pending(self, scope: Hashable) -> int:
+        return len(self._entries.get(scope) or {})
+
+    def gauges(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Muestras para el registro de métricas (bot/utils/metrics.py)."""
+        labels = {"cache": self.name}
+        total = self.hits + self.misses
+        return [
+            ("bot_cache_requests", {**labels, "result": "hit"}, self.hits),
+            ("bot_cache_requests", {**labels, "result": "miss"}, self.misses),
+            ("bot_cache_hit_ratio", labels, self.hits / total if total else 0.0),
+            ("bot_cache_entries", labels, sum(len(e) for e in self._entries.values())),
+        ]
+
+    def _usable(self, task: "asyncio.Task[Optional[V]]", started: float, *, allow_pending: bool) -> bool:
+        if self._max_age is not None and time.monotonic() - started > self._max_age:
+            return False
+        if not task.done():
+            return allow_pending
+        if task.cancelled() or task.exception() is not None:
+            return False
+        value = task.result()
+        if value is None:
+            return False
+        return self._is_valid(value) if self._is_valid else True
+
+    async def _run(self, item: T) -> Optional[V]:
+        try:
+            return await self._resolver(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.debug(f"{self.name}: fallo pre-resolviendo {item!r}: {e}")
+            return None
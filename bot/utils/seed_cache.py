@@ -0,0 +1,203 @@
+# --- bot/utils/seed_cache.py (Caché SQLite: título/identificador Lavalink/ISRC → track semilla de Spotify) ---
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seeds (
+    track_id     TEXT PRIMARY KEY,  -- id de Spotify del tema semilla
+    name         TEXT NOT NULL,
+    artist_id    TEXT NOT NULL,
+    artist_name  TEXT NOT NULL,
+    genres       TEXT,              -- JSON ["...", ...] del artista principal; NULL = sin consultar
+    release_date TEXT,
+    isrc         TEXT,
+    resolved_at  REAL NOT NULL      -- epoch
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS seed_aliases (
+    kind     TEXT NOT NULL,         -- 'q' (búsqueda normalizada), 'll' (identificador Lavalink), 'isrc'
+    value    TEXT NOT NULL,
+    track_id TEXT NOT NULL,
+    PRIMARY KEY (kind, value)
+) WITHOUT ROWID;
+"""
+
+# Orden de confianza al buscar: el ISRC identifica la grabación, el identificador al video concreto
+_LOOKUP_ORDER = ("isrc", "ll", "q")
+
+_SEED_CACHE: Optional["SeedCache"] = None
+_SEED_CACHE_FAILED = False
+
+
+@dataclass(frozen=True)
+class SeedResolution:
+    track_id: str
+    name: str
+    artist_id: str
+    artist_name: str
+    genres: Optional[List[str]]
+    release_date: Optional[str]
+    isrc: Optional[str]
+    resolved_at: float
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.resolved_at)
+
+
+def seed_aliases(query: Optional[str], identifier: Optional[str] = None, isrc: Optional[str] = None) -> List[Tuple[str, str]]:
+    """Claves (kind, value) bajo las que se guarda/busca una semilla."""
+    aliases: List[Tuple[str, str]] = []
+    if isrc:
+        aliases.append(("isrc", isrc.strip().upper()))
+    if identifier:
+        aliases.append(("ll", identifier.strip()))
+    if query:
+        normalized = " ".join(query.casefold().split())
+        if normalized:
+            aliases.append(("q", normalized))
+    return aliases
+
+
+class SeedCache:
+    """Resoluciones de semillas de radio ya hechas contra Spotify (search + artist), persistidas en SQLite."""
+
+    def __init__(self, path: Path, ttl_seconds: float):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        # Estadísticas simples
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def lookup(self, aliases: Iterable[Tuple[str, str]]) -> Optional[SeedResolution]:
+        by_kind = dict(aliases)
+        with self._lock:
+            for kind in _LOOKUP_ORDER:
+                value = by_kind.get(kind)
+                if not value:
+                    continue
+                row = self._conn.execute(
+                    "SELECT s.track_id, s.name, s.artist_id, s.artist_name, s.genres, s.release_date, s.isrc, s.resolved_at "
+                    "FROM seed_aliases a JOIN seeds s ON s.track_id = a.track_id WHERE a.kind = ? AND a.value = ?",
+                    (kind, value),
+                ).fetchone()
+                if row is None:
+                    continue
+                resolution = self._from_row(row)
+                if self.ttl_seconds and resolution.age > self.ttl_seconds:
+                    self.stale += 1
+                    break
+                self.hits += 1
+                return resolution
+            self.misses += 1
+        return None
+
+    def put(self, resolution: SeedResolution, aliases: Iterable[Tuple[str, str]]) -> SeedResolution:
+        resolution = replace(resolution, resolved_at=time.time())
+        aliases = list(aliases)
+        if resolution.isrc:
+            aliases.extend(seed_aliases(None, isrc=resolution.isrc))
+        genres = json.dumps(resolution.genres, ensure_ascii=False) if resolution.genres is not None else None
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO seeds (track_id, name, artist_id, artist_name, genres, release_date, isrc, resolved_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (resolution.track_id, resolution.name, resolution.artist_id, resolution.artist_name,
+                     genres, resolution.release_date, resolution.isrc, resolution.resolved_at),
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO seed_aliases (kind, value, track_id) VALUES (?, ?, ?)",
+                    [(kind, value, resolution.track_id) for kind, value in aliases],
+                )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                raise
+        return resolution
+
+    def add_aliases(self, track_id: str, aliases: Iterable[Tuple[str, str]]) -> int:
+        """
+        Agrega solo los alias que faltan (sin tocar `resolved_at`: el TTL sigue contando desde la resolución).
+        Lectura primero: en el caso común ya están todos y no se abre ninguna escritura. Devuelve cuántos agregó.
+        """
+        aliases = list(aliases)
+        with self._lock:
+            missing = [
+                (kind, value, track_id) for kind, value in aliases
+                if self._conn.execute(
+                    "SELECT 1 FROM seed_aliases WHERE kind = ? AND value = ?", (kind, value),
+                ).fetchone() is None
+            ]
+            if missing:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO seed_aliases (kind, value, track_id) VALUES (?, ?, ?)", missing,
+                )
+        return len(missing)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM seeds").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _from_row(row: tuple) -> SeedResolution:
+        track_id, name, artist_id, artist_name, genres, release_date, isrc, resolved_at = row
+        try:
+            genre_list = json.loads(genres) if genres is not None else None
+        except ValueError:
+            log.warning(f"SeedCache: géneros corruptos para {track_id}")
+            genre_list = None
+        return SeedResolution(track_id, name, artist_id, artist_name, genre_list, release_date, isrc, resolved_at)
+
+    def gauges(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Muestras para el registro de métricas (bot/utils/metrics.py)."""
+        labels = {"cache": "SeedCache"}
+        total = self.hits + self.misses
+        return [
+            ("bot_cache_requests", {**labels, "result": "hit"}, self.hits),
+            ("bot_cache_requests", {**labels, "result": "miss"}, self.misses),
+            ("bot_cache_hit_ratio", labels, self.hits / total if total else 0.0),
+            ("bot_cache_entries", labels, self.count()),
+        ]
+
+
+def get_seed_cache() -> Optional[SeedCache]:
+    """Instancia global (None si está deshabilitada con SEED_CACHE_PATH vacío o no se pudo abrir)."""
+    global _SEED_CACHE, _SEED_CACHE_FAILED
+    if _SEED_CACHE is not None or _SEED_CACHE_FAILED:
+        return _SEED_CACHE
+    try:
+        from config.settings import get_settings
+        settings = get_settings()
+        path = getattr(settings, "seed_cache_path", None)
+        if not path:
+            _SEED_CACHE_FAILED = True
+            return None
+        _SEED_CACHE = SeedCache(
+            Path(path).expanduser(),
+            ttl_seconds=float(getattr(settings, "seed_cache_ttl_days", 30)) * 86400,
+        )
+    except Exception as e:
+        log.warning(f"SeedCache: deshabilitada ({e})")
+        _SEED_CACHE_FAILED = True
+        _SEED_CACHE = None
+    return _SEED_CACHE
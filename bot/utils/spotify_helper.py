@@ -1,23 +1,36 @@
 # --- bot/utils/spotify_helper.py (Radio Co-ocurrencia + Feats → Fallback por Playlist | FIX None playlist item) ---
 
 import asyncio
+import atexit
+import functools
+import heapq
 import logging
 import math
 import os
 import random
 import re
+import threading
 from time import perf_counter
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from dataclasses import replace
 from datetime import datetime
+from pathlib import Path
+
+from bot.utils.coartist_cache import fetch_neighbourhood, get_coartist_cache
+from bot.utils.executors import ExecutorSaturated, get_executor
+from bot.utils.metrics import counter, histogram
+from bot.utils.seed_cache import SeedResolution, get_seed_cache, seed_aliases
+from bot.utils.tracing import NOOP_SPAN, start_span, trace_span
 
 # --- Imports y Configuración Inicial ---
 try:
     import spotipy
     from spotipy import Spotify
     from spotipy.exceptions import SpotifyException
+    from spotipy.cache_handler import MemoryCacheHandler
     from spotipy.oauth2 import SpotifyClientCredentials
 except ImportError:  # pragma: no cover
-    spotipy = None; Spotify = None; SpotifyClientCredentials = None  # type: ignore
+    spotipy = None; Spotify = None; SpotifyClientCredentials = None; MemoryCacheHandler = None  # type: ignore
     class SpotifyException(Exception): pass
     logging.error("SPOTIPY NO INSTALADO. 'pip install spotipy'")
 
@@ -34,9 +47,109 @@ except ImportError:
 _SPOTIFY_CLIENT: Optional[Spotify] = None
 _SPOTIFY_CREDENTIALS_WARNING_EMITTED = False
 
+# --- Métricas por etapa del motor de radio (p50/p95/p99 con `radio_stage_report`) ---
+RADIO_STAGES = ("seed", "playlists", "feats", "enrich", "score", "total")
+RADIO_STAGE_SECONDS = histogram(
+    "bot_radio_stage_seconds", "Duración de cada etapa del motor de radio", ("engine", "stage"),
+)
+RADIO_STAGE_API_CALLS = histogram(
+    "bot_radio_stage_api_calls", "Llamadas a la API de Spotify por etapa", ("engine", "stage"),
+    buckets=(0, 1, 2, 5, 10, 20, 40, 80, 160),
+)
+RADIO_STAGE_POOL_SIZE = histogram(
+    "bot_radio_stage_pool_size", "Candidatos en el pool al terminar la etapa", ("engine", "stage"),
+    buckets=(0, 10, 50, 100, 250, 500, 1000, 2000, 5000),
+)
+# Qué estrategia entregó el lote: primary / fallback (secuencial), *_hedged (en paralelo), late_primary, none
+RADIO_HEDGE_OUTCOMES = counter("bot_radio_hedge_outcomes", "Lotes de radio por estrategia ganadora", ("outcome",))
+
+
+class _CountingSpotify:
+    """Proxy del cliente spotipy que cuenta las llamadas a la API (una instancia por refill)."""
+
+    def __init__(self, client: "Spotify"):
+        self._client = client
+        self._lock = threading.Lock()  # la etapa feats llama desde varios hilos
+        self.calls = 0
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+        def _counted(*args, **kwargs):
+            with self._lock:
+                self.calls += 1
+            return attr(*args, **kwargs)
+        return _counted
+
+
+class _RadioStageTimer:
+    """Registra duración, llamadas a la API y tamaño del pool de cada etapa de un refill (métricas + span)."""
+
+    def __init__(self, engine: str, client: _CountingSpotify):
+        self.engine = engine
+        self._client = client
+        self._t0 = perf_counter()
+        self._stage = ""
+        self._stage_t = self._t0
+        self._stage_calls = 0
+        self._span = NOOP_SPAN
+
+    def begin(self, stage: str) -> None:
+        self._stage = stage
+        self._stage_t = perf_counter()
+        self._stage_calls = self._client.calls
+        self._span = start_span(f"radio.{self.engine}.{stage}")
+
+    def end(self, pool_size: Optional[int] = None) -> float:
+        elapsed = perf_counter() - self._stage_t
+        calls = self._client.calls - self._stage_calls
+        RADIO_STAGE_SECONDS.observe(elapsed, engine=self.engine, stage=self._stage)
+        RADIO_STAGE_API_CALLS.observe(calls, engine=self.engine, stage=self._stage)
+        if pool_size is not None:
+            RADIO_STAGE_POOL_SIZE.observe(pool_size, engine=self.engine, stage=self._stage)
+        self._span.end(api_calls=calls, pool_size=pool_size)
+        return elapsed
+
+    def total(self) -> float:
+        elapsed = perf_counter() - self._t0
+        RADIO_STAGE_SECONDS.observe(elapsed, engine=self.engine, stage="total")
+        RADIO_STAGE_API_CALLS.observe(self._client.calls, engine=self.engine, stage="total")
+        return elapsed
+
+
+def radio_stage_report() -> List[Dict]:
+    """Filas (engine, stage, n, p50, p95, p99, llamadas promedio, pool promedio) para el comando de admin."""
+    calls = {(s["engine"], s["stage"]): (n, total) for s, n, total in RADIO_STAGE_API_CALLS.series()}
+    pools = {(s["engine"], s["stage"]): (n, total) for s, n, total in RADIO_STAGE_POOL_SIZE.series()}
+    rows = []
+    for labels, count, _ in RADIO_STAGE_SECONDS.series():
+        key = (labels["engine"], labels["stage"])
+        q = RADIO_STAGE_SECONDS.quantiles((0.5, 0.95, 0.99), **labels)
+        n_calls, sum_calls = calls.get(key, (0, 0.0))
+        n_pool, sum_pool = pools.get(key, (0, 0.0))
+        rows.append({
+            "engine": key[0],
+            "stage": key[1],
+            "count": count,
+            "p50": q.get(0.5, 0.0),
+            "p95": q.get(0.95, 0.0),
+            "p99": q.get(0.99, 0.0),
+            "api_calls": sum_calls / n_calls if n_calls else None,
+            "pool": sum_pool / n_pool if n_pool else None,
+        })
+    order = {stage: i for i, stage in enumerate(RADIO_STAGES)}
+    rows.sort(key=lambda r: (r["engine"], order.get(r["stage"], len(order))))
+    return rows
+
+# Recomendación de radio: (búsqueda "artista - título", artist_id, track_id, título limpio, imagen, año,
+# ISRC, duración en ms). ISRC y duración permiten elegir bien el resultado de Lavalink (bot/utils/track_match.py)
+RadioRec = Tuple[str, str, str, str, Optional[str], Optional[str], Optional[str], Optional[int]]
+
 # --- Regex, clean_title, extract_artist_from_title ---
-_BRACKET_PATTERN = re.compile(r"\s*[\(\[\{].*")
-_EXTRA_SEP_PATTERN = re.compile(r"\s*(?:\||//|★|☆).*")
+# Corte en el primer paréntesis/corchete/llave o separador ("|", "//", "★", "☆"); antes eran dos
+# regex sucesivas, recortar en el que aparezca primero da exactamente lo mismo
+_TRUNCATE_PATTERN = re.compile(r"\s*(?:[\(\[\{]|\||//|★|☆).*")
 _EXTRA_WORDS_PATTERN = re.compile(r"""
     \s+\b(official|video|audio|lyric|lyrics|visualizer|remaster(?:ed)?|hd|4k|
     oficial|live|acústico|acoustic|explicit|version|edit|mix|remix|radio|
@@ -46,9 +159,13 @@ _ARTIST_TITLE_SEP = re.compile(r"^(.*?)\s+-\s+(.+)$")
 _ARTIST_SEP = re.compile(r"\s+(?:x|&|,|(?:vs|feat|ft)\.?)+\s+", re.IGNORECASE)
 _ALT_ARTIST_SEP = re.compile(r"^(.*?)\s+\|{1,2}\s+.+$")
 _CLEANUP_PATTERN = re.compile(r"\s+#\d+$|&[a-zA-Z]+;")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+# "_" → " " y colapso de espacios en una sola pasada
+_SPACING_PATTERN = re.compile(r"[\s_]+")
+_CLEAN_TITLE_MEMO_SIZE = 4096
 
-def clean_title(title: str, remove_artist_pattern: bool = True) -> str:
-    if not title: return ""
+@functools.lru_cache(maxsize=_CLEAN_TITLE_MEMO_SIZE)
+def _clean_title_cached(title: str, remove_artist_pattern: bool) -> str:
     text = title.strip()
     if remove_artist_pattern:
         hyphen_match = _ARTIST_TITLE_SEP.match(text)
@@ -56,15 +173,35 @@ def clean_title(title: str, remove_artist_pattern: bool = True) -> str:
             text = hyphen_match.group(2).strip()
         elif "|" in text:
             text = text.split("|", 1)[-1].strip()
-    text = _CLEANUP_PATTERN.sub("", text)
-    text = _BRACKET_PATTERN.sub("", text)
-    text = _EXTRA_SEP_PATTERN.sub("", text)
+    # El cleanup va antes del corte: quitar "&amp;" puede formar un "//"
+    if "&" in text or "#" in text:
+        text = _CLEANUP_PATTERN.sub("", text)
+    text = _TRUNCATE_PATTERN.sub("", text)
     text = _EXTRA_WORDS_PATTERN.sub("", text)
-    text = text.replace("_", " ")
-    text = re.sub(r"\s+", " ", text)
+    text = _SPACING_PATTERN.sub(" ", text)
     text = text.strip(" -|/")
     return text.strip()
 
+def clean_title(title: str, remove_artist_pattern: bool = True) -> str:
+    if not title: return ""
+    # Los mismos títulos se limpian varias veces por refill (pool, scoring, selección, historial)
+    return _clean_title_cached(title, bool(remove_artist_pattern))
+
+def clean_titles(titles: List[str], remove_artist_pattern: bool = True) -> List[str]:
+    """Versión por lotes de clean_title (mismo resultado, un solo lookup por título repetido)."""
+    flag = bool(remove_artist_pattern)
+    done: Dict[str, str] = {}
+    out: List[str] = []
+    for title in titles:
+        if not title:
+            out.append("")
+            continue
+        cleaned = done.get(title)
+        if cleaned is None:
+            cleaned = done[title] = _clean_title_cached(title, flag)
+        out.append(cleaned)
+    return out
+
 def extract_artist_from_title(title: str) -> Optional[str]:
     if not title: return None
     text = title.strip()
@@ -76,7 +213,7 @@ def extract_artist_from_title(title: str) -> Optional[str]:
         if not alt_match: return None
         artist = alt_match.group(1).strip()
     artist = _CLEANUP_PATTERN.sub("", artist)
-    artist = re.sub(r"\s+", " ", artist)
+    artist = _WHITESPACE_PATTERN.sub(" ", artist)
     artist = artist.strip(" -|/")
     if not artist: return None
     primary = _ARTIST_SEP.split(artist)[0].strip()
@@ -101,8 +238,26 @@ def _ensure_spotify_client() -> Optional[Spotify]:
             _SPOTIFY_CREDENTIALS_WARNING_EMITTED = True
         return None
     try:
-        auth_manager = SpotifyClientCredentials(client_id=client_id, client_secret=client_secret)
+        token_url = getattr(settings, "spotify_token_url", None)
+        if token_url:
+            # Token en memoria: no mezclar el del stub con el `.cache` que usa el Spotify real
+            auth_manager = SpotifyClientCredentials(client_id=client_id, client_secret=client_secret,
+                                                    cache_handler=MemoryCacheHandler())
+            auth_manager.OAUTH_TOKEN_URL = token_url
+        else:
+            auth_manager = SpotifyClientCredentials(client_id=client_id, client_secret=client_secret)
         _SPOTIFY_CLIENT = spotipy.Spotify(auth_manager=auth_manager, requests_timeout=10, retries=2)
+        api_base = getattr(settings, "spotify_api_base", None)
+        if api_base:
+            _SPOTIFY_CLIENT.prefix = api_base.rstrip("/") + "/"
+            logging.warning(f"Radio Spotify: usando API alternativa {_SPOTIFY_CLIENT.prefix} (token: {token_url or 'Spotify'})")
+        record_file = getattr(settings, "spotify_record_file", None)
+        if record_file:
+            from bot.utils.spotify_replay import RecordingSpotify
+            recorder = RecordingSpotify(_SPOTIFY_CLIENT, Path(record_file).expanduser())
+            atexit.register(recorder.save)
+            _SPOTIFY_CLIENT = recorder
+            logging.info(f"Radio Spotify: 🎙️ grabando respuestas en {record_file}")
         _SPOTIFY_CREDENTIALS_WARNING_EMITTED = False
         logging.info("Radio Spotify: ✅ Cliente inicializado.")
     except Exception as exc:
@@ -117,6 +272,21 @@ def _get_market_default() -> str:
     except Exception:
         return os.getenv("SPOTIFY_MARKET", "AR").upper()
 
+def _get_adaptive_default() -> bool:
+    try:
+        return bool(getattr(get_settings(), "radio_adaptive_sampling", True))
+    except Exception:
+        return os.getenv("RADIO_ADAPTIVE_SAMPLING", "1").lower() in {"1", "true", "yes", "on"}
+
+# Muestreo adaptativo de playlists (motor cooc): mínimo a escanear, fracción del top-k que puede cambiar
+# por playlist para contarla como "estable", cuántas estables seguidas hacen falta para cortar y
+# tamaño del top-k vigilado (múltiplo de `devolver`)
+RADIO_MIN_PLAYLISTS = 6
+RADIO_CONVERGENCE_CHANGE = 0.05
+RADIO_CONVERGENCE_PATIENCE = 3
+RADIO_CONVERGENCE_K = 4
+_COOC_TRACK_FIELDS = "id,name,popularity,is_local,duration_ms,external_ids(isrc),artists(id,name),album(id,images,release_date)"
+
 # ==============================
 # Utilidades de scoring y logs
 # ==============================
@@ -137,6 +307,66 @@ def _safe_year_from_release_date(date_str: Optional[str]) -> Optional[int]:
     except Exception:
         return None
 
+# ==============================
+# Semilla: título de YouTube → track de Spotify (con caché persistente)
+# ==============================
+def _resolve_seed(
+    client: "_CountingSpotify",
+    original_title: str,
+    engine: str,
+    need_genres: bool = True,
+    seed_identifier: Optional[str] = None,
+    seed_isrc: Optional[str] = None,
+) -> Optional[SeedResolution]:
+    """search(limit=1) + artist() para identificar la semilla; las resoluciones se guardan en SeedCache."""
+    titulo_busqueda = clean_title(original_title, False)
+    artista_extraido = extract_artist_from_title(original_title)
+    q = f"{artista_extraido} {titulo_busqueda}".strip() if artista_extraido else titulo_busqueda
+    aliases = seed_aliases(q, seed_identifier, seed_isrc)
+    cache = get_seed_cache()
+    cached = cache.lookup(aliases) if cache is not None else None
+    if cached is not None and (cached.genres is not None or not need_genres):
+        logging.debug(f"Radio {engine}: 💾 semilla en caché q='{q}' → {cached.track_id}")
+        # Un alias nuevo (otro video del mismo tema) apunta al mismo track
+        if cache is not None and any(k != "q" for k, _ in aliases):
+            cache.add_aliases(cached.track_id, aliases)
+        return cached
+
+    if cached is not None:
+        # Resuelta antes por el fallback (sin géneros): solo falta el artista
+        seed_artist = client.artist(cached.artist_id)
+        resolution = replace(cached, genres=seed_artist.get("genres") or [])
+    else:
+        r = client.search(q=q, type="track", limit=1)
+        items = (r.get("tracks") or {}).get("items", []) or []
+        if not items:
+            logging.warning(f"Radio {engine}: 🔎 sin track para q='{q}'")
+            return None
+        seed_track = items[0]
+        seed_artists = seed_track.get("artists") or []
+        if not seed_track.get("id") or not seed_artists or not seed_artists[0].get("id"):
+            logging.warning(f"Radio {engine}: seed sin id/artistas")
+            return None
+        genres = None
+        if need_genres:
+            genres = client.artist(seed_artists[0]["id"]).get("genres") or []
+        resolution = SeedResolution(
+            track_id=seed_track["id"],
+            name=seed_track.get("name", "?"),
+            artist_id=seed_artists[0]["id"],
+            artist_name=seed_artists[0].get("name", "?"),
+            genres=genres,
+            release_date=(seed_track.get("album") or {}).get("release_date"),
+            isrc=(seed_track.get("external_ids") or {}).get("isrc"),
+            resolved_at=0.0,
+        )
+    if cache is not None:
+        try:
+            resolution = cache.put(resolution, aliases)
+        except Exception as e:
+            logging.warning(f"Radio {engine}: no se pudo guardar la semilla en caché: {e}")
+    return resolution
+
 # ============================================================
 # Radio por "co-ocurrencia en playlists" + "feats"
 # ============================================================
@@ -148,45 +378,43 @@ def _fetch_radio_cooc_sync(
     max_playlists: int = 12,
     tracks_por_playlist: int = 100,
     max_coartists: int = 10,
-) -> Optional[List[Tuple[str, str, str, str, Optional[str], Optional[str]]]]:
+    seed_identifier: Optional[str] = None,
+    seed_isrc: Optional[str] = None,
+    max_pool: int = 500,
+    adaptativo: Optional[bool] = None,
+) -> Optional[List[RadioRec]]:
 
     t0 = perf_counter()
     client = _ensure_spotify_client()
     if client is None:
         logging.warning("Radio Cooc: ❌ Cliente Spotify no disponible.")
         return None
+    client = _CountingSpotify(client)
+    stages = _RadioStageTimer("cooc", client)
 
     mercado = (mercado or _get_market_default()).upper()
+    if adaptativo is None:
+        adaptativo = _get_adaptive_default()
     sesion_clean = {item[1].lower() for item in session_played_tuples_key if len(item) > 1 and item[1]}
     logging.info(f"Radio Cooc: ▶️ start title='{original_title}' market={mercado} historial={len(sesion_clean)}")
 
     try:
         # 1) Semilla
-        t_seed = perf_counter()
-        titulo_busqueda = clean_title(original_title, False)
-        artista_extraido = extract_artist_from_title(original_title)
-        q = f"{artista_extraido} {titulo_busqueda}".strip() if artista_extraido else titulo_busqueda
-        r = client.search(q=q, type="track", limit=1)
-        items = (r.get("tracks") or {}).get("items", []) or []
-        if not items:
-            logging.warning(f"Radio Cooc: 🔎 sin track para q='{q}'")
+        stages.begin("seed")
+        seed = _resolve_seed(client, original_title, "Cooc", seed_identifier=seed_identifier, seed_isrc=seed_isrc)
+        if seed is None:
             return None
-        seed_track = items[0]
-        seed_id = seed_track.get("id")
-        seed_name = seed_track.get("name", "?")
-        seed_artists = seed_track.get("artists") or []
-        if not seed_id or not seed_artists:
-            logging.warning("Radio Cooc: seed sin id/artistas")
-            return None
-        seed_artist_id = seed_artists[0].get("id")
-        seed_artist_name = seed_artists[0].get("name", "?")
-        seed_artist = client.artist(seed_artist_id)
-        seed_genres = seed_artist.get("genres") or []
-        seed_year = _safe_year_from_release_date(((seed_track.get("album") or {}).get("release_date")))
-        logging.info(f"Radio Cooc: 🎯 seed='{seed_artist_name} - {seed_name}' (id={seed_id}) genres={seed_genres} t={perf_counter()-t_seed:.3f}s")
+        seed_id = seed.track_id
+        seed_name = seed.name
+        seed_artist_id = seed.artist_id
+        seed_artist_name = seed.artist_name
+        seed_genres = seed.genres or []
+        seed_year = _safe_year_from_release_date(seed.release_date)
+        t_seed = stages.end()
+        logging.info(f"Radio Cooc: 🎯 seed='{seed_artist_name} - {seed_name}' (id={seed_id}) genres={seed_genres} t={t_seed:.3f}s")
 
         # 2) Co-ocurrencia en playlists
-        t_pls = perf_counter()
+        stages.begin("playlists")
         consulta_pls = [f'"{seed_artist_name}"', seed_artist_name]
         if seed_name:
             consulta_pls.append(f'"{seed_name}"')
@@ -194,6 +422,17 @@ def _fetch_radio_cooc_sync(
         playlist_ids_vistos: Set[str] = set()
         pool: Dict[str, Dict] = {}  # track_id -> data
 
+        podados = 0
+
+        def _recortar_pool():
+            # Pool acotado: al pasarse de max_pool se quedan los 3/4 con más co-ocurrencia (los que
+            # aparecieron una sola vez son casi todos los que salen). Memoria y scoring no crecen con el scan.
+            nonlocal podados
+            keep = heapq.nlargest(max(1, (max_pool * 3) // 4), pool.items(), key=lambda kv: kv[1]["cooc"] + kv[1]["bonus"])
+            podados += len(pool) - len(keep)
+            pool.clear()
+            pool.update(keep)
+
         def _agregar_track_al_pool(t: Dict, peso: float):
             if not isinstance(t, dict) or not t.get("id"): return
             if t.get("is_local"): return
@@ -214,132 +453,184 @@ def _fetch_radio_cooc_sync(
                     "track": t,
                     "cooc": float(peso),
                     "bonus": 0.0,
+                    "hits": 1,
                 }
+                if len(pool) > max_pool:
+                    _recortar_pool()
             else:
                 data["cooc"] += float(peso)
+                data["hits"] += 1
 
         total_pls = 0
         total_tracks_sumados = 0
+        convergio = False
 
-        for query in consulta_pls:
-            try:
-                sr = client.search(q=query, type="playlist", limit=max_playlists)
-            except SpotifyException as e:
-                logging.info(f"Radio Cooc: fallo search playlists q='{query}': {e}")
-                continue
+        def _sumar_items(items_page: List[Dict], weight: float) -> None:
+            nonlocal total_tracks_sumados
+            for it in items_page:
+                tr = (it or {}).get("track") or {}
+                _agregar_track_al_pool(tr, peso=weight)
+                total_tracks_sumados += 1
 
-            raw_pls = (sr.get("playlists") or {}).get("items", []) or []
-            # 🔒 FIX: filtrar None y asegurar dict
-            pls = [p for p in raw_pls if isinstance(p, dict) and p.get("id")]
-            if len(pls) < len(raw_pls):
-                logging.debug(f"Radio Cooc: {len(raw_pls)-len(pls)} items de playlists descartados por ser None/sin id.")
-
-            for p in pls:
-                pid = p.get("id")
-                if not pid or pid in playlist_ids_vistos:
+        if adaptativo:
+            # Muestreo adaptativo: primero todas las búsquedas, después las playlists por valor esperado
+            # (nombre/descripción que mencionan artista o tema semilla, posición en la búsqueda, cuántas
+            # búsquedas la devolvieron). Los seguidores no vienen en la búsqueda: pesan al sumar sus tracks.
+            valor_esperado: Dict[str, float] = {}
+            artista_l = seed_artist_name.lower()
+            tema_l = (seed_name or "").lower()
+            for query in consulta_pls:
+                try:
+                    sr = client.search(q=query, type="playlist", limit=max_playlists)
+                except SpotifyException as e:
+                    logging.info(f"Radio Cooc: fallo search playlists q='{query}': {e}")
                     continue
-                playlist_ids_vistos.add(pid)
+                raw_pls = (sr.get("playlists") or {}).get("items", []) or []
+                pls = [p for p in raw_pls if isinstance(p, dict) and p.get("id")]
+                for rank, p in enumerate(pls):
+                    texto = f"{p.get('name') or ''} {p.get('description') or ''}".lower()
+                    valor = 1.0 / (1 + rank)
+                    if artista_l and artista_l in texto:
+                        valor += 1.0
+                    if tema_l and tema_l in texto:
+                        valor += 0.5
+                    valor_esperado[p["id"]] = valor_esperado.get(p["id"], 0.0) + valor
 
+            # Se corta cuando el top-k por co-ocurrencia deja de cambiar (y ya son temas vistos en ≥2 playlists)
+            k_conv = max(RADIO_CONVERGENCE_K * devolver, 10)
+            top_prev: Set[str] = set()
+            estables = 0
+            for pid in sorted(valor_esperado, key=lambda x: -valor_esperado[x]):
+                playlist_ids_vistos.add(pid)
                 try:
-                    pmeta = client.playlist(pid, fields="followers.total,name")
-                    followers = ((pmeta.get("followers") or {}).get("total") or 0)
-                    weight = (math.log1p(followers) / 10.0) + 1.0  # al menos 1
-                except SpotifyException:
-                    weight = 1.0
-
-                offset = 0
-                recogidos = 0
-                while recogidos < tracks_por_playlist:
+                    # Una sola llamada: seguidores + primera página de tracks
+                    pmeta = client.playlist(pid, fields=f"followers.total,tracks.total,tracks.items(track({_COOC_TRACK_FIELDS}))")
+                except SpotifyException as e:
+                    logging.debug(f"Radio Cooc: fallo playlist {pid}: {e}")
+                    continue
+                followers = ((pmeta.get("followers") or {}).get("total") or 0)
+                weight = (math.log1p(followers) / 10.0) + 1.0
+                page = pmeta.get("tracks") or {}
+                items_page = (page.get("items") or [])[:tracks_por_playlist]
+                _sumar_items(items_page, weight)
+                recogidos = len(items_page)
+                while items_page and recogidos < min(tracks_por_playlist, page.get("total") or 0):
                     try:
-                        page = client.playlist_items(
-                            pid,
-                            fields="items(track(id,name,popularity,is_local,artists(id,name),album(id,images,release_date)))",
-                            limit=min(100, tracks_por_playlist - recogidos),
-                            offset=offset
-                        )
+                        more = client.playlist_items(pid, fields=f"items(track({_COOC_TRACK_FIELDS}))",
+                                                     limit=min(100, tracks_por_playlist - recogidos), offset=recogidos)
                     except SpotifyException as e:
                         logging.debug(f"Radio Cooc: fallo playlist_items {pid}: {e}")
                         break
+                    items_page = (more or {}).get("items", []) or []
+                    _sumar_items(items_page, weight)
+                    recogidos += len(items_page)
+                total_pls += 1
 
-                    items_page = (page or {}).get("items", []) or []
-                    if not items_page:
-                        break
+                top = heapq.nlargest(k_conv, pool.items(), key=lambda kv: kv[1]["cooc"] + kv[1]["bonus"])
+                top_ids = {tid for tid, _ in top}
+                cambio = 1.0 - (len(top_ids & top_prev) / k_conv) if top_prev else 1.0
+                top_prev = top_ids
+                estables = estables + 1 if cambio <= RADIO_CONVERGENCE_CHANGE else 0
+                repetidos = len(top) >= k_conv and min(d["hits"] for _, d in top) >= 2
+                if total_pls >= RADIO_MIN_PLAYLISTS and estables >= RADIO_CONVERGENCE_PATIENCE and repetidos:
+                    convergio = True
+                    break
+        else:
+            for query in consulta_pls:
+                try:
+                    sr = client.search(q=query, type="playlist", limit=max_playlists)
+                except SpotifyException as e:
+                    logging.info(f"Radio Cooc: fallo search playlists q='{query}': {e}")
+                    continue
 
-                    for it in items_page:
-                        tr = (it or {}).get("track") or {}
-                        _agregar_track_al_pool(tr, peso=weight)
-                        total_tracks_sumados += 1
+                raw_pls = (sr.get("playlists") or {}).get("items", []) or []
+                # 🔒 FIX: filtrar None y asegurar dict
+                pls = [p for p in raw_pls if isinstance(p, dict) and p.get("id")]
+                if len(pls) < len(raw_pls):
+                    logging.debug(f"Radio Cooc: {len(raw_pls)-len(pls)} items de playlists descartados por ser None/sin id.")
 
-                    recogidos += len(items_page)
-                    offset += len(items_page)
+                for p in pls:
+                    pid = p.get("id")
+                    if not pid or pid in playlist_ids_vistos:
+                        continue
+                    playlist_ids_vistos.add(pid)
 
-                total_pls += 1
+                    try:
+                        pmeta = client.playlist(pid, fields="followers.total,name")
+                        followers = ((pmeta.get("followers") or {}).get("total") or 0)
+                        weight = (math.log1p(followers) / 10.0) + 1.0  # al menos 1
+                    except SpotifyException:
+                        weight = 1.0
 
-        logging.info(f"Radio Cooc: 📚 playlists_escaneadas={total_pls} candidatos_pre_bonus={len(pool)} tracks_sumados={total_tracks_sumados} t={perf_counter()-t_pls:.3f}s")
+                    offset = 0
+                    recogidos = 0
+                    while recogidos < tracks_por_playlist:
+                        try:
+                            page = client.playlist_items(
+                                pid,
+                                fields=f"items(track({_COOC_TRACK_FIELDS}))",
+                                limit=min(100, tracks_por_playlist - recogidos),
+                                offset=offset
+                            )
+                        except SpotifyException as e:
+                            logging.debug(f"Radio Cooc: fallo playlist_items {pid}: {e}")
+                            break
+
+                        items_page = (page or {}).get("items", []) or []
+                        if not items_page:
+                            break
+                        _sumar_items(items_page, weight)
+
+                        recogidos += len(items_page)
+                        offset += len(items_page)
+
+                    total_pls += 1
+
+        t_pls = stages.end(pool_size=len(pool))
+        logging.info(f"Radio Cooc: 📚 playlists_escaneadas={total_pls} convergio={convergio} candidatos_pre_bonus={len(pool)} tracks_sumados={total_tracks_sumados} t={t_pls:.3f}s")
         if not pool:
             logging.warning("Radio Cooc: ❗ sin candidatos por co-ocurrencia")
 
         # 3) Vecindad por colaboraciones (feats) usando top-tracks
-        t_feats = perf_counter()
-        coartists: Set[str] = set()
-        try:
-            tops = client.artist_top_tracks(seed_artist_id, country=mercado).get("tracks", []) or []
-            for t in tops:
-                for a in (t.get("artists") or []) or []:
-                    aid = (a or {}).get("id")
-                    if aid and aid != seed_artist_id:
-                        coartists.add(aid)
-        except SpotifyException as e:
-            logging.debug(f"Radio Cooc: fallo artist_top_tracks seed: {e}")
-
+        stages.begin("feats")
         FEAT_BONUS = 0.6
-        coartists = set(list(coartists)[:max_coartists])
+
+        def _top_tracks_con(c: Any) -> Callable[[str], Optional[List[Dict]]]:
+            def _top_tracks(aid: str) -> Optional[List[Dict]]:
+                try:
+                    return c.artist_top_tracks(aid, country=mercado).get("tracks", []) or []
+                except SpotifyException as e:
+                    logging.debug(f"Radio Cooc: fallo artist_top_tracks {aid}: {e}")
+                    return None
+            return _top_tracks
+
+        # Vecindad cacheada por artista; los refrescos en segundo plano no cuentan como llamadas del refill
+        coartist_cache = get_coartist_cache()
+        if coartist_cache is not None:
+            vecindad, origen_vecindad = coartist_cache.get(
+                seed_artist_id, mercado, max_coartists, _top_tracks_con(client), _top_tracks_con(client._client)
+            )
+        else:
+            vecindad, _ = fetch_neighbourhood(seed_artist_id, _top_tracks_con(client), max_coartists)
+            origen_vecindad = "off"
+        coartists = vecindad.coartists if vecindad is not None else ()
 
         co_tracks_added = 0
         for aid in coartists:
-            try:
-                tt = client.artist_top_tracks(aid, country=mercado).get("tracks", []) or []
-                for t in tt:
-                    _agregar_track_al_pool(t, peso=FEAT_BONUS)
-                    if isinstance(t, dict) and t.get("id") in pool:
-                        pool[t["id"]]["bonus"] += FEAT_BONUS
-                        co_tracks_added += 1
-            except SpotifyException:
-                continue
+            for t in vecindad.top_tracks.get(aid, ()):
+                _agregar_track_al_pool(t, peso=FEAT_BONUS)
+                if isinstance(t, dict) and t.get("id") in pool:
+                    pool[t["id"]]["bonus"] += FEAT_BONUS
+                    co_tracks_added += 1
 
-        logging.info(f"Radio Cooc: 🤝 coartists={len(coartists)} tracks_from_feats={co_tracks_added} pool_total={len(pool)} t={perf_counter()-t_feats:.3f}s")
+        t_feats = stages.end(pool_size=len(pool))
+        logging.info(f"Radio Cooc: 🤝 coartists={len(coartists)} vecindad={origen_vecindad} tracks_from_feats={co_tracks_added} pool_total={len(pool)} t={t_feats:.3f}s")
         if not pool:
             logging.warning("Radio Cooc: ❗ sin candidatos tras co-ocurrencia+feats")
             return None
 
-        # 4) Enriquecer artistas candidatos (géneros/popularidad)
-        t_enrich = perf_counter()
-        cand_artist_ids: List[str] = []
-        for data in pool.values():
-            tr = data["track"]
-            main = (tr.get("artists") or [{}])[0] or {}
-            aid = main.get("id")
-            if aid:
-                cand_artist_ids.append(aid)
-        cand_artist_ids = list({x for x in cand_artist_ids if x})
-        id2genres: Dict[str, List[str]] = {}
-        id2artistpop: Dict[str, int] = {}
-        for i in range(0, len(cand_artist_ids), 50):
-            chunk = cand_artist_ids[i:i+50]
-            try:
-                arts = client.artists(chunk).get("artists", []) or []
-                for a in arts:
-                    if not isinstance(a, dict): continue
-                    aid = a.get("id")
-                    if not aid: continue
-                    id2genres[aid] = a.get("genres", []) or []
-                    id2artistpop[aid] = int(a.get("popularity", 0) or 0)
-            except SpotifyException as e:
-                logging.debug(f"Radio Cooc: fallo artists batch: {e}")
-                continue
-        logging.info(f"Radio Cooc: 🧩 enriquecidos artists={len(id2genres)} t={perf_counter()-t_enrich:.3f}s")
-
-        # 5) Scoring
+        # 4) Scoring parcial: co-ocurrencia, popularidad y recencia no necesitan API
+        stages.begin("score")
         coocs = [d["cooc"] + d["bonus"] for d in pool.values()]
         c_min = min(coocs) if coocs else 0.0
         c_max = max(coocs) if coocs else 1.0
@@ -348,7 +639,6 @@ def _fetch_radio_cooc_sync(
 
         W_COOC, W_GENRE, W_POP, W_REC = 0.50, 0.25, 0.15, 0.10
 
-        scored: List[Tuple[float, Dict]] = []
         years_seen: List[int] = []
         for data in pool.values():
             tr = data["track"]
@@ -364,38 +654,81 @@ def _fetch_radio_cooc_sync(
             if y_span and y_span > 0: return _clamp((y - y_min) / y_span, 0.0, 1.0)
             return 0.5
 
-        for tid, data in pool.items():
+        # (cota superior con Jaccard de géneros = 1, orden en el pool, S_cooc, S_pop, S_rec, artist_id, track)
+        parciales: List[Tuple[float, int, float, float, float, Optional[str], Dict]] = []
+        cleaned_names = clean_titles([data["track"].get("name", "") for data in pool.values()], False)
+        for idx, (data, cleaned) in enumerate(zip(pool.values(), cleaned_names)):
             tr = data["track"]
-            main_artist = (tr.get("artists") or [{}])[0] or {}
-            aid = main_artist.get("id")
-            aname = main_artist.get("name", "")
-            title = tr.get("name", "")
-            cleaned = clean_title(title, False).lower().strip()
-            if not cleaned:
+            if not cleaned.lower().strip():
                 continue
+            aid = ((tr.get("artists") or [{}])[0] or {}).get("id")
             S_cooc = _norm_cooc(data["cooc"] + data["bonus"])
-            genres_cand = id2genres.get(aid, [])
-            S_genre = _jaccard(seed_genres, genres_cand)
             S_pop = (tr.get("popularity", 0) or 0) / 100.0
-            year = _safe_year_from_release_date((tr.get("album") or {}).get("release_date"))
-            S_rec = _recency_score(year)
-            score = (W_COOC * S_cooc) + (W_GENRE * S_genre) + (W_POP * S_pop) + (W_REC * S_rec)
-            scored.append((score, tr))
+            S_rec = _recency_score(_safe_year_from_release_date((tr.get("album") or {}).get("release_date")))
+            cota = (W_COOC * S_cooc) + (W_GENRE * 1.0) + (W_POP * S_pop) + (W_REC * S_rec)
+            parciales.append((cota, idx, S_cooc, S_pop, S_rec, aid, tr))
+        parciales.sort(key=lambda p: (-p[0], p[1]))
+        stages.end(pool_size=len(parciales))
 
-        scored.sort(key=lambda x: x[0], reverse=True)
-        muestra = ", ".join([f"{(s[1].get('name','?'))}:{s[0]:.2f}" for s in scored[:5]])
-        logging.debug(f"Radio Cooc: 🧭 top5_scores=[{muestra}]")
+        # 5) Enriquecer (géneros) y puntuar exacto solo lo que puede entrar al top (branch & bound):
+        # se recorre por cota descendente; un candidato puntuado sale en cuanto supera la cota del siguiente
+        # sin puntuar, así que el orden es el mismo que puntuar y ordenar todo el pool. Los artistas se piden
+        # de a 50 en ese orden, solo cuando hacen falta.
+        stages.begin("enrich")
+        id2genres: Dict[str, List[str]] = {}
+        pedidos: Set[str] = set()
+
+        def _enriquecer_desde(pos: int) -> None:
+            chunk: List[str] = []
+            for p in parciales[pos:]:
+                aid = p[5]
+                if aid and aid not in pedidos:
+                    pedidos.add(aid)
+                    chunk.append(aid)
+                    if len(chunk) >= 50:
+                        break
+            if not chunk:
+                return
+            try:
+                arts = client.artists(chunk).get("artists", []) or []
+                for a in arts:
+                    if not isinstance(a, dict): continue
+                    aid = a.get("id")
+                    if not aid: continue
+                    id2genres[aid] = a.get("genres", []) or []
+            except SpotifyException as e:
+                logging.debug(f"Radio Cooc: fallo artists batch: {e}")
+
+        puntuados = 0
+
+        def _en_orden():
+            nonlocal puntuados
+            heap: List[Tuple[float, int, Dict]] = []  # (-score, idx, track)
+            pos = 0
+            while pos < len(parciales) or heap:
+                if heap and (pos >= len(parciales) or -heap[0][0] > parciales[pos][0]):
+                    neg_score, _, tr = heapq.heappop(heap)
+                    yield -neg_score, tr
+                    continue
+                _, idx, S_cooc, S_pop, S_rec, aid, tr = parciales[pos]
+                if aid and aid not in pedidos:
+                    _enriquecer_desde(pos)
+                pos += 1
+                S_genre = _jaccard(seed_genres, id2genres.get(aid, []))
+                score = (W_COOC * S_cooc) + (W_GENRE * S_genre) + (W_POP * S_pop) + (W_REC * S_rec)
+                heapq.heappush(heap, (-score, idx, tr))
+                puntuados += 1
 
         # 6) Selección final y formateo
-        elegidos: List[Tuple[str, str, str, str, Optional[str], Optional[str]]] = []
+        elegidos: List[RadioRec] = []
         vistos_batch: Set[str] = set()
-        for score, t in scored:
+        for score, t in _en_orden():
             if len(elegidos) >= devolver: break
             titulo = t.get("name", "")
             artista_nombre = ((t.get("artists") or [{}])[0] or {}).get("name", "")
             artista_id = ((t.get("artists") or [{}])[0] or {}).get("id")
             cleaned = clean_title(titulo, False).lower().strip()
-            clave = re.sub(r"\s+", " ", f"{artista_nombre.lower().strip()} {cleaned}")
+            clave = _WHITESPACE_PATTERN.sub(" ", f"{artista_nombre.lower().strip()} {cleaned}")
             if cleaned and cleaned not in sesion_clean and clave not in vistos_batch:
                 vistos_batch.add(cleaned); vistos_batch.add(clave)
                 album = t.get("album") or {}
@@ -407,9 +740,14 @@ def _fetch_radio_cooc_sync(
                     release_year = rd.split("-")[0]
                 track_id = t.get("id")
                 if all([artista_nombre, artista_id, titulo, track_id]):
-                    elegidos.append((f"{artista_nombre} - {titulo}", artista_id, track_id, cleaned, image_url, release_year))
+                    isrc = (t.get("external_ids") or {}).get("isrc")
+                    elegidos.append((f"{artista_nombre} - {titulo}", artista_id, track_id, cleaned, image_url, release_year,
+                                     isrc, t.get("duration_ms")))
                     logging.info(f"Radio Cooc: ✅ elegido '{artista_nombre} - {titulo}' score={score:.3f}")
 
+        t_enrich = stages.end(pool_size=puntuados)
+        logging.info(f"Radio Cooc: 🧩 puntuados={puntuados}/{len(parciales)} artists_enriquecidos={len(pedidos)} podados={podados} t={t_enrich:.3f}s")
+
         if elegidos:
             logging.info(f"Radio Cooc: 🏁 devolviendo {len(elegidos)} temas Ttotal={perf_counter()-t0:.3f}s")
             return elegidos
@@ -423,6 +761,8 @@ def _fetch_radio_cooc_sync(
     except Exception:
         logging.exception(f"Radio Cooc: 💥 error inesperado Ttotal={perf_counter()-t0:.3f}s")
         return None
+    finally:
+        stages.total()
 
 # ==================================================
 # Fallback: LÓGICA DE RECOMENDACIÓN (AÑO + PLAYLIST)
@@ -430,36 +770,33 @@ def _fetch_radio_cooc_sync(
 def _fetch_recommendation_playlist_search_sync(
     original_title: str,
     session_played_tuples_key: Tuple[Tuple[str, str], ...],
-) -> Optional[List[Tuple[str, str, str, str, Optional[str], Optional[str]]]]:
+    seed_identifier: Optional[str] = None,
+    seed_isrc: Optional[str] = None,
+) -> Optional[List[RadioRec]]:
     """Fallback simple: buscar en playlists relacionadas."""
     client = _ensure_spotify_client()
     if client is None:
         logging.warning("Radio Fallback: ❌ Cliente Spotify no disponible.")
         return None
+    client = _CountingSpotify(client)
+    stages = _RadioStageTimer("fallback", client)
+    stages.begin("seed")
     
     sesion_clean = {item[1].lower() for item in session_played_tuples_key if len(item) > 1 and item[1]}
     logging.info(f"Radio Fallback: ▶️ start title='{original_title}' historial={len(sesion_clean)}")
     
     try:
-        # Buscar el track original
-        titulo_busqueda = clean_title(original_title, False)
-        artista_extraido = extract_artist_from_title(original_title)
-        q = f"{artista_extraido} {titulo_busqueda}".strip() if artista_extraido else titulo_busqueda
-        
-        r = client.search(q=q, type="track", limit=1)
-        items = (r.get("tracks") or {}).get("items", []) or []
-        if not items:
-            logging.warning(f"Radio Fallback: 🔎 sin track para q='{q}'")
-            return None
-        
-        seed_track = items[0]
-        seed_name = seed_track.get("name", "?")
-        seed_artists = seed_track.get("artists") or []
-        if not seed_artists:
+        # Buscar el track original (el fallback no usa géneros: sin client.artist)
+        seed = _resolve_seed(client, original_title, "Fallback", need_genres=False,
+                             seed_identifier=seed_identifier, seed_isrc=seed_isrc)
+        if seed is None:
             return None
-        seed_artist_name = seed_artists[0].get("name", "?")
+        seed_name = seed.name
+        seed_artist_name = seed.artist_name
         
         logging.info(f"Radio Fallback: 🎯 seed='{seed_artist_name} - {seed_name}'")
+        stages.end()
+        stages.begin("playlists")
         
         # Buscar playlists relacionadas
         playlist_query = f'"{seed_artist_name}"'
@@ -472,7 +809,7 @@ def _fetch_recommendation_playlist_search_sync(
             return None
         
         # Recoger tracks de las playlists
-        candidates: List[Tuple[str, str, str, str, Optional[str], Optional[str]]] = []
+        candidates: List[RadioRec] = []
         for playlist in playlists[:3]:  # Solo las primeras 3 playlists
             pid = playlist.get("id")
             if not pid:
@@ -481,7 +818,7 @@ def _fetch_recommendation_playlist_search_sync(
             try:
                 page = client.playlist_items(
                     pid,
-                    fields="items(track(id,name,artists(id,name),album(images,release_date)))",
+                    fields="items(track(id,name,duration_ms,external_ids(isrc),artists(id,name),album(images,release_date)))",
                     limit=20
                 )
                 items_page = (page or {}).get("items", []) or []
@@ -510,7 +847,9 @@ def _fetch_recommendation_playlist_search_sync(
                         release_year = rd.split("-")[0]
                     
                     if all([artista_nombre, artista_id, titulo, track_id]):
-                        candidates.append((f"{artista_nombre} - {titulo}", artista_id, track_id, cleaned, image_url, release_year))
+                        isrc = (tr.get("external_ids") or {}).get("isrc")
+                        candidates.append((f"{artista_nombre} - {titulo}", artista_id, track_id, cleaned, image_url, release_year,
+                                           isrc, tr.get("duration_ms")))
                         
                         if len(candidates) >= 5:
                             break
@@ -521,6 +860,7 @@ def _fetch_recommendation_playlist_search_sync(
             if len(candidates) >= 5:
                 break
         
+        stages.end(pool_size=len(candidates))
         if candidates:
             logging.info(f"Radio Fallback: ✅ devolviendo {len(candidates)} temas")
             return candidates
@@ -531,32 +871,177 @@ def _fetch_recommendation_playlist_search_sync(
     except Exception:
         logging.exception("Radio Fallback: 💥 error inesperado")
         return None
+    finally:
+        stages.total()
     
 
 # --- Wrapper async ---
+def _get_hedge_delay_default() -> Optional[float]:
+    try:
+        delay = float(getattr(get_settings(), "radio_hedge_delay_seconds", 2.0))
+    except Exception:
+        delay = float(os.getenv("RADIO_HEDGE_DELAY_SECONDS", "2.0"))
+    return delay if delay >= 0 else None
+
+
+# Espera entre reintentos cuando el pool "spotify" está lleno (se duplica hasta el máximo)
+RADIO_SATURATED_BACKOFF_INITIAL = 0.5
+RADIO_SATURATED_BACKOFF_MAX = 5.0
+# Tiempo total de reintentos si quien pide no pasa `retry_budget` (p. ej. la duración del tema)
+RADIO_SATURATED_RETRY_BUDGET = 60.0
+
+# Tareas de reemplazo tardío en curso (referencia fuerte para que no las junte el GC)
+_LATE_PRIMARY_TASKS: Set["asyncio.Task"] = set()
+
+
+def _task_result(task: "asyncio.Task", engine: str) -> Optional[List[RadioRec]]:
+    """Resultado de una estrategia ya terminada; None si falló (se loguea) o no devolvió nada."""
+    if task.cancelled():
+        return None
+    exc = task.exception()
+    if exc is not None:
+        logging.error(f"Radio Engine: 💥 {engine} falló", exc_info=exc)
+        return None
+    return task.result() or None
+
+
 async def fetch_spotify_recommendation(
     original_title: str,
     session_played_tuples: Set[Tuple[str, str]],
-) -> Optional[List[Tuple[str, str, str, str, Optional[str], Optional[str]]]]:
+    seed_identifier: Optional[str] = None,
+    seed_isrc: Optional[str] = None,
+    on_late_primary: Optional[Callable[[List[RadioRec]], Awaitable[None]]] = None,
+    hedge_delay: Optional[float] = None,
+    should_continue: Optional[Callable[[], bool]] = None,
+    retry_budget: Optional[float] = None,
+) -> Optional[List[RadioRec]]:
+    """
+    Cooc+Feats con el Fallback de playlists como respaldo. Con cobertura (RADIO_HEDGE_DELAY_SECONDS ≥ 0):
+    si Cooc+Feats ya arrancó en su hilo y no terminó tras `hedge_delay` segundos se lanza también el
+    Fallback y gana el primer lote válido. Si ganó el Fallback y Cooc+Feats termina después con
+    resultados, se llama a `on_late_primary(lote)` para que quien encoló el Fallback lo reemplace.
+    Con el pool lleno se reintenta hasta `retry_budget` segundos en total y mientras `should_continue()`
+    (radio activa, player conectado); si no, el refill se abandona.
+    """
     cleaned = clean_title(original_title, False)
     if not cleaned:
         logging.warning("fetch_spotify_recommendation: título semilla vacío tras limpiar.")
         return None
-    loop = asyncio.get_event_loop()
+    executor = get_executor("spotify")
     history_key = tuple(sorted(list(session_played_tuples)))
-    logging.info(f"Radio Engine: 🎚️ Estrategia=Cooc+Feats→Fallback seed='{original_title}' historial={len(history_key)}")
-    try:
-        vecinos = await loop.run_in_executor(None, lambda: _fetch_radio_cooc_sync(original_title, history_key))
-        if vecinos:
-            logging.info(f"Radio Engine: ✅ Cooc+Feats produjo {len(vecinos)} temas")
-            return vecinos
-        logging.info("Radio Engine: ↩️ Cooc+Feats no produjo resultados, aplicando Fallback Playlist…")
-        fallback = await loop.run_in_executor(None, lambda: _fetch_recommendation_playlist_search_sync(original_title, history_key))
-        if fallback:
-            logging.info(f"Radio Engine: ✅ Fallback produjo {len(fallback)} temas")
-        else:
-            logging.warning("Radio Engine: ❌ Fallback tampoco devolvió resultados")
+    delay = _get_hedge_delay_default() if hedge_delay is None else (hedge_delay if hedge_delay >= 0 else None)
+    estrategia = "Cooc+Feats→Fallback" if delay is None else f"Cooc+Feats∥Fallback(+{delay:.1f}s)"
+    logging.info(f"Radio Engine: 🎚️ Estrategia={estrategia} seed='{original_title}' historial={len(history_key)}")
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + (RADIO_SATURATED_RETRY_BUDGET if retry_budget is None else max(0.0, retry_budget))
+    primary_started = asyncio.Event()
+
+    async def _run_when_free(fn: Callable[..., Optional[List[RadioRec]]], *args: Any) -> Optional[List[RadioRec]]:
+        # Pool lleno: el refill espera su lugar (la cola ya se vació y no hay "próximo tema" que dispare otro
+        # refill), pero con tope de tiempo y solo mientras alguien siga escuchando la radio
+        espera = RADIO_SATURATED_BACKOFF_INITIAL
+        while True:
+            if should_continue is not None and not should_continue():
+                logging.info(f"Radio Engine: 🛑 refill abandonado (radio apagada o player desconectado) seed='{original_title}'")
+                return None
+            try:
+                return await executor.run(fn, *args)
+            except ExecutorSaturated as e:
+                restante = deadline - loop.time()
+                if restante <= 0:
+                    logging.warning(f"Radio Engine: ❌ {e}; refill descartado (sin presupuesto de reintentos) seed='{original_title}'")
+                    return None
+                logging.warning(f"Radio Engine: ⏳ {e}; reintento en {min(espera, restante):.1f}s seed='{original_title}'")
+                await asyncio.sleep(min(espera, restante))
+                espera = min(espera * 2, RADIO_SATURATED_BACKOFF_MAX)
+
+    def _cooc_sync(title: str, history: Tuple) -> Optional[List[RadioRec]]:
+        # Avisar al loop que Cooc+Feats ya tiene hilo: recién ahí tiene sentido cubrirlo con el Fallback
+        loop.call_soon_threadsafe(primary_started.set)
+        return _fetch_radio_cooc_sync(title, history, seed_identifier=seed_identifier, seed_isrc=seed_isrc)
+
+    async def _cooc() -> Optional[List[RadioRec]]:
+        with trace_span("radio.cooc", seed=original_title) as span:
+            vecinos = await _run_when_free(_cooc_sync, original_title, history_key)
+            span.set(results=len(vecinos or []))
+        return vecinos
+
+    async def _fallback() -> Optional[List[RadioRec]]:
+        with trace_span("radio.fallback", seed=original_title) as span:
+            fallback = await _run_when_free(
+                functools.partial(_fetch_recommendation_playlist_search_sync, seed_identifier=seed_identifier, seed_isrc=seed_isrc),
+                original_title, history_key,
+            )
+            span.set(results=len(fallback or []))
         return fallback
+
+    try:
+        primary = asyncio.ensure_future(_cooc())
+        if delay is not None:
+            await asyncio.wait({primary}, timeout=delay)
+            if not primary.done() and not primary_started.is_set():
+                # Cooc+Feats sigue esperando lugar en el pool: el Fallback iría a la misma cola llena
+                logging.info(f"Radio Engine: ⏳ Cooc+Feats aún sin hilo tras {delay:.1f}s; sin Fallback en paralelo")
+                delay = None
+        if delay is None or primary.done():
+            vecinos = await primary
+            if vecinos:
+                RADIO_HEDGE_OUTCOMES.inc(outcome="primary")
+                logging.info(f"Radio Engine: ✅ Cooc+Feats produjo {len(vecinos)} temas")
+                return vecinos
+            logging.info("Radio Engine: ↩️ Cooc+Feats no produjo resultados, aplicando Fallback Playlist…")
+            fallback = await _fallback()
+            if fallback:
+                RADIO_HEDGE_OUTCOMES.inc(outcome="fallback")
+                logging.info(f"Radio Engine: ✅ Fallback produjo {len(fallback)} temas")
+            else:
+                RADIO_HEDGE_OUTCOMES.inc(outcome="none")
+                logging.warning("Radio Engine: ❌ Fallback tampoco devolvió resultados")
+            return fallback
+
+        logging.info(f"Radio Engine: ⏱️ Cooc+Feats sigue tras {delay:.1f}s, lanzando Fallback en paralelo")
+        secondary = asyncio.ensure_future(_fallback())
+        pending = {primary, secondary}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if primary in done:
+                vecinos = _task_result(primary, "Cooc+Feats")
+                if vecinos:
+                    # El Fallback sigue en su hilo: se descarta su resultado
+                    secondary.add_done_callback(lambda t: t.cancelled() or t.exception())
+                    RADIO_HEDGE_OUTCOMES.inc(outcome="primary_hedged")
+                    logging.info(f"Radio Engine: ✅ Cooc+Feats produjo {len(vecinos)} temas (Fallback en paralelo descartado)")
+                    return vecinos
+            if secondary in done:
+                fallback = _task_result(secondary, "Fallback")
+                if fallback:
+                    if primary in pending:
+                        primary.add_done_callback(
+                            functools.partial(_on_late_primary_done, seed=original_title, callback=on_late_primary)
+                        )
+                    RADIO_HEDGE_OUTCOMES.inc(outcome="fallback_hedged")
+                    logging.info(f"Radio Engine: ✅ Fallback produjo {len(fallback)} temas antes que Cooc+Feats")
+                    return fallback
+        RADIO_HEDGE_OUTCOMES.inc(outcome="none")
+        logging.warning("Radio Engine: ❌ Ninguna estrategia devolvió resultados")
+        return None
     except Exception:
         logging.exception("Radio Engine: 💥 Error en fetch_spotify_recommendation")
         return None
+
+
+def _on_late_primary_done(task: "asyncio.Task", seed: str,
+                          callback: Optional[Callable[[List[RadioRec]], Awaitable[None]]]) -> None:
+    vecinos = _task_result(task, "Cooc+Feats")
+    if not vecinos:
+        logging.info(f"Radio Engine: Cooc+Feats terminó tarde sin resultados para '{seed}'; queda el lote de Fallback")
+        return
+    RADIO_HEDGE_OUTCOMES.inc(outcome="late_primary")
+    if callback is None:
+        logging.info(f"Radio Engine: Cooc+Feats terminó tarde con {len(vecinos)} temas para '{seed}' (sin reemplazo)")
+        return
+    logging.info(f"Radio Engine: 🔁 Cooc+Feats terminó tarde con {len(vecinos)} temas para '{seed}'; reemplazando el lote de Fallback")
+    late = asyncio.ensure_future(callback(vecinos))
+    _LATE_PRIMARY_TASKS.add(late)
+    late.add_done_callback(_LATE_PRIMARY_TASKS.discard)
@@ -0,0 +1,148 @@
+# --- bot/utils/spotify_replay.py (Grabación / reproducción de respuestas de la API de Spotify) ---
+#
+# - RecordingSpotify: envuelve un cliente spotipy real y guarda cada respuesta en un fixture JSON(.gz).
+#   Se activa en el bot con SPOTIFY_RECORD_FILE=ruta (ver `_ensure_spotify_client`).
+# - ReplaySpotify: sirve las respuestas del fixture sin red; una llamada no grabada se comporta como
+#   un error 404 de la API (y se cuenta en `misses`).
+# La clave de cada llamada es el método + argumentos normalizados, así que el motor de radio debe
+# pedir lo mismo en el mismo orden relativo (ver bench/bench_radio.py: PYTHONHASHSEED fijo).
+
+import gzip
+import io
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+try:
+    from spotipy.exceptions import SpotifyException
+except ImportError:  # pragma: no cover
+    class SpotifyException(Exception):  # type: ignore
+        def __init__(self, http_status, code, msg, reason=None, headers=None):
+            super().__init__(msg)
+            self.http_status = http_status
+
+log = logging.getLogger(__name__)
+
+FIXTURE_VERSION = 1
+# Métodos de spotipy que usan spotify_helper.py y play_command
+RECORDED_METHODS = frozenset({
+    "search", "track", "album", "album_tracks", "playlist", "playlist_items",
+    "artist", "artists", "artist_top_tracks",
+})
+
+
+def call_key(method: str, args: tuple, kwargs: Dict[str, Any]) -> str:
+    return json.dumps([method, list(args), kwargs], sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _open(path: Path, mode: str, *, gz: bool = False):
+    if gz or path.suffix == ".gz":
+        if mode == "w":  # mtime=0: regrabar lo mismo produce el mismo archivo (diffs limpios en git)
+            return io.TextIOWrapper(gzip.GzipFile(path, "wb", mtime=0), encoding="utf-8")
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return path.open(mode, encoding="utf-8")
+
+
+def load_fixture(path: Path) -> Dict[str, Any]:
+    with _open(Path(path), "r") as fh:
+        data = json.load(fh)
+    if data.get("version") != FIXTURE_VERSION:
+        raise ValueError(f"Fixture {path}: versión {data.get('version')} no soportada")
+    return data.get("calls", {})
+
+
+class RecordingSpotify:
+    """Proxy de un cliente spotipy que graba respuestas (y errores de la API) en `path`."""
+
+    def __init__(self, client: Any, path: Path, *, autosave_every: int = 25):
+        self._client = client
+        self.path = Path(path)
+        self.autosave_every = autosave_every
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self._calls: Dict[str, Any] = {}
+        if self.path.is_file():
+            try:
+                self._calls = load_fixture(self.path)
+            except (OSError, ValueError) as e:
+                log.warning(f"RecordingSpotify: fixture previo ilegible ({e}); se sobrescribe")
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._client, name)
+        if name not in RECORDED_METHODS or not callable(attr):
+            return attr
+
+        def _recorded(*args, **kwargs):
+            key = call_key(name, args, kwargs)
+            try:
+                result = attr(*args, **kwargs)
+            except SpotifyException as e:
+                self._store(key, {"error": {"http_status": e.http_status, "msg": str(e)}})
+                raise
+            self._store(key, {"result": result})
+            return result
+        return _recorded
+
+    def _store(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._calls[key] = entry
+            self._unsaved += 1
+            flush = self.autosave_every and self._unsaved >= self.autosave_every
+        if flush:
+            self.save()
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            payload = {"version": FIXTURE_VERSION, "calls": dict(self._calls)}
+            self._unsaved = 0
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with _open(tmp, "w", gz=self.path.suffix == ".gz") as fh:
+            json.dump(payload, fh, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        tmp.replace(self.path)
+        log.info(f"RecordingSpotify: {len(payload['calls'])} respuestas guardadas en {self.path}")
+
+
+class ReplaySpotify:
+    """Cliente falso que responde desde un fixture grabado (sin red, determinista)."""
+
+    def __init__(self, calls: Dict[str, Any]):
+        # Las respuestas se guardan serializadas y se decodifican en cada llamada, como hace spotipy
+        # con el cuerpo HTTP: el benchmark mide también ese costo y el motor no puede mutar el fixture.
+        self._calls = {
+            key: {"raw": json.dumps(entry["result"])} if "result" in entry else entry
+            for key, entry in calls.items()
+        }
+        self._lock = threading.Lock()  # el motor pide top tracks desde varios hilos
+        self.calls = 0
+        self.misses = 0
+        self.missed_keys: Dict[str, int] = {}
+
+    @classmethod
+    def from_file(cls, path: Path) -> "ReplaySpotify":
+        return cls(load_fixture(path))
+
+    def __getattr__(self, name: str):
+        if name not in RECORDED_METHODS:
+            raise AttributeError(name)
+
+        def _replayed(*args, **kwargs):
+            key = call_key(name, args, kwargs)
+            entry = self._calls.get(key)
+            with self._lock:
+                self.calls += 1
+                if entry is None:
+                    self.misses += 1
+                    self.missed_keys[key] = self.missed_keys.get(key, 0) + 1
+            if entry is None:
+                raise SpotifyException(404, -1, f"ReplaySpotify: llamada no grabada {key}")
+            if "error" in entry:
+                err = entry["error"]
+                raise SpotifyException(err.get("http_status", 500), -1, err.get("msg", ""))
+            return json.loads(entry["raw"])
+        return _replayed
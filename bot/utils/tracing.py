@@ -0,0 +1,241 @@
+# --- bot/utils/tracing.py (Trazas por spans: comando → etapas → llamadas, exportadas a JSONL) ---
+#
+# - Un span raíz (`root=True`) abre una traza; los spans creados dentro (misma tarea, tareas hijas o
+#   executors de bot/utils/executors.py) quedan como hijos vía contextvars.
+# - Al cerrar la raíz la traza se escribe si salió en el muestreo (TRACE_SAMPLE_RATE) o si fue lenta
+#   (≥ TRACE_SLOW_MS). Escritura en un hilo aparte: el loop nunca toca el disco.
+# - El archivo rota a <archivo>.1 al pasar TRACE_MAX_MB: en disco quedan como mucho dos archivos.
+# - Sin traza activa, los spans hijos son no-ops baratos.
+
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+log = logging.getLogger(__name__)
+
+_MAX_SPANS_PER_TRACE = 500
+_CURRENT_SPAN: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class _Trace:
+    __slots__ = ("trace_id", "sampled", "spans", "dropped")
+
+    def __init__(self, sampled: bool):
+        self.trace_id = os.urandom(8).hex()
+        self.sampled = sampled
+        self.spans: List["Span"] = []
+        self.dropped = 0
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "attrs", "start_time", "_start", "duration", "error", "_token")
+
+    def __init__(self, trace: _Trace, name: str, parent: Optional["Span"], attrs: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = os.urandom(4).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.attrs = attrs
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        self._token: Optional[contextvars.Token] = None
+
+    @property
+    def is_root(self) -> bool:
+        return self.parent_id is None
+
+    def set(self, **attrs: Any) -> "Span":
+        self.attrs.update(attrs)
+        return self
+
+    def set_error(self, exc: BaseException) -> "Span":
+        self.error = f"{type(exc).__name__}: {exc}"
+        return self
+
+    def end(self, **attrs: Any) -> None:
+        if self.duration is not None:
+            return
+        self.duration = time.perf_counter() - self._start
+        if attrs:
+            self.attrs.update(attrs)
+        if self._token is not None:
+            try:
+                _CURRENT_SPAN.reset(self._token)
+            except ValueError:  # Cerrado desde otro contexto: dejarlo como está
+                pass
+            self._token = None
+        if len(self.trace.spans) < _MAX_SPANS_PER_TRACE:
+            self.trace.spans.append(self)
+        else:
+            self.trace.dropped += 1
+        if self.is_root:
+            get_tracer().finish(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start_time, 6),
+            "duration_ms": round((self.duration or 0.0) * 1000, 3),
+            "attrs": self.attrs,
+        }
+        if self.error:
+            record["error"] = self.error
+        return record
+
+
+class _NoopSpan:
+    """Span sin traza activa: acepta la misma API y no registra nada."""
+    is_root = False
+
+    def set(self, **attrs: Any) -> "_NoopSpan":
+        return self
+
+    def set_error(self, exc: BaseException) -> "_NoopSpan":
+        return self
+
+    def end(self, **attrs: Any) -> None:
+        return None
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    def __init__(self, path: Path, sample_rate: float, slow_threshold: float, max_bytes: int = 0):
+        self.path = Path(path)
+        self.max_bytes = max(0, max_bytes)  # 0 = sin rotación
+        self.sample_rate = max(0.0, min(1.0, sample_rate))
+        self.slow_threshold = slow_threshold
+        self._queue: "queue.SimpleQueue[List[str]]" = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        # Estadísticas simples
+        self.exported = 0
+        self.discarded = 0
+        self.rotations = 0
+
+    def start_span(self, name: str, *, root: bool = False, activate: bool = False, **attrs: Any):
+        parent = _CURRENT_SPAN.get()
+        if root or parent is None:
+            if not root:
+                return NOOP_SPAN
+            trace = _Trace(sampled=random.random() < self.sample_rate)
+            parent = None
+        else:
+            trace = parent.trace
+        span = Span(trace, name, parent, attrs)
+        if activate:
+            span._token = _CURRENT_SPAN.set(span)
+        return span
+
+    def finish(self, root: Span) -> None:
+        trace = root.trace
+        if not trace.sampled and (root.duration or 0.0) < self.slow_threshold:
+            self.discarded += 1
+            return
+        if trace.dropped:
+            root.attrs["dropped_spans"] = trace.dropped
+        lines = [json.dumps(s.to_dict(), ensure_ascii=False, default=str) for s in trace.spans]
+        self.exported += 1
+        self._ensure_writer()
+        self._queue.put(lines)
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="trace-writer", daemon=True)
+                self._writer.start()
+
+    def _write_loop(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            log.error(f"Tracing: no se pudo crear {self.path.parent}: {e}")
+        while True:
+            lines = self._queue.get()
+            try:
+                self._rotate_if_full()
+                with self.path.open("a", encoding="utf-8") as fh:
+                    fh.write("\n".join(lines) + "\n")
+            except OSError as e:
+                log.warning(f"Tracing: no se pudo escribir la traza: {e}")
+
+    def _rotate_if_full(self) -> None:
+        if not self.max_bytes:
+            return
+        try:
+            size = self.path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size >= self.max_bytes:
+            os.replace(self.path, self.path.with_name(self.path.name + ".1"))
+            self.rotations += 1
+            log.info(f"Tracing: {self.path} rotado ({size / 1e6:.1f} MB)")
+
+
+_TRACER: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    global _TRACER
+    if _TRACER is None:
+        try:
+            from config.settings import get_settings
+            settings = get_settings()
+            _TRACER = Tracer(
+                Path(settings.trace_file).expanduser(), settings.trace_sample_rate, settings.trace_slow_ms / 1000,
+                max_bytes=int(settings.trace_max_mb) * 1024 * 1024,
+            )
+        except Exception:
+            _TRACER = Tracer(Path("data/traces.jsonl"), 0.0, 5.0)
+    return _TRACER
+
+
+def start_span(name: str, *, root: bool = False, activate: bool = False, **attrs: Any):
+    """Abre un span (hijo del span actual, o raíz con `root=True`); cerrarlo con `.end()`."""
+    return get_tracer().start_span(name, root=root, activate=activate, **attrs)
+
+
+@contextmanager
+def trace_span(name: str, *, root: bool = False, **attrs: Any) -> Iterator[Any]:
+    """Span activo durante el bloque; registra la excepción si la hay."""
+    span = get_tracer().start_span(name, root=root, activate=True, **attrs)
+    try:
+        yield span
+    except BaseException as e:
+        span.set_error(e)
+        raise
+    finally:
+        span.end()
+
+
+@contextmanager
+def use_span(span: Any) -> Iterator[Any]:
+    """Activa un span ya abierto durante el bloque (sin cerrarlo), ej. para que tareas creadas ahí sean hijas."""
+    if not isinstance(span, Span):
+        yield span
+        return
+    token = _CURRENT_SPAN.set(span)
+    try:
+        yield span
+    finally:
+        _CURRENT_SPAN.reset(token)
+
+
+def current_span() -> Optional[Span]:
+    return _CURRENT_SPAN.get()
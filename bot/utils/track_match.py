@@ -0,0 +1,248 @@
+# --- bot/utils/track_match.py (Spotify → Lavalink: búsqueda por texto + ranking por ISRC/duración, persistido) ---
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from bot.utils.spotify_helper import clean_title
+
+log = logging.getLogger(__name__)
+
+# Diferencia de duración aceptada entre el tema de Spotify y el video (intros/outros de videoclips)
+DURATION_TOLERANCE_MS = 4000
+# Resultados de Lavalink que se comparan por búsqueda
+TOP_RESULTS = 5
+
+# Versiones que no son "el tema" salvo que el nombre de Spotify también lo diga
+_VARIANT_PATTERN = re.compile(
+    r"\b(live|en vivo|directo|cover|karaoke|instrumental|nightcore|sped up|slowed|reverb|8d|remix|acoustic|acústico)\b",
+    re.IGNORECASE,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lavalink_matches (
+    spotify_id TEXT PRIMARY KEY,   -- id de track de Spotify
+    identifier TEXT NOT NULL,      -- identificador Lavalink elegido (ej. id de video)
+    method     TEXT NOT NULL,      -- 'isrc' | 'duration'
+    matched_at REAL NOT NULL,      -- epoch
+    data       TEXT NOT NULL       -- payload Lavalink del track (JSON), para reconstruir el Playable sin buscar
+) WITHOUT ROWID;
+"""
+
+_TRACK_MATCH_STORE: Optional["TrackMatchStore"] = None
+_TRACK_MATCH_STORE_FAILED = False
+
+
+@dataclass(frozen=True)
+class SpotifyTrackRef:
+    """Lo que se sabe del tema en Spotify para elegir el resultado de Lavalink."""
+    track_id: Optional[str]
+    name: str
+    artist: str
+    isrc: Optional[str] = None
+    duration_ms: Optional[int] = None
+
+
+def score_candidate(candidate: Any, ref: SpotifyTrackRef, tolerance_ms: int = DURATION_TOLERANCE_MS) -> Optional[float]:
+    """
+    Puntaje de un resultado de Lavalink (Playable o similar: title/author/length/isrc/is_stream).
+    None = descartado: stream en vivo o duración fuera de tolerancia sin ISRC que lo confirme.
+    """
+    if getattr(candidate, "is_stream", False):
+        return None
+    score = 0.0
+    cand_isrc = (getattr(candidate, "isrc", None) or "").upper()
+    isrc_match = bool(ref.isrc and cand_isrc and cand_isrc == ref.isrc.upper())
+    if isrc_match:
+        score += 100.0
+    length = getattr(candidate, "length", 0) or 0
+    if ref.duration_ms and length:
+        diff = abs(length - ref.duration_ms)
+        if diff > tolerance_ms and not isrc_match:
+            return None
+        score += 10.0 * max(0.0, 1.0 - diff / tolerance_ms)
+    title = (getattr(candidate, "title", "") or "").lower()
+    author = (getattr(candidate, "author", "") or "").lower()
+    name = clean_title(ref.name, False).lower()
+    if name and name in title:
+        score += 5.0
+    artist = ref.artist.lower().strip()
+    if artist and (artist in title or artist in author):
+        score += 3.0
+    if _VARIANT_PATTERN.search(title) and not _VARIANT_PATTERN.search(ref.name):
+        score -= 8.0
+    return score
+
+
+def is_verified(candidate: Any, ref: SpotifyTrackRef, tolerance_ms: int = DURATION_TOLERANCE_MS) -> bool:
+    """Mismo ISRC, o duración conocida dentro de tolerancia con el nombre del tema en el título."""
+    cand_isrc = (getattr(candidate, "isrc", None) or "").upper()
+    if ref.isrc and cand_isrc == ref.isrc.upper():
+        return True
+    length = getattr(candidate, "length", 0) or 0
+    if not ref.duration_ms or not length or abs(length - ref.duration_ms) > tolerance_ms:
+        return False
+    name = clean_title(ref.name, False).lower()
+    return bool(name) and name in (getattr(candidate, "title", "") or "").lower()
+
+
+def rank_candidates(candidates: Sequence[Any], ref: SpotifyTrackRef, top_n: int = TOP_RESULTS,
+                    tolerance_ms: int = DURATION_TOLERANCE_MS) -> List[Tuple[float, Any]]:
+    """Los primeros `top_n` resultados ordenados por puntaje (el orden de Lavalink desempata)."""
+    ranked = []
+    for position, candidate in enumerate(list(candidates)[:top_n]):
+        score = score_candidate(candidate, ref, tolerance_ms)
+        if score is not None:
+            ranked.append((score - 0.1 * position, candidate))
+    ranked.sort(key=lambda item: item[0], reverse=True)
+    return ranked
+
+
+class TrackMatchStore:
+    """Tabla SQLite spotify_id → track de Lavalink ya verificado (por ISRC o duración)."""
+
+    def __init__(self, path: Path, ttl_seconds: float):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # se llama desde el loop: sin fsync por commit
+        self._conn.executescript(_SCHEMA)
+        # Estadísticas simples
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, spotify_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT matched_at, data FROM lavalink_matches WHERE spotify_id = ?", (spotify_id,)
+            ).fetchone()
+        if row is None or (self.ttl_seconds and time.time() - row[0] > self.ttl_seconds):
+            self.misses += 1
+            return None
+        try:
+            data = json.loads(row[1])
+        except ValueError:
+            log.warning(f"TrackMatchStore: payload corrupto para {spotify_id}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, spotify_id: str, identifier: str, method: str, data: Dict[str, Any]) -> None:
+        raw = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO lavalink_matches (spotify_id, identifier, method, matched_at, data) VALUES (?, ?, ?, ?, ?)",
+                (spotify_id, identifier, method, time.time(), raw),
+            )
+
+    def forget_identifier(self, identifier: str) -> int:
+        """Borra los matches que apuntan a un video que dejó de poder reproducirse."""
+        with self._lock:
+            return self._conn.execute("DELETE FROM lavalink_matches WHERE identifier = ?", (identifier,)).rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM lavalink_matches").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def gauges(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Muestras para el registro de métricas (bot/utils/metrics.py)."""
+        labels = {"cache": "TrackMatchStore"}
+        total = self.hits + self.misses
+        return [
+            ("bot_cache_requests", {**labels, "result": "hit"}, self.hits),
+            ("bot_cache_requests", {**labels, "result": "miss"}, self.misses),
+            ("bot_cache_hit_ratio", labels, self.hits / total if total else 0.0),
+            ("bot_cache_entries", labels, self.count()),
+        ]
+
+
+def get_track_match_store() -> Optional[TrackMatchStore]:
+    """Instancia global (None si está deshabilitada con TRACK_MATCH_DB_PATH vacío o no se pudo abrir)."""
+    global _TRACK_MATCH_STORE, _TRACK_MATCH_STORE_FAILED
+    if _TRACK_MATCH_STORE is not None or _TRACK_MATCH_STORE_FAILED:
+        return _TRACK_MATCH_STORE
+    try:
+        from config.settings import get_settings
+        settings = get_settings()
+        path = getattr(settings, "track_match_db_path", None)
+        if not path:
+            _TRACK_MATCH_STORE_FAILED = True
+            return None
+        _TRACK_MATCH_STORE = TrackMatchStore(
+            Path(path).expanduser(),
+            ttl_seconds=float(getattr(settings, "track_match_ttl_days", 30)) * 86400,
+        )
+    except Exception as e:
+        log.warning(f"TrackMatchStore: deshabilitado ({e})")
+        _TRACK_MATCH_STORE_FAILED = True
+        _TRACK_MATCH_STORE = None
+    return _TRACK_MATCH_STORE
+
+
+async def match_spotify_track(
+    ref: SpotifyTrackRef,
+    text_query: str,
+    searcher: Callable[[str], Awaitable[Any]],
+    build: Callable[[Dict[str, Any]], Any],
+    store: Optional[TrackMatchStore] = None,
+) -> Tuple[Optional[Any], str]:
+    """
+    Elige el resultado de Lavalink para un tema de Spotify. Devuelve (track, método):
+    'store' (ya resuelto antes), 'isrc' (resultado con el mismo ISRC), 'duration' (duración verificada),
+    'first' (texto sin verificar: el primer resultado, como antes) o 'none'.
+    `searcher` es p. ej. wavelink.Playable.search; `build` reconstruye el track desde el payload guardado.
+    No se busca por ISRC: la fuente por defecto (YouTube Music) no indexa ISRC y esa búsqueda
+    solo sumaba un viaje a Lavalink por tema; el ISRC cuenta al rankear si el resultado lo trae.
+    Solo se persisten los matches verificados ('isrc' / 'duration').
+    """
+    if store is not None and ref.track_id:
+        data = store.get(ref.track_id)
+        if data is not None:
+            try:
+                return build(data), "store"
+            except Exception as e:
+                log.debug(f"TrackMatch: payload guardado inválido para {ref.track_id}: {e}")
+
+    def _results(found: Any) -> List[Any]:
+        # Una Playlist no es un resultado de búsqueda de temas
+        return list(found) if isinstance(found, list) else []
+
+    best: Optional[Any] = None
+    method = "none"
+    found = _results(await searcher(text_query))
+    first = found[0] if found else None
+    ranked = [c for _, c in rank_candidates(found, ref)]
+    verified = [c for c in ranked if is_verified(c, ref)]
+    if verified:
+        best = verified[0]
+        best_isrc = (getattr(best, "isrc", None) or "").upper()
+        method = "isrc" if ref.isrc and best_isrc == ref.isrc.upper() else "duration"
+    elif ranked or first is not None:
+        # Sin verificación posible: el mejor puntuado (evita versiones en vivo/covers) o el primero
+        best, method = (ranked[0] if ranked else first), "first"
+
+    if store is not None and ref.track_id and best is not None and method in ("isrc", "duration"):
+        data = getattr(best, "raw_data", None)
+        identifier = getattr(best, "identifier", None)
+        if data and identifier:
+            try:
+                store.put(ref.track_id, identifier, method, data)
+            except sqlite3.Error as e:
+                log.warning(f"TrackMatch: no se pudo guardar {ref.track_id}: {e}")
+    if best is not None and first is not None and best is not first:
+        log.info(f"TrackMatch: '{ref.artist} - {ref.name}' → '{getattr(best, 'title', '?')}' ({method}) en vez del primer resultado")
+    return best, method
@@ -0,0 +1,140 @@
+# --- bot/utils/ttl_cache.py (Caché async con TTL + stale-while-revalidate + coalescing) ---
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+log = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class AsyncTTLCache(Generic[K, V]):
+    """
+    Caché en memoria para cargas async costosas (scrapes, APIs).
+    - Entrada fresca (< fresh_ttl): se devuelve al instante.
+    - Entrada vieja (< fresh_ttl + stale_ttl): se devuelve al instante y se refresca en segundo plano.
+    - Sin entrada: se carga; pedidos concurrentes de la misma clave comparten una sola carga.
+    Los resultados `None` (error) no se guardan; los "vacíos" (`is_negative`) solo durante
+    `negative_ttl` y sin ventana vieja (0 = no se guardan).
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[K], Awaitable[Optional[V]]],
+        *,
+        fresh_ttl: float,
+        stale_ttl: float = 0.0,
+        max_entries: int = 512,
+        name: str = "ttl-cache",
+        negative_ttl: float = 0.0,
+        is_negative: Optional[Callable[[V], bool]] = None,
+    ):
+        self._loader = loader
+        self.fresh_ttl = fresh_ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self._is_negative = is_negative
+        self.max_entries = max_entries
+        self.name = name
+        self._entries: "OrderedDict[K, Tuple[V, float]]" = OrderedDict()
+        self._inflight: Dict[K, "asyncio.Task[Optional[V]]"] = {}
+        # Estadísticas simples
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    async def get(self, key: K) -> Optional[V]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.monotonic() - stored_at
+            fresh_ttl, stale_ttl = self._ttls(value)
+            if age < fresh_ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return value
+            if age < fresh_ttl + stale_ttl:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._inflight:
+                    log.info(f"{self.name}: sirviendo '{key}' viejo ({age:.0f}s), refrescando en segundo plano")
+                    self._start_load(key)
+                return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = self._start_load(key)
+        # shield: si un pedido se cancela no cancela la carga compartida
+        return await asyncio.shield(task)
+
+    def peek(self, key: K) -> Optional[Tuple[V, float]]:
+        """Devuelve (valor, edad en segundos) sin disparar cargas."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return entry[0], time.monotonic() - entry[1]
+
+    def _ttls(self, value: V) -> Tuple[float, float]:
+        if self._is_negative is not None and self._is_negative(value):
+            return self.negative_ttl, 0.0
+        return self.fresh_ttl, self.stale_ttl
+
+    def put(self, key: K, value: V) -> None:
+        if self._ttls(value)[0] <= 0:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[K] = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.stale_hits + self.misses + self.coalesced
+        return (self.hits + self.stale_hits + self.coalesced) / total if total else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def gauges(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """Muestras para el registro de métricas (bot/utils/metrics.py)."""
+        labels = {"cache": self.name}
+        return [
+            ("bot_cache_requests", {**labels, "result": "hit"}, self.hits),
+            ("bot_cache_requests", {**labels, "result": "stale"}, self.stale_hits),
+            ("bot_cache_requests", {**labels, "result": "miss"}, self.misses),
+            ("bot_cache_requests", {**labels, "result": "coalesced"}, self.coalesced),
+            ("bot_cache_hit_ratio", labels, self.hit_rate),
+            ("bot_cache_entries", labels, len(self._entries)),
+        ]
+
+    def _start_load(self, key: K) -> "asyncio.Task[Optional[V]]":
+        task = asyncio.create_task(self._load(key), name=f"{self.name}:{key}")
+        self._inflight[key] = task
+        return task
+
+    async def _load(self, key: K) -> Optional[V]:
+        try:
+            value = await self._loader(key)
+            if value is not None:
+                self.put(key, value)
+            return value
+        except Exception:
+            log.exception(f"{self.name}: error cargando '{key}'")
+            return None
+        finally:
+            self._inflight.pop(key, None)
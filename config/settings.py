@@ -10,12 +10,53 @@ class Settings:
 
     spotify_client_id: Optional[str] = None
     spotify_client_secret: Optional[str] = None
+    # Si se define, las respuestas de Spotify se graban ahí (fixture para bench/bench_radio.py)
+    spotify_record_file: Optional[str] = None
+    # Endpoints alternativos de la API/token (ej. loadtest/spotify_stub.py); None = Spotify real
+    spotify_api_base: Optional[str] = None
+    spotify_token_url: Optional[str] = None
 
     lastfm_api_key: Optional[str] = None
     lastfm_api_secret: Optional[str] = None
     youtube_api_key: Optional[str] = None
     ytdl_cookie_file: Optional[str] = None
 
+    # Radio cooc: escanear playlists por valor esperado y cortar cuando el top-k converge (False = todas)
+    radio_adaptive_sampling: bool = True
+    # Si Cooc+Feats no terminó tras estos segundos se lanza el Fallback en paralelo (negativo = secuencial)
+    radio_hedge_delay_seconds: float = 2.0
+
+    # Colaboradores de un artista y sus top tracks (etapa feats de la radio); 0 = deshabilitada
+    coartist_cache_ttl_hours: float = 24.0
+    coartist_cache_max_artists: int = 2048
+
+    # Semillas de radio ya resueltas en Spotify (título/identificador/ISRC → track); "" = deshabilitada
+    seed_cache_path: str = "data/seed_cache.sqlite3"
+    seed_cache_ttl_days: float = 30.0
+
+    # Matches Spotify → Lavalink verificados por ISRC/duración; "" = deshabilitado
+    track_match_db_path: str = "data/track_matches.sqlite3"
+    track_match_ttl_days: float = 30.0
+
+    # Almacén local de matchups (LoL) y crawler en segundo plano
+    matchup_db_path: str = "data/matchups.sqlite3"
+    matchup_crawler_enabled: bool = True
+    matchup_crawl_delay: float = 4.0
+
+    # Pools de hilos por subsistema: "nombre=hilos:cola,..." (ver bot/utils/executors.py)
+    executor_limits: Optional[str] = None
+
+    # Monitor del event loop: avisar con lag ≥ warn, capturar stack si se bloquea ≥ trace
+    loop_lag_warn_ms: int = 100
+    loop_block_trace_ms: int = 250
+
+    # Trazas por spans (JSONL): fracción muestreada + siempre las más lentas que trace_slow_ms
+    trace_file: str = "data/traces.jsonl"
+    # Al superar este tamaño se rota a <trace_file>.1 (una sola copia); 0 = sin límite
+    trace_max_mb: int = 50
+    trace_sample_rate: float = 0.05
+    trace_slow_ms: int = 5000
+
 def get_settings() -> Settings:
     from os import getenv
 
@@ -29,8 +70,29 @@ def get_settings() -> Settings:
         command_prefix=prefix,
         spotify_client_id=getenv("SPOTIFY_CLIENT_ID"),
         spotify_client_secret=getenv("SPOTIFY_CLIENT_SECRET"),
+        spotify_record_file=getenv("SPOTIFY_RECORD_FILE"),
+        spotify_api_base=getenv("SPOTIFY_API_BASE"),
+        spotify_token_url=getenv("SPOTIFY_TOKEN_URL"),
         lastfm_api_key=getenv("LASTFM_API_KEY"),
         youtube_api_key=getenv("YOUTUBE_API_KEY"),
         lastfm_api_secret=getenv("LASTFM_API_SECRET"),
         ytdl_cookie_file=getenv("YTDL_COOKIE_FILE"),
+        radio_adaptive_sampling=getenv("RADIO_ADAPTIVE_SAMPLING", "1").lower() in {"1", "true", "yes", "on"},
+        radio_hedge_delay_seconds=float(getenv("RADIO_HEDGE_DELAY_SECONDS", "2.0")),
+        coartist_cache_ttl_hours=float(getenv("COARTIST_CACHE_TTL_HOURS", "24")),
+        coartist_cache_max_artists=int(getenv("COARTIST_CACHE_MAX_ARTISTS", "2048")),
+        seed_cache_path=getenv("SEED_CACHE_PATH", "data/seed_cache.sqlite3"),
+        seed_cache_ttl_days=float(getenv("SEED_CACHE_TTL_DAYS", "30")),
+        track_match_db_path=getenv("TRACK_MATCH_DB_PATH", "data/track_matches.sqlite3"),
+        track_match_ttl_days=float(getenv("TRACK_MATCH_TTL_DAYS", "30")),
+        matchup_db_path=getenv("MATCHUP_DB_PATH", "data/matchups.sqlite3"),
+        matchup_crawler_enabled=getenv("MATCHUP_CRAWLER", "1").lower() in {"1", "true", "yes", "on"},
+        matchup_crawl_delay=float(getenv("MATCHUP_CRAWL_DELAY", "4.0")),
+        executor_limits=getenv("EXECUTOR_LIMITS"),
+        loop_lag_warn_ms=int(getenv("LOOP_LAG_WARN_MS", "100")),
+        loop_block_trace_ms=int(getenv("LOOP_BLOCK_TRACE_MS", "250")),
+        trace_file=getenv("TRACE_FILE", "data/traces.jsonl"),
+        trace_max_mb=int(getenv("TRACE_MAX_MB", "50")),
+        trace_sample_rate=float(getenv("TRACE_SAMPLE_RATE", "0.05")),
+        trace_slow_ms=int(getenv("TRACE_SLOW_MS", "5000")),
     )
\ No newline at end of file
@@ -0,0 +1,296 @@
+# --- loadtest/fake_lavalink.py (Nodo Lavalink v4 falso: REST + websocket, reproducción simulada) ---
+#
+# Lo justo para que wavelink 3 funcione contra él sin audio real:
+#  - GET  /v4/loadtracks   "ytsearch:<q>" → resultados deterministas; URL de un tema ya devuelto → ese tema
+#  - PATCH/GET/DELETE /v4/sessions/{sid}/players/{guild}, PATCH /v4/sessions/{sid}, GET /v4/info, /version
+#  - WS /v4/websocket: "ready" al conectar y eventos TrackStart/TrackEnd (finished/replaced/stopped)
+# Cada tema "suena" `track_seconds` (± jitter) en vez de su duración real, para acelerar la radio.
+# GET /_stats devuelve contadores (búsquedas, plays, eventos).
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from aiohttp import WSMsgType, web
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class FakeLavalinkConfig:
+    password: str = "youshallnotpass"
+    search_latency_ms: float = 0.0
+    search_jitter_ms: float = 0.0
+    track_seconds: float = 5.0
+    track_jitter: float = 0.2      # fracción (0.2 = ±20%)
+    results_per_search: int = 3
+    seed: int = 1234
+
+
+def _encode(info: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(info, separators=(",", ":")).encode()).decode()
+
+
+def _decode(encoded: str) -> Dict[str, Any]:
+    return json.loads(base64.urlsafe_b64decode(encoded.encode()))
+
+
+class _PlayerState:
+    __slots__ = ("guild_id", "track", "volume", "paused", "voice", "started_at", "end_task")
+
+    def __init__(self, guild_id: str):
+        self.guild_id = guild_id
+        self.track: Optional[Dict[str, Any]] = None
+        self.volume = 100
+        self.paused = False
+        self.voice: Dict[str, Any] = {}
+        self.started_at = 0.0
+        self.end_task: Optional[asyncio.Task] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        position = int((time.monotonic() - self.started_at) * 1000) if self.track else 0
+        return {
+            "guildId": self.guild_id,
+            "track": self.track,
+            "volume": self.volume,
+            "paused": self.paused,
+            "state": {"time": int(time.time() * 1000), "position": position, "connected": bool(self.voice), "ping": 1},
+            "voice": self.voice,
+            "filters": {},
+        }
+
+
+class FakeLavalink:
+    def __init__(self, config: FakeLavalinkConfig):
+        self.config = config
+        self._rng = random.Random(config.seed)
+        self._tracks: Dict[str, Dict[str, Any]] = {}  # identifier → track (para resolver URLs)
+        self._sessions: Dict[str, web.WebSocketResponse] = {}
+        self._players: Dict[str, Dict[str, _PlayerState]] = {}
+        # Estadísticas simples
+        self.stats: Counter = Counter()
+
+    # --- Catálogo de temas (deterministas por consulta) ---
+    def _make_track(self, query: str, n: int) -> Dict[str, Any]:
+        digest = hashlib.sha1(f"{query}|{n}".encode()).digest()
+        identifier = base64.urlsafe_b64encode(digest).decode()[:11]
+        author, _, title = query.partition(" - ")
+        if not title:
+            author, title = "Various Artists", query
+        suffix = ("", " (Official Video)", " (Lyrics)", " (Audio)")[n % 4]
+        info = {
+            "identifier": identifier,
+            "isSeekable": True,
+            "author": author,
+            "length": 150_000 + int.from_bytes(digest[:2], "big") % 110_000,
+            "isStream": False,
+            "position": 0,
+            "title": f"{author} - {title}{suffix}" if author != "Various Artists" else f"{title}{suffix}",
+            "uri": f"https://www.youtube.com/watch?v={identifier}",
+            "artworkUrl": f"https://i.ytimg.com/vi/{identifier}/hqdefault.jpg",
+            "isrc": None,
+            "sourceName": "youtube",
+        }
+        track = {"encoded": _encode(info), "info": info, "pluginInfo": {}, "userData": {}}
+        self._tracks[identifier] = track
+        return track
+
+    def load(self, identifier: str) -> Dict[str, Any]:
+        for prefix in ("ytsearch:", "ytmsearch:", "scsearch:"):
+            if identifier.startswith(prefix):
+                query = identifier[len(prefix):].strip()
+                if not query:
+                    return {"loadType": "empty", "data": {}}
+                tracks = [self._make_track(query, n) for n in range(self.config.results_per_search)]
+                return {"loadType": "search", "data": tracks}
+        if identifier.startswith(("http://", "https://")):
+            video_id = identifier.partition("v=")[2].partition("&")[0]
+            track = self._tracks.get(video_id)
+            if track:
+                return {"loadType": "track", "data": track}
+            return {"loadType": "empty", "data": {}}
+        return self.load(f"ytsearch:{identifier}")
+
+    # --- Eventos por websocket ---
+    async def _send(self, session_id: str, payload: Dict[str, Any]) -> None:
+        ws = self._sessions.get(session_id)
+        if ws is None or ws.closed:
+            return
+        self.stats[f"event:{payload.get('type', payload['op'])}"] += 1
+        await ws.send_str(json.dumps(payload))
+
+    async def _event(self, session_id: str, player: _PlayerState, kind: str, track: Dict[str, Any], **extra: Any) -> None:
+        await self._send(session_id, {"op": "event", "type": kind, "guildId": player.guild_id, "track": track, **extra})
+
+    async def _play_until_end(self, session_id: str, player: _PlayerState, track: Dict[str, Any]) -> None:
+        jitter = self.config.track_jitter
+        duration = self.config.track_seconds * (1 + self._rng.uniform(-jitter, jitter))
+        await asyncio.sleep(max(0.05, duration))
+        if player.track is track:
+            player.track = None
+            player.end_task = None
+            await self._event(session_id, player, "TrackEndEvent", track, reason="finished")
+
+    async def _stop_current(self, session_id: str, player: _PlayerState, reason: str) -> None:
+        old = player.track
+        if old is None:
+            return
+        if player.end_task:
+            player.end_task.cancel()
+            player.end_task = None
+        player.track = None
+        await self._event(session_id, player, "TrackEndEvent", old, reason=reason)
+
+    async def update_player(self, session_id: str, guild_id: str, body: Dict[str, Any], no_replace: bool) -> _PlayerState:
+        player = self._players.setdefault(session_id, {}).setdefault(guild_id, _PlayerState(guild_id))
+        if "voice" in body:
+            player.voice = body["voice"]
+        if "volume" in body:
+            player.volume = body["volume"]
+        if "paused" in body:
+            player.paused = body["paused"]
+        track_req = body.get("track")
+        if track_req is None and "encodedTrack" in body:  # API vieja
+            track_req = {"encoded": body["encodedTrack"]}
+        if track_req is not None:
+            encoded = track_req.get("encoded")
+            if encoded is None:
+                await self._stop_current(session_id, player, "stopped")
+            elif not (no_replace and player.track is not None):
+                await self._stop_current(session_id, player, "replaced")
+                info = _decode(encoded)
+                track = {"encoded": encoded, "info": info, "pluginInfo": {}, "userData": track_req.get("userData", {})}
+                player.track = track
+                player.started_at = time.monotonic()
+                self.stats["plays"] += 1
+                await self._event(session_id, player, "TrackStartEvent", track)
+                player.end_task = asyncio.create_task(self._play_until_end(session_id, player, track))
+        return player
+
+    async def destroy_player(self, session_id: str, guild_id: str) -> None:
+        player = self._players.get(session_id, {}).pop(guild_id, None)
+        if player and player.end_task:
+            player.end_task.cancel()
+
+    # --- App aiohttp ---
+    def build_app(self) -> web.Application:
+        @web.middleware
+        async def auth(request: web.Request, handler):
+            if request.path.startswith("/_"):
+                return await handler(request)
+            if request.headers.get("Authorization") != self.config.password:
+                return web.json_response({"status": 401, "error": "Unauthorized"}, status=401)
+            return await handler(request)
+
+        async def websocket(request: web.Request) -> web.StreamResponse:
+            ws = web.WebSocketResponse(heartbeat=30)
+            await ws.prepare(request)
+            session_id = request.headers.get("Session-Id") or f"fake-{self._rng.getrandbits(48):012x}"
+            resumed = session_id in self._sessions
+            self._sessions[session_id] = ws
+            self.stats["websocket_connects"] += 1
+            await ws.send_str(json.dumps({"op": "ready", "resumed": resumed, "sessionId": session_id}))
+            async for msg in ws:
+                if msg.type == WSMsgType.ERROR:
+                    break
+            if self._sessions.get(session_id) is ws:
+                self._sessions.pop(session_id, None)
+            return ws
+
+        async def info(request: web.Request) -> web.Response:
+            return web.json_response({
+                "version": {"semver": "4.0.0-fake", "major": 4, "minor": 0, "patch": 0, "preRelease": None, "build": None},
+                "buildTime": 0, "git": {"branch": "fake", "commit": "0", "commitTime": 0},
+                "jvm": "fake", "lavaplayer": "fake", "sourceManagers": ["youtube"], "filters": [], "plugins": [],
+            })
+
+        async def version(request: web.Request) -> web.Response:
+            return web.Response(text="4.0.0-fake")
+
+        async def loadtracks(request: web.Request) -> web.Response:
+            self.stats["loadtracks"] += 1
+            cfg = self.config
+            delay = cfg.search_latency_ms + (self._rng.uniform(-cfg.search_jitter_ms, cfg.search_jitter_ms) if cfg.search_jitter_ms else 0.0)
+            if delay > 0:
+                await asyncio.sleep(delay / 1000)
+            return web.json_response(self.load(request.query.get("identifier", "")))
+
+        async def update_session(request: web.Request) -> web.Response:
+            body = await request.json()
+            return web.json_response({"resuming": body.get("resuming", False), "timeout": body.get("timeout", 60)})
+
+        async def players(request: web.Request) -> web.Response:
+            sid = request.match_info["sid"]
+            return web.json_response([p.to_dict() for p in self._players.get(sid, {}).values()])
+
+        async def get_player(request: web.Request) -> web.Response:
+            player = self._players.get(request.match_info["sid"], {}).get(request.match_info["guild"])
+            if player is None:
+                return web.json_response({"status": 404, "error": "Not Found", "message": "Player not found"}, status=404)
+            return web.json_response(player.to_dict())
+
+        async def patch_player(request: web.Request) -> web.Response:
+            self.stats["player_updates"] += 1
+            no_replace = request.query.get("noReplace", "false").lower() == "true"
+            player = await self.update_player(request.match_info["sid"], request.match_info["guild"], await request.json(), no_replace)
+            return web.json_response(player.to_dict())
+
+        async def delete_player(request: web.Request) -> web.Response:
+            await self.destroy_player(request.match_info["sid"], request.match_info["guild"])
+            return web.Response(status=204)
+
+        async def stats_view(request: web.Request) -> web.Response:
+            active = sum(1 for ps in self._players.values() for p in ps.values() if p.track)
+            return web.json_response({"players": sum(len(ps) for ps in self._players.values()), "playing": active,
+                                      "counters": dict(self.stats)})
+
+        app = web.Application(middlewares=[auth])
+        app.router.add_get("/v4/websocket", websocket)
+        app.router.add_get("/v4/info", info)
+        app.router.add_get("/version", version)
+        app.router.add_get("/v4/loadtracks", loadtracks)
+        app.router.add_patch("/v4/sessions/{sid}", update_session)
+        app.router.add_get("/v4/sessions/{sid}/players", players)
+        app.router.add_get("/v4/sessions/{sid}/players/{guild}", get_player)
+        app.router.add_patch("/v4/sessions/{sid}/players/{guild}", patch_player)
+        app.router.add_delete("/v4/sessions/{sid}/players/{guild}", delete_player)
+        app.router.add_get("/_stats", stats_view)
+        return app
+
+
+async def start_fake_lavalink(host: str, port: int, config: Optional[FakeLavalinkConfig] = None) -> web.AppRunner:
+    runner = web.AppRunner(FakeLavalink(config or FakeLavalinkConfig()).build_app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    log.info(f"Lavalink falso escuchando en http://{host}:{port}")
+    return runner
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Nodo Lavalink v4 falso para pruebas de carga")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=2333)
+    ap.add_argument("--password", default="youshallnotpass")
+    ap.add_argument("--search-latency-ms", type=float, default=0.0)
+    ap.add_argument("--search-jitter-ms", type=float, default=0.0)
+    ap.add_argument("--track-seconds", type=float, default=5.0)
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    config = FakeLavalinkConfig(
+        password=args.password, search_latency_ms=args.search_latency_ms,
+        search_jitter_ms=args.search_jitter_ms, track_seconds=args.track_seconds,
+    )
+    print(f"Lavalink falso: http://{args.host}:{args.port} (password: {args.password})")
+    web.run_app(FakeLavalink(config).build_app(), host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+# --- loadtest/radio_load.py (Simulador de carga multi-guild: MusicWavelinkCog con radio) ---
+#
+# Uso:
+#   python -m loadtest.radio_load --stages 5,10,20,40 --stage-seconds 30 [--json curvas.json]
+#
+# Levanta en un proceso aparte el stub de Spotify (loadtest/spotify_stub.py) y un Lavalink falso
+# (loadtest/fake_lavalink.py); en este proceso corre el cog de música real sobre un bot sin gateway:
+# guilds, canales y voz son objetos falsos, wavelink habla HTTP/WS de verdad con el Lavalink falso.
+# Cada guild simulada hace `!p <tema>`, `!radio on` y de vez en cuando `!s` o `!p` de otro tema / playlist de
+# Spotify; los fines de tema los emite el Lavalink falso y disparan los refills de radio.
+# Por etapa (cantidad de guilds) se reporta: lag del loop (p50/p99/máx), bloqueos detectados, comandos/s y su
+# p95, temas iniciados/s, refills (media) y hueco fin-de-cola → siguiente tema (p50/p95), RSS, requests/s
+# al stub de Spotify (y 429), rechazos del executor "spotify".
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+_PASSWORD = "loadtest"
+
+
+# --- Proceso de backends (stub de Spotify + Lavalink falso) ---
+def _backends_main(conn, host: str, spotify_port: int, lavalink_port: int, spotify_cfg: Dict[str, Any],
+                   lavalink_cfg: Dict[str, Any], seeds: int) -> None:
+    from loadtest.fake_lavalink import FakeLavalinkConfig, start_fake_lavalink
+    from loadtest.spotify_stub import StubConfig, start_spotify_stub
+    from bench.spotify_catalog import SyntheticCatalog
+
+    async def run() -> None:
+        config = StubConfig(**spotify_cfg)
+        catalog = SyntheticCatalog(config.catalog_seed, config.artists, config.playlists)
+        await start_spotify_stub(host, spotify_port, config, catalog)
+        await start_fake_lavalink(host, lavalink_port, FakeLavalinkConfig(password=_PASSWORD, **lavalink_cfg))
+        playlists = sorted(catalog.playlist_data)[:50]
+        conn.send({"titles": catalog.seed_titles(seeds), "playlists": playlists})
+        await asyncio.Event().wait()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run())
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # pico (Linux: KiB)
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def _run(args: argparse.Namespace, seeds: Dict[str, List[str]]) -> List[Dict[str, Any]]:
+    # Importar después de fijar el entorno (settings se leen de os.environ)
+    import aiohttp
+    import discord
+    import wavelink
+    from discord.ext import commands
+
+    from bot.cogs.music import RADIO_REFILL_SECONDS, MusicWavelinkCog
+    from bot.utils.executors import executor_stats, shutdown_executors
+    from bot.utils.loop_monitor import get_loop_monitor
+
+    class LoadTestBot(commands.Bot):
+        """Bot sin gateway: `user` y `get_channel` salen del simulador."""
+
+        def __init__(self):
+            super().__init__(command_prefix="!", intents=discord.Intents.default())
+            self.wavelink_ready = asyncio.Event()
+            self.channels: Dict[int, Any] = {}
+            self._fake_user = discord.Object(id=10**17)
+
+        @property
+        def user(self):
+            return self._fake_user
+
+        def get_channel(self, id: int, /):
+            return self.channels.get(id)
+
+    class FakeMessage:
+        async def edit(self, **kwargs: Any) -> "FakeMessage":
+            return self
+
+    class FakeTextChannel(discord.TextChannel):
+        def __init__(self, guild: "FakeGuild", channel_id: int):  # noqa: sin super(): no hay payload de Discord
+            self.id = channel_id
+            self.guild = guild
+            self.name = f"texto-{guild.id}"
+            self.sent = 0
+
+        async def send(self, *args: Any, **kwargs: Any) -> FakeMessage:
+            self.sent += 1
+            return FakeMessage()
+
+    class FakeVoiceChannel:
+        def __init__(self, bot: LoadTestBot, guild: "FakeGuild", channel_id: int):
+            self.id = channel_id
+            self.guild = guild
+            self.name = f"voz-{guild.id}"
+            self.mention = f"<#{channel_id}>"
+            # Un oyente humano: wavelink cuenta miembros no-bot para la inactividad
+            self.members = [type("Member", (), {"id": guild.id, "bot": False})()]
+            self._bot = bot
+
+        async def connect(self, *, cls, timeout: float = 10.0, reconnect: bool = True, self_deaf: bool = False, self_mute: bool = False):
+            player = cls(self._bot, self)
+            self.guild.voice_client = player
+            await player.connect(timeout=timeout, reconnect=reconnect, self_deaf=self_deaf, self_mute=self_mute)
+            return player
+
+    class FakeGuild:
+        def __init__(self, bot: LoadTestBot, guild_id: int):
+            self.id = guild_id
+            self.name = f"guild-{guild_id}"
+            self.voice_client = None
+            self.text = FakeTextChannel(self, guild_id * 10 + 1)
+            self.voice = FakeVoiceChannel(bot, self, guild_id * 10 + 2)
+            bot.channels[self.text.id] = self.text
+            bot.channels[self.voice.id] = self.voice
+
+        async def change_voice_state(self, *, channel, self_mute: bool = False, self_deaf: bool = False) -> None:
+            player = self.voice_client
+            if channel is None:
+                self.voice_client = None
+                return
+            # Lo que haría el gateway: VOICE_STATE_UPDATE + VOICE_SERVER_UPDATE
+            async def handshake():
+                await player.on_voice_state_update({"channel_id": str(channel.id), "session_id": f"s{self.id}"})
+                await player.on_voice_server_update({"token": f"t{self.id}", "endpoint": "fake.voice", "guild_id": str(self.id)})
+            asyncio.create_task(handshake())
+
+    class FakeContext:
+        def __init__(self, guild: FakeGuild, command: commands.Command):
+            self.guild = guild
+            self.channel = guild.text
+            self.author = type("Author", (), {"id": guild.id, "voice": type("VS", (), {"channel": guild.voice})()})()
+            self.command = command
+            self.command_failed = False
+
+        @property
+        def voice_client(self):
+            return self.guild.voice_client
+
+        async def send(self, *args: Any, **kwargs: Any) -> FakeMessage:
+            return await self.channel.send(*args, **kwargs)
+
+    bot = LoadTestBot()
+    await bot._async_setup_hook()  # loop y estado interno sin login
+    cog = MusicWavelinkCog(bot)
+    await bot.add_cog(cog)
+
+    monitor = get_loop_monitor()
+    monitor.start()
+
+    node = wavelink.Node(uri=f"http://{args.host}:{args.lavalink_port}", password=_PASSWORD, identifier="fake")
+    await wavelink.Pool.connect(nodes=[node], client=bot, cache_capacity=100)
+    for _ in range(100):
+        if node.status == wavelink.NodeStatus.CONNECTED:
+            break
+        await asyncio.sleep(0.1)
+    else:
+        raise RuntimeError("El Lavalink falso no respondió")
+    bot.wavelink_ready.set()
+
+    # --- Métricas del simulador ---
+    lag_samples: List[float] = []
+    cmd_latencies: List[float] = []
+    gaps: List[float] = []
+    counters = {"commands": 0, "command_errors": 0, "track_starts": 0}
+    pending_gap: Dict[int, float] = {}
+
+    async def on_wavelink_track_end(payload: wavelink.TrackEndEventPayload) -> None:
+        player = payload.player
+        if player and player.guild and str(payload.reason).lower() == "finished" and player.queue.is_empty:
+            pending_gap[player.guild.id] = time.perf_counter()
+
+    async def on_wavelink_track_start(payload: wavelink.TrackStartEventPayload) -> None:
+        counters["track_starts"] += 1
+        player = payload.player
+        if player and player.guild:
+            started = pending_gap.pop(player.guild.id, None)
+            if started is not None:
+                gaps.append(time.perf_counter() - started)
+
+    bot.add_listener(on_wavelink_track_end)
+    bot.add_listener(on_wavelink_track_start)
+
+    async def lag_probe() -> None:
+        interval = 0.05
+        while True:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            lag_samples.append(max(0.0, time.perf_counter() - expected))
+
+    async def invoke(guild: FakeGuild, command: commands.Command, **kwargs: Any) -> None:
+        ctx = FakeContext(guild, command)
+        started = time.perf_counter()
+        counters["commands"] += 1
+        try:
+            await cog.cog_before_invoke(ctx)
+            await command(ctx, **kwargs)
+        except Exception as e:
+            ctx.command_failed = True
+            counters["command_errors"] += 1
+            logging.warning(f"LoadTest: {command.name} G:{guild.id} falló: {e}")
+        finally:
+            await cog.cog_after_invoke(ctx)
+            cmd_latencies.append(time.perf_counter() - started)
+
+    rng = random.Random(args.seed)
+    titles, playlists = seeds["titles"], seeds["playlists"]
+
+    def random_query() -> str:
+        if playlists and rng.random() < args.p_playlist:
+            return f"https://open.spotify.com/playlist/{rng.choice(playlists)}"
+        return rng.choice(titles)
+
+    async def guild_loop(guild: FakeGuild) -> None:
+        await invoke(guild, cog.play_command, query=random_query())
+        await invoke(guild, cog.radio_command, mode="on")
+        while True:
+            await asyncio.sleep(rng.expovariate(1.0 / args.action_every))
+            roll = rng.random()
+            if roll < args.p_skip:
+                await invoke(guild, cog.skip_command)
+            elif roll < args.p_skip + args.p_play:
+                await invoke(guild, cog.play_command, query=random_query())
+
+    async def backend_stats(session: aiohttp.ClientSession, port: int) -> Dict[str, Any]:
+        try:
+            async with session.get(f"http://{args.host}:{port}/_stats") as resp:
+                return await resp.json()
+        except aiohttp.ClientError:
+            return {}
+
+    probe = asyncio.create_task(lag_probe())
+    guild_tasks: List[asyncio.Task] = []
+    guilds: List[FakeGuild] = []
+    rows: List[Dict[str, Any]] = []
+    next_guild_id = 1000
+
+    async with aiohttp.ClientSession() as session:
+        for target in args.stages:
+            while len(guilds) < target:
+                guild = FakeGuild(bot, next_guild_id)
+                next_guild_id += 1
+                guilds.append(guild)
+                guild_tasks.append(asyncio.create_task(guild_loop(guild)))
+                await asyncio.sleep(args.join_spread / max(1, target))  # no arrancar todas a la vez
+
+            lag_samples.clear(); cmd_latencies.clear(); gaps.clear()
+            base_counts = dict(counters)
+            refill_before = {tuple(sorted(l.items())): (c, t) for l, c, t in RADIO_REFILL_SECONDS.series()}
+            stalls_before = monitor.stalls
+            spotify_before = (await backend_stats(session, args.spotify_port)).get("counters", {})
+            rejected_before = executor_stats().get("spotify", {}).get("rejected", 0)
+            started = time.perf_counter()
+
+            await asyncio.sleep(args.stage_seconds)
+
+            elapsed = time.perf_counter() - started
+            spotify_after = (await backend_stats(session, args.spotify_port)).get("counters", {})
+            lavalink_stats = await backend_stats(session, args.lavalink_port)
+            refill_count = refill_total = 0.0
+            refill_results: Dict[str, int] = {}
+            for labels, count, total in RADIO_REFILL_SECONDS.series():
+                c0, t0 = refill_before.get(tuple(sorted(labels.items())), (0, 0.0))
+                refill_count += count - c0
+                refill_total += total - t0
+                refill_results[labels.get("result", "?")] = count - c0
+            spotify_reqs = sum(v - spotify_before.get(k, 0) for k, v in spotify_after.items() if k.startswith("requests:"))
+            spotify_429 = sum(v - spotify_before.get(k, 0) for k, v in spotify_after.items() if k.startswith("429:"))
+            row = {
+                "guilds": len(guilds),
+                "seconds": round(elapsed, 1),
+                "playing": lavalink_stats.get("playing"),
+                "loop_lag_p50_ms": round(_pct(lag_samples, 0.5) * 1000, 1),
+                "loop_lag_p99_ms": round(_pct(lag_samples, 0.99) * 1000, 1),
+                "loop_lag_max_ms": round(max(lag_samples, default=0.0) * 1000, 1),
+                "loop_stalls": monitor.stalls - stalls_before,
+                "commands_per_s": round((counters["commands"] - base_counts["commands"]) / elapsed, 2),
+                "command_errors": counters["command_errors"] - base_counts["command_errors"],
+                "command_p95_ms": round(_pct(cmd_latencies, 0.95) * 1000, 1),
+                "tracks_per_s": round((counters["track_starts"] - base_counts["track_starts"]) / elapsed, 2),
+                "refills": int(refill_count),
+                "refill_results": refill_results,
+                "refill_mean_s": round(refill_total / refill_count, 3) if refill_count else None,
+                "radio_gap_p50_s": round(_pct(gaps, 0.5), 3) if gaps else None,
+                "radio_gap_p95_s": round(_pct(gaps, 0.95), 3) if gaps else None,
+                "rss_mb": round(_rss_mb(), 1),
+                "spotify_req_per_s": round(spotify_reqs / elapsed, 1),
+                "spotify_429": spotify_429,
+                "spotify_executor_rejected": executor_stats().get("spotify", {}).get("rejected", 0) - rejected_before,
+            }
+            rows.append(row)
+            _print_row(row, header=len(rows) == 1)
+
+        for task in guild_tasks:
+            task.cancel()
+        probe.cancel()
+        await asyncio.gather(*guild_tasks, probe, return_exceptions=True)
+        if monitor.offenders:
+            print("\nCallbacks que bloquearon el loop:")
+            for name, count in monitor.offenders.most_common(5):
+                print(f"  {count:4d}× {name}")
+        monitor.stop()
+        await wavelink.Pool.close()
+    # Esperar los refills que siguen en hilos antes de apagar los backends falsos
+    await asyncio.to_thread(shutdown_executors, True)
+    return rows
+
+
+_COLUMNS: Tuple[Tuple[str, str, int], ...] = (
+    ("guilds", "guilds", 6), ("playing", "play", 5), ("loop_lag_p50_ms", "lag50", 6), ("loop_lag_p99_ms", "lag99", 6),
+    ("loop_lag_max_ms", "lagmax", 7), ("loop_stalls", "stall", 5), ("commands_per_s", "cmd/s", 6),
+    ("command_p95_ms", "cmd95", 7), ("tracks_per_s", "trk/s", 6), ("refills", "refill", 6),
+    ("refill_mean_s", "rf_s", 6), ("radio_gap_p95_s", "gap95", 6), ("rss_mb", "rss", 6),
+    ("spotify_req_per_s", "sp/s", 6), ("spotify_429", "429", 4), ("spotify_executor_rejected", "rej", 4),
+)
+
+
+def _print_row(row: Dict[str, Any], header: bool) -> None:
+    if header:
+        print(" ".join(f"{title:>{width}}" for _, title, width in _COLUMNS))
+    cells = []
+    for key, _, width in _COLUMNS:
+        value = row.get(key)
+        cells.append(f"{'-' if value is None else value:>{width}}")
+    print(" ".join(cells), flush=True)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Carga multi-guild sobre MusicWavelinkCog (Lavalink y Spotify falsos)")
+    ap.add_argument("--stages", default="5,10,20,40", help="guilds activas por etapa (acumulativo)")
+    ap.add_argument("--stage-seconds", type=float, default=30.0)
+    ap.add_argument("--join-spread", type=float, default=2.0, help="segundos para repartir las altas de cada etapa")
+    ap.add_argument("--track-seconds", type=float, default=5.0, help="duración simulada de cada tema")
+    ap.add_argument("--action-every", type=float, default=8.0, help="media de segundos entre acciones de cada guild")
+    ap.add_argument("--p-skip", type=float, default=0.3)
+    ap.add_argument("--p-play", type=float, default=0.1)
+    ap.add_argument("--p-playlist", type=float, default=0.1, help="fracción de !p que son playlists de Spotify")
+    ap.add_argument("--spotify-latency-ms", type=float, default=60.0)
+    ap.add_argument("--spotify-jitter-ms", type=float, default=30.0)
+    ap.add_argument("--spotify-429", type=float, default=0.0)
+    ap.add_argument("--search-latency-ms", type=float, default=80.0, help="latencia de /v4/loadtracks")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--spotify-port", type=int, default=18089)
+    ap.add_argument("--lavalink-port", type=int, default=12333)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--json", help="guardar las filas por etapa en este archivo")
+    ap.add_argument("--verbose", action="store_true")
+    args = ap.parse_args()
+    args.stages = sorted({int(s) for s in args.stages.split(",") if s.strip()})
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR, format="%(asctime)s %(levelname)s %(message)s")
+    tmp = tempfile.mkdtemp(prefix="radio-load-")
+    os.environ.update({
+        "DISCORD_TOKEN": os.environ.get("DISCORD_TOKEN", "loadtest"),
+        "SPOTIFY_CLIENT_ID": "loadtest",
+        "SPOTIFY_CLIENT_SECRET": "loadtest",
+        "SPOTIFY_API_BASE": f"http://{args.host}:{args.spotify_port}/v1/",
+        "SPOTIFY_TOKEN_URL": f"http://{args.host}:{args.spotify_port}/api/token",
+        "SEED_CACHE_PATH": os.path.join(tmp, "seed_cache.sqlite3"),
+        "TRACK_MATCH_DB_PATH": os.path.join(tmp, "track_matches.sqlite3"),
+        "TRACE_FILE": os.path.join(tmp, "traces.jsonl"),
+        "TRACE_SAMPLE_RATE": "0",
+    })
+
+    parent, child = multiprocessing.Pipe()
+    backends = multiprocessing.Process(
+        target=_backends_main,
+        args=(child, args.host, args.spotify_port, args.lavalink_port,
+              {"latency_ms": args.spotify_latency_ms, "jitter_ms": args.spotify_jitter_ms, "rate_429": args.spotify_429},
+              {"search_latency_ms": args.search_latency_ms, "track_seconds": args.track_seconds},
+              200),
+        daemon=True,
+    )
+    backends.start()
+    try:
+        if not parent.poll(30):
+            print("Los backends falsos no arrancaron")
+            return 1
+        seeds = parent.recv()
+        print(f"Backends listos (Spotify :{args.spotify_port}, Lavalink :{args.lavalink_port}); "
+              f"etapas={args.stages} × {args.stage_seconds:.0f}s, tema={args.track_seconds:.0f}s")
+        rows = asyncio.run(_run(args, seeds))
+    finally:
+        backends.terminate()
+        backends.join(5)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump({"args": {k: v for k, v in vars(args).items()}, "stages": rows}, fh, indent=2)
+        print(f"Curvas guardadas en {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
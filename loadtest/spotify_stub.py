@@ -0,0 +1,196 @@
+# --- loadtest/spotify_stub.py (Servidor local que imita la Web API de Spotify para pruebas de carga) ---
+#
+# Uso:
+#   python -m loadtest.spotify_stub --port 8089 --latency-ms 80 --jitter-ms 40 --rate-429 0.02
+# y en el bot:
+#   SPOTIFY_CLIENT_ID=x SPOTIFY_CLIENT_SECRET=x \
+#   SPOTIFY_API_BASE=http://127.0.0.1:8089/v1/ SPOTIFY_TOKEN_URL=http://127.0.0.1:8089/api/token
+#
+# Sirve los endpoints que usan spotify_helper.py y play_command (search, tracks, albums, album tracks,
+# playlists, playlist tracks, artists, artist top-tracks) más el token de client-credentials, desde el
+# catálogo sintético de bench/spotify_catalog.py. Latencia, jitter y 429 (con Retry-After) configurables;
+# GET /_stats devuelve los contadores por endpoint.
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from aiohttp import web
+
+from bench.spotify_catalog import SyntheticCatalog
+
+log = logging.getLogger(__name__)
+
+_TOKEN_TTL = 3600
+
+
+@dataclass
+class StubConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate_429: float = 0.0
+    retry_after: int = 1
+    catalog_seed: int = 1234
+    artists: int = 300
+    playlists: int = 500
+    require_auth: bool = True
+
+
+def _error(status: int, message: str, headers: Optional[Dict[str, str]] = None) -> web.Response:
+    return web.json_response({"error": {"status": status, "message": message}}, status=status, headers=headers)
+
+
+def _token_expiry(token: str) -> float:
+    prefix, _, rest = token.partition("-")
+    try:
+        return float(rest.partition("-")[0]) if prefix == "stub" else 0.0
+    except ValueError:
+        return 0.0
+
+
+def _int_arg(request: web.Request, name: str, default: int) -> int:
+    try:
+        return int(request.query.get(name, default))
+    except ValueError:
+        return default
+
+
+def build_spotify_stub(config: StubConfig, catalog: Optional[SyntheticCatalog] = None) -> web.Application:
+    catalog = catalog or SyntheticCatalog(config.catalog_seed, config.artists, config.playlists)
+    rng = random.Random(config.catalog_seed)
+    # Estadísticas simples
+    stats: Counter = Counter()
+    started_at = time.time()
+
+    @web.middleware
+    async def emulate(request: web.Request, handler: Callable) -> web.StreamResponse:
+        if request.path.startswith("/_"):
+            return await handler(request)
+        resource = request.match_info.route.resource
+        endpoint = resource.canonical.rstrip("/") if resource is not None else request.path
+        stats[f"requests:{endpoint}"] += 1
+        delay = config.latency_ms + (rng.uniform(-config.jitter_ms, config.jitter_ms) if config.jitter_ms else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if config.rate_429 and request.path.startswith("/v1/") and rng.random() < config.rate_429:
+            stats[f"429:{endpoint}"] += 1
+            return _error(429, "API rate limit exceeded", {"Retry-After": str(config.retry_after)})
+        if config.require_auth and request.path.startswith("/v1/"):
+            auth = request.headers.get("Authorization", "")
+            if _token_expiry(auth[7:] if auth.startswith("Bearer ") else "") < time.time():
+                stats[f"401:{endpoint}"] += 1
+                return _error(401, "Invalid access token")
+        try:
+            return await handler(request)
+        except KeyError as e:
+            stats[f"404:{endpoint}"] += 1
+            return _error(404, f"Non existing id: {e}")
+
+    async def token(request: web.Request) -> web.Response:
+        form = await request.post()
+        if form.get("grant_type") != "client_credentials":
+            return web.json_response({"error": "unsupported_grant_type"}, status=400)
+        # Token sin estado ("stub-<expira>-<azar>"): sigue siendo válido si se reinicia el stub
+        value = f"stub-{int(time.time()) + _TOKEN_TTL}-{rng.getrandbits(32):08x}"
+        stats["tokens_issued"] += 1
+        return web.json_response({"access_token": value, "token_type": "Bearer", "expires_in": _TOKEN_TTL})
+
+    async def search(request: web.Request) -> web.Response:
+        q = request.query.get("q", "")
+        kind = request.query.get("type", "track").split(",")[0]
+        return web.json_response(catalog.search(q, limit=_int_arg(request, "limit", 10), offset=_int_arg(request, "offset", 0), type=kind))
+
+    async def track(request: web.Request) -> web.Response:
+        return web.json_response(catalog.track(request.match_info["id"]))
+
+    async def album(request: web.Request) -> web.Response:
+        return web.json_response(catalog.album(request.match_info["id"]))
+
+    async def album_tracks(request: web.Request) -> web.Response:
+        return web.json_response(catalog.album_tracks(
+            request.match_info["id"], limit=_int_arg(request, "limit", 50), offset=_int_arg(request, "offset", 0)))
+
+    async def playlist(request: web.Request) -> web.Response:
+        return web.json_response(catalog.playlist(request.match_info["id"], fields=request.query.get("fields")))
+
+    async def playlist_items(request: web.Request) -> web.Response:
+        return web.json_response(catalog.playlist_items(
+            request.match_info["id"], fields=request.query.get("fields"),
+            limit=_int_arg(request, "limit", 100), offset=_int_arg(request, "offset", 0)))
+
+    async def artist(request: web.Request) -> web.Response:
+        return web.json_response(catalog.artist(request.match_info["id"]))
+
+    async def artists(request: web.Request) -> web.Response:
+        ids = [i for i in request.query.get("ids", "").split(",") if i]
+        return web.json_response(catalog.artists(ids))
+
+    async def artist_top_tracks(request: web.Request) -> web.Response:
+        return web.json_response(catalog.artist_top_tracks(request.match_info["id"]))
+
+    async def stats_view(request: web.Request) -> web.Response:
+        return web.json_response({"uptime": time.time() - started_at, "counters": dict(stats)})
+
+    app = web.Application(middlewares=[emulate])
+    app.router.add_post("/api/token", token)
+
+    def add(path: str, handler: Callable) -> None:
+        # spotipy arma algunas URLs con barra final ("artists/?ids=", "albums/{id}/tracks/")
+        app.router.add_get(path, handler)
+        app.router.add_get(path + "/", handler)
+
+    add("/v1/search", search)
+    add("/v1/tracks/{id}", track)
+    add("/v1/albums/{id}", album)
+    add("/v1/albums/{id}/tracks", album_tracks)
+    add("/v1/playlists/{id}", playlist)
+    add("/v1/playlists/{id}/tracks", playlist_items)
+    add("/v1/artists", artists)
+    add("/v1/artists/{id}", artist)
+    add("/v1/artists/{id}/top-tracks", artist_top_tracks)
+    app.router.add_get("/_stats", stats_view)
+    app["catalog"] = catalog
+    app["stats"] = stats
+    return app
+
+
+async def start_spotify_stub(host: str, port: int, config: Optional[StubConfig] = None,
+                             catalog: Optional[SyntheticCatalog] = None) -> web.AppRunner:
+    runner = web.AppRunner(build_spotify_stub(config or StubConfig(), catalog), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    log.info(f"Spotify stub escuchando en http://{host}:{port}/v1/")
+    return runner
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Stand-in local de la Web API de Spotify")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8089)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    ap.add_argument("--rate-429", type=float, default=0.0, help="probabilidad de responder 429 por request")
+    ap.add_argument("--retry-after", type=int, default=1)
+    ap.add_argument("--seed", type=int, default=1234, help="semilla del catálogo sintético")
+    ap.add_argument("--artists", type=int, default=300)
+    ap.add_argument("--playlists", type=int, default=500)
+    ap.add_argument("--no-auth", action="store_true", help="no exigir el token Bearer")
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    config = StubConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, rate_429=args.rate_429,
+        retry_after=args.retry_after, catalog_seed=args.seed, artists=args.artists,
+        playlists=args.playlists, require_auth=not args.no_auth,
+    )
+    print(f"Spotify stub: http://{args.host}:{args.port}/v1/  (token: http://{args.host}:{args.port}/api/token)")
+    web.run_app(build_spotify_stub(config), host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()